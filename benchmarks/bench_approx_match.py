@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""Benchmark approx_match (trigram MinHash-LSH) on synthetic names with planted near-duplicates.
+
+Usage: python3 benchmarks/bench_approx_match.py [--names 1000000] [--noisy 0.05] [--threshold 0.6]
+A --noisy share of names get a corrupted copy (OCR-style substitution, dropped letter, added
+middle initial or accent); reports time per stage and how many planted pairs were found.
+"""
+import argparse
+import random
+import string
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "power_structure_data"))
+
+import approx_match  # noqa: E402
+from names import normalize_name  # noqa: E402
+
+OCR = {"l": "1", "o": "0", "e": "c", "rn": "m", "i": "l", "s": "5"}
+ACCENTS = {"n": "ń", "e": "é", "o": "ö", "a": "á", "c": "č"}
+
+
+def random_name(rng: random.Random) -> str:
+    first = "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 8))).title()
+    last = "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(5, 10))).title()
+    return f"{first} {last}"
+
+
+def corrupt(name: str, rng: random.Random) -> str:
+    kind = rng.randrange(4)
+    if kind == 0:
+        for a, b in rng.sample(list(OCR.items()), len(OCR)):
+            if a in name:
+                return name.replace(a, b, 1)
+    if kind == 1:
+        i = rng.randrange(1, len(name) - 1)
+        if name[i] != " ":
+            return name[:i] + name[i + 1 :]
+    if kind == 2:
+        first, last = name.split(" ", 1)
+        return f"{first} {rng.choice(string.ascii_uppercase)}. {last}"
+    for a, b in ACCENTS.items():
+        if a in name:
+            return name.replace(a, b, 1)
+    return name + "s"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--names", type=int, default=1_000_000)
+    parser.add_argument("--noisy", type=float, default=0.05)
+    parser.add_argument("--threshold", type=float, default=approx_match.DEFAULT_THRESHOLD)
+    args = parser.parse_args()
+
+    rng = random.Random(3)
+    n_clean = int(args.names / (1 + args.noisy))
+    names = [random_name(rng) for _ in range(n_clean)]
+    planted = []
+    for name in rng.sample(names, args.names - n_clean):
+        noisy = corrupt(name, rng)
+        planted.append((normalize_name(name), normalize_name(noisy)))
+        names.append(noisy)
+
+    t0 = time.perf_counter()
+    index = approx_match.ApproxIndex(names)
+    t_sig = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    candidates = approx_match.lsh_pairs(index.sig, index.bands)
+    t_lsh = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    s = approx_match.scores(index.sig, candidates)
+    t_score = time.perf_counter() - t0
+    pairs = candidates[s >= args.threshold]
+
+    found = {frozenset((index.keys[i], index.keys[j])) for i, j in pairs}
+    hits = sum(1 for a, b in planted if a == b or frozenset((a, b)) in found)
+
+    print(f"{len(names):,} names ({len(index.keys):,} distinct keys), {len(planted):,} planted near-duplicates")
+    print(f"  signatures : {t_sig:.1f} s")
+    print(f"  LSH        : {t_lsh:.1f} s ({len(candidates):,} candidate pairs)")
+    print(f"  scoring    : {t_score:.1f} s ({len(pairs):,} pairs >= {args.threshold})")
+    print(f"  recall     : {hits / max(len(planted), 1):.1%} of planted pairs")
+
+
+if __name__ == "__main__":
+    main()
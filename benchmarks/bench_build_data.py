@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""Benchmark web/build_data.build on synthetic network_d3.json inputs of growing size.
+
+Usage: python3 benchmarks/bench_build_data.py [--edges 1000000] [--steps 4]
+Times build() at edges/steps, 2*edges/steps, ... edges; time per edge should stay flat.
+"""
+import argparse
+import csv
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "web"))
+
+import build_data  # noqa: E402
+
+RELATIONSHIPS = ["Skull and Bones cohort", "shared_board"]
+
+
+def write_inputs(data_dir: Path, n_edges: int, rng: random.Random):
+    n_nodes = max(n_edges // 10, 2)
+    nodes = [{"id": i, "name": f"Person {i}"} for i in range(1, n_nodes + 1)]
+    links = []
+    for _ in range(n_edges):
+        s, t = rng.randint(1, n_nodes), rng.randint(1, n_nodes)
+        links.append({"source": s, "target": t, "relationship": rng.choice(RELATIONSHIPS), "shared": 1})
+    (data_dir / "network_d3.json").write_text(json.dumps({"nodes": nodes, "links": links}))
+    with open(data_dir / "cross_reference.csv", "w", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(["name", "sources", "source_count"])
+        w.writerows([f"Person {i}", "skull_bones, bilderberg", 2] for i in range(1, n_nodes + 1, 50))
+    with open(data_dir / "skull_bones_complete.csv", "w", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(["name", "cohort_year", "position", "century"])
+        w.writerows([f"Person {i}", 1833 + i % 190, "lawyer", "19th"] for i in range(1, n_nodes + 1, 3))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--edges", type=int, default=1_000_000)
+    parser.add_argument("--steps", type=int, default=4)
+    args = parser.parse_args()
+    rng = random.Random(21)
+
+    for step in range(1, args.steps + 1):
+        n = args.edges * step // args.steps
+        with tempfile.TemporaryDirectory() as tmp:
+            data_dir, out_dir = Path(tmp) / "data", Path(tmp) / "out"
+            data_dir.mkdir()
+            write_inputs(data_dir, n, rng)
+            t0 = time.perf_counter()
+            n_nodes, n_edges = build_data.build(data_dir, out_dir)
+            elapsed = time.perf_counter() - t0
+            json.loads((out_dir / "network.json").read_text())  # Output is valid JSON
+        print(f"{n_edges:>10,} edges, {n_nodes:>8,} nodes: {elapsed:6.2f} s ({elapsed / n_edges * 1e6:.2f} us/edge)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""Benchmark extract_all.find_overlaps on synthetic sources.
+
+Usage: python3 benchmarks/bench_cross_reference.py [--rows 3000000] [--check-rows 3000]
+Checks the result against the previous per-overlap display-name lookup on a small input, then
+times find_overlaps on --rows total rows spread over five sources.
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "power_structure_data"))
+
+from extract_all import find_overlaps  # noqa: E402
+from names import normalize_name as normalize  # noqa: E402
+
+SOURCES = ["skull_bones", "bilderberg", "cfr", "directors", "board_interlocks"]
+
+
+def synthetic_sources(rows: int, rng: random.Random) -> dict[str, pd.DataFrame]:
+    """Five sources drawing from a shared pool of people, so a good share overlap."""
+    pool = [f"Person{i} Surname{i % 9973}" for i in range(max(rows // 3, 1))]
+    dfs = {}
+    for source in SOURCES:
+        names = []
+        for _ in range(rows // len(SOURCES)):
+            name = rng.choice(pool)
+            r = rng.random()
+            if r < 0.1:
+                name = name.upper()
+            elif r < 0.2:
+                name += " Jr."
+            names.append(name)
+        if source == "cfr":
+            names[::50] = [None] * len(names[::50])
+        dfs[source] = pd.DataFrame({"name": names})
+    return dfs
+
+
+def quadratic_overlaps(dfs: dict[str, pd.DataFrame]) -> list[dict]:
+    """The previous implementation: re-normalizes every source for every overlap."""
+    all_sets = {k: {normalize(n) for n in v["name"].dropna()} for k, v in dfs.items()}
+    overlaps = []
+    for norm_name in set().union(*all_sets.values()):
+        sources = [k for k, s in all_sets.items() if norm_name in s]
+        if len(sources) >= 2:
+            display = norm_name.title()
+            for df in dfs.values():
+                match = df[df["name"].apply(normalize) == norm_name]
+                if not match.empty:
+                    display = match.iloc[0]["name"]
+                    break
+            overlaps.append({"name": display, "sources": ", ".join(sources), "source_count": len(sources)})
+    return overlaps
+
+
+def key(rows: list[dict]) -> list[tuple]:
+    return sorted((r["name"], r["sources"], r["source_count"]) for r in rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=3_000_000)
+    parser.add_argument("--check-rows", type=int, default=3_000)
+    args = parser.parse_args()
+    rng = random.Random(7)
+
+    small = synthetic_sources(args.check_rows, rng)
+    t0 = time.perf_counter()
+    expected = quadratic_overlaps(small)
+    t_old = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    got = find_overlaps(small)
+    t_new = time.perf_counter() - t0
+    if key(got) != key(expected):
+        raise SystemExit("find_overlaps differs from the previous implementation")
+    print(f"{args.check_rows:,} rows: previous {t_old:.2f} s, find_overlaps {t_new:.3f} s ({len(got):,} overlaps, identical)")
+
+    big = synthetic_sources(args.rows, rng)
+    t0 = time.perf_counter()
+    got = find_overlaps(big)
+    elapsed = time.perf_counter() - t0
+    print(f"{args.rows:,} rows: find_overlaps {elapsed:.2f} s ({len(got):,} overlaps, {args.rows / elapsed:,.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
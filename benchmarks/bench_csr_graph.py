@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""Benchmark csr_graph: build, save and memory-mapped load of a large synthetic graph.
+
+Usage: python3 benchmarks/bench_csr_graph.py [--nodes 1000000] [--edges 10000000] [--dir /tmp/bench_graph]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "power_structure_data"))
+
+from csr_graph import CSRGraph  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=1_000_000)
+    parser.add_argument("--edges", type=int, default=10_000_000)
+    parser.add_argument("--dir", type=Path, default=Path("/tmp/bench_graph"))
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    src = rng.integers(0, args.nodes, args.edges)
+    dst = (src + rng.integers(1, args.nodes, args.edges)) % args.nodes  # No self-loops
+    names = [f"Person {i}" for i in range(args.nodes)]
+
+    t0 = time.perf_counter()
+    graph = CSRGraph.build(
+        names, src, dst,
+        relationship=rng.integers(0, 2, args.edges), organization=rng.integers(-1, 5000, args.edges),
+        year=rng.integers(1833, 2025, args.edges), relationships=["Skull and Bones cohort", "shared_board"],
+        organizations=[f"Company {i}" for i in range(5000)],
+    )
+    t_build = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    graph.save(args.dir)
+    t_save = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    loaded = CSRGraph.load(args.dir)
+    t_load = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    probes = rng.integers(0, args.nodes, 10_000)
+    total = sum(len(loaded.neighbors(i)) for i in probes)
+    t_query = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    degrees = loaded.degree()
+    t_degree = time.perf_counter() - t0
+
+    assert loaded.n_edges == args.edges and degrees.sum() == 2 * args.edges
+    probe = args.nodes // 2
+    assert loaded.name(probe) == names[probe] and loaded.degree(probe) == graph.degree(probe)
+    print(f"{args.nodes:,} nodes, {args.edges:,} edges")
+    print(f"  build  : {t_build:.1f} s, save: {t_save:.1f} s")
+    print(f"  load   : {t_load * 1000:.1f} ms (memory-mapped)")
+    print(f"  10k neighbor lookups: {t_query * 1000:.1f} ms ({total:,} neighbors), degree array: {t_degree * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
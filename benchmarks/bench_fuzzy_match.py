@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""Benchmark cross_reference.fuzzy_match: linear scan vs BlockingIndex.
+
+Usage: python3 benchmarks/bench_fuzzy_match.py [--names 100000] [--sample 200]
+Builds N synthetic candidates and N queries, checks that the index returns the same matches as
+the scan on a sample, times the scan on that sample (extrapolated to N) and the index on all N.
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from cross_reference import BlockingIndex, fuzzy_match, normalize_name  # noqa: E402
+
+FIRST = ["john", "james", "robert", "william", "george", "charles", "henry", "david", "richard", "thomas",
+         "mary", "elizabeth", "anne", "margaret", "prescott", "mcgeorge", "averell", "zbigniew", "paul", "alan"]
+SYLLABLES = ["bush", "taft", "har", "ri", "man", "stim", "son", "lord", "whit", "ney", "bun", "dy", "brze",
+             "zin", "ski", "volck", "er", "rock", "e", "fell", "gal", "braith", "kerr", "y", "pha", "lps"]
+
+
+def synthetic_names(n: int, rng: random.Random) -> list[str]:
+    names = []
+    for _ in range(n):
+        last = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3))).title()
+        middle = f" {rng.choice('ABCDEFGHJKLMNPRSTW')}." if rng.random() < 0.3 else ""
+        suffix = rng.choice(["", "", "", " Jr.", " III"])
+        names.append(f"{rng.choice(FIRST).title()}{middle} {last}{suffix}")
+    return names
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--names", type=int, default=100_000)
+    parser.add_argument("--sample", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    candidates = {normalize_name(n) for n in synthetic_names(args.names, rng)}
+    queries = synthetic_names(args.names, rng)
+
+    t0 = time.perf_counter()
+    index = BlockingIndex(candidates)
+    t_build = time.perf_counter() - t0
+
+    sample = queries[: args.sample]
+    t0 = time.perf_counter()
+    scanned = [fuzzy_match(q, candidates) for q in sample]
+    t_scan = (time.perf_counter() - t0) / len(sample)
+    for q, expected in zip(sample, scanned):
+        if sorted(index.query(q)) != sorted(expected):
+            raise SystemExit(f"Mismatch for {q!r}")
+
+    t0 = time.perf_counter()
+    hits = sum(1 for q in queries if index.query(q))
+    t_index = time.perf_counter() - t0
+
+    print(f"{len(queries):,} queries x {len(candidates):,} candidates ({hits:,} with matches)")
+    print(f"  linear scan : {t_scan * 1000:.2f} ms/query -> ~{t_scan * len(queries):,.0f} s for all")
+    print(f"  index build : {t_build:.2f} s, queries: {t_index:.2f} s ({t_index / len(queries) * 1e6:.1f} us/query)")
+    print(f"  speedup     : ~{t_scan * len(queries) / (t_build + t_index):,.0f}x (same matches on {len(sample)} sampled queries)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""Benchmark graph_query: k-hop neighborhoods and bidirectional shortest paths on a large synthetic graph.
+
+Usage: python3 benchmarks/bench_graph_query.py [--nodes 1000000] [--edges 10000000] [--queries 200] [--dir /tmp/bench_graph]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "power_structure_data"))
+
+from csr_graph import CSRGraph  # noqa: E402
+from graph_query import GraphQuery  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=1_000_000)
+    parser.add_argument("--edges", type=int, default=10_000_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--dir", type=Path, default=Path("/tmp/bench_graph"))
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    if not (args.dir / "meta.json").exists() or CSRGraph.load(args.dir).n_edges != args.edges:
+        src = rng.integers(0, args.nodes, args.edges)
+        dst = (src + rng.integers(1, args.nodes, args.edges)) % args.nodes
+        CSRGraph.build([f"Person {i}" for i in range(args.nodes)], src, dst,
+                       relationships=["shared_board"]).save(args.dir)
+
+    t0 = time.perf_counter()
+    q = GraphQuery(CSRGraph.load(args.dir))
+    t_load = time.perf_counter() - t0
+    people = [f"Person {i}" for i in rng.integers(0, args.nodes, 2 * args.queries)]
+    q.node(people[0])  # Intern the name table once
+
+    def timed(fn, pairs):
+        t0 = time.perf_counter()
+        out = [fn(*p) for p in pairs]
+        return (time.perf_counter() - t0) / len(pairs) * 1000, out
+
+    t_hop1, hood1 = timed(lambda a: q.neighborhood(a, 1), [(a,) for a in people[: args.queries]])
+    t_hop2, hood2 = timed(lambda a: q.neighborhood(a, 2), [(a,) for a in people[: args.queries]])
+    pairs = list(zip(people[::2], people[1::2]))
+    t_path, paths = timed(q.path, pairs)
+    t_cached, _ = timed(q.path, pairs)
+
+    lengths = [len(p) for p in paths if p is not None]
+    print(f"{args.nodes:,} nodes, {args.edges:,} edges, loaded in {t_load * 1000:.1f} ms")
+    print(f"  1-hop neighborhood: {t_hop1:.2f} ms/query (avg {np.mean([len(h) for h in hood1]):.0f} people)")
+    print(f"  2-hop neighborhood: {t_hop2:.2f} ms/query (avg {np.mean([len(h) for h in hood2]):.0f} people)")
+    print(f"  shortest path     : {t_path:.2f} ms/query (avg {np.mean(lengths):.1f} hops, {len(lengths)}/{len(pairs)} connected)")
+    print(f"  cached path       : {t_cached * 1000:.1f} us/query")
+
+
+if __name__ == "__main__":
+    main()
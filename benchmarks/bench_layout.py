@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""Benchmark layout.force_layout against networkx.spring_layout on a cohort-like synthetic graph.
+
+Usage: python3 benchmarks/bench_layout.py [--nodes 2000 20000] [--cohort 15] [--iterations 100] [--no-networkx]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "power_structure_data"))
+
+import layout  # noqa: E402
+
+
+def cohort_graph(n: int, cohort: int, rng) -> tuple[np.ndarray, np.ndarray]:
+    """Cliques of `cohort` people plus one random cross-cohort tie per person (shared boards)."""
+    groups = np.arange(n) // cohort
+    a, b = np.triu_indices(cohort, k=1)
+    starts = np.arange(0, n, cohort)
+    src = (starts[:, None] + a[None, :]).ravel()
+    dst = (starts[:, None] + b[None, :]).ravel()
+    keep = dst < n
+    src, dst = src[keep], dst[keep]
+    cross_src = np.arange(n)
+    cross_dst = rng.integers(0, n, n)
+    cross = groups[cross_src] != groups[cross_dst]
+    return np.concatenate([src, cross_src[cross]]), np.concatenate([dst, cross_dst[cross]])
+
+
+def edge_ratio(pos: np.ndarray, src: np.ndarray, dst: np.ndarray, rng) -> float:
+    """Median edge length over median distance between random pairs (lower is tighter)."""
+    edge = np.sqrt(((pos[src] - pos[dst]) ** 2).sum(axis=1))
+    i, j = rng.integers(0, len(pos), (2, 5000))
+    return float(np.median(edge) / np.median(np.sqrt(((pos[i] - pos[j]) ** 2).sum(axis=1))))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nodes", type=int, nargs="+", default=[2000, 20000])
+    parser.add_argument("--cohort", type=int, default=15)
+    parser.add_argument("--iterations", type=int, default=layout.ITERATIONS)
+    parser.add_argument("--no-networkx", action="store_true", help="Skip the O(n^2) networkx baseline")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    for n in args.nodes:
+        src, dst = cohort_graph(n, args.cohort, rng)
+        t0 = time.perf_counter()
+        pos = layout.force_layout(n, src, dst, args.iterations)
+        t_ours = time.perf_counter() - t0
+        line = (f"{n:>9,} nodes {len(src):>10,} edges: layout.py {t_ours:7.2f} s "
+                f"(edge/random distance {edge_ratio(pos, src, dst, rng):.3f})")
+        if not args.no_networkx and n <= 5000:
+            import networkx as nx
+
+            g = nx.Graph()
+            g.add_nodes_from(range(n))
+            g.add_edges_from(zip(src.tolist(), dst.tolist()))
+            t0 = time.perf_counter()
+            ref = nx.spring_layout(g, k=0.5, iterations=50, method="force", seed=0)
+            t_nx = time.perf_counter() - t0
+            ref_pos = np.array([ref[i] for i in range(n)])
+            line += f" | networkx {t_nx:7.2f} s ({edge_ratio(ref_pos, src, dst, rng):.3f})"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
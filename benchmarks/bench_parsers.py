@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""Benchmark html_backend backends on the Wikipedia parsers.
+
+Usage: python3 benchmarks/bench_parsers.py [--repeat N] [extra bilderberg .html revisions ...]
+Checks that every backend returns exactly the rows bs4 returns, then reports timings.
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from html_backend import BACKENDS, get_backend  # noqa: E402
+from parse_bilderberg import parse_bilderberg  # noqa: E402
+from parse_skull_bones import parse_skull_bones  # noqa: E402
+
+
+def best_of(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("revisions", nargs="*", type=Path, help="Additional Bilderberg page revisions")
+    args = parser.parse_args()
+
+    backends = {}
+    for name in BACKENDS:
+        try:
+            backends[name] = get_backend(name)
+        except ImportError:
+            print(f"{name}: not installed, skipped")
+
+    cases = [(parse_bilderberg, ROOT / "data" / "bilderberg.html"), (parse_skull_bones, ROOT / "data" / "skull_bones.html")]
+    cases += [(parse_bilderberg, p) for p in args.revisions]
+
+    for fn, path in cases:
+        if not path.exists():
+            print(f"{path}: missing, skipped")
+            continue
+        baseline = fn(str(path), backends["bs4"]) if "bs4" in backends else None
+        timings = {}
+        for name, backend in backends.items():
+            rows = fn(str(path), backend)
+            if baseline is not None and rows != baseline:
+                raise SystemExit(f"{name} rows differ from bs4 on {path.name}")
+            timings[name] = best_of(lambda: fn(str(path), backend), args.repeat)
+        line = ", ".join(f"{n} {t * 1000:.0f} ms" for n, t in timings.items())
+        if "bs4" in timings and len(timings) > 1:
+            fastest = min(timings, key=timings.get)
+            line += f" -> {fastest} {timings['bs4'] / timings[fastest]:.1f}x faster"
+        print(f"{fn.__name__}({path.name}): {len(baseline or rows)} rows; {line}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""Benchmark extract_all's roster extraction on each html_backend backend on 1x and 10x pages.
+
+Usage: python3 benchmarks/bench_wiki_extract.py [--scale 10]
+The synthetic page repeats the saved page body `scale` times; every backend must return the same rows.
+"""
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT / "power_structure_data"))
+
+import extract_all  # noqa: E402
+from html_backend import BACKENDS  # noqa: E402
+
+
+def scaled(html: str, scale: int) -> str:
+    m = re.search(r"<body[^>]*>(.*)</body>", html, re.S)
+    if not m:
+        return html * scale
+    return html[: m.start(1)] + m.group(1) * scale + html[m.end(1) :]
+
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    out = fn(*args)
+    return out, time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=int, default=10)
+    args = parser.parse_args()
+
+    backends = {}
+    for name, cls in BACKENDS.items():
+        try:
+            backends[name] = cls()
+        except ImportError:
+            print(f"{name}: not installed")
+
+    cases = [
+        ("skull_bones_members", extract_all.skull_bones_members, ROOT / "data" / "skull_bones.html"),
+        ("bilderberg_en_attendees", extract_all.bilderberg_en_attendees, ROOT / "data" / "bilderberg.html"),
+    ]
+    for label, fn, path in cases:
+        html = path.read_text(encoding="utf-8")
+        for scale in (1, args.scale):
+            page = scaled(html, scale)
+            results = {name: timed(fn, page, set(), backend) for name, backend in backends.items()}
+            rows = {len(r) for r, _ in results.values()}
+            times = " | ".join(f"{name} {t * 1000:.0f} ms" for name, (_, t) in results.items())
+            same = "same rows" if len({repr(r) for r, _ in results.values()}) == 1 else "ROWS DIFFER"
+            print(f"{label} {scale:>2}x ({len(page) / 1e6:.1f} MB): {max(rows)} rows, {same} | {times}")
+
+
+if __name__ == "__main__":
+    main()
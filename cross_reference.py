@@ -1,7 +1,8 @@
 #!/usr/bin/env python3
 """Cross-reference people across elite organizations and corporate boards."""
+import argparse
 import csv
-import re
+import sys
 from pathlib import Path
 from collections import defaultdict
 
@@ -10,15 +11,21 @@ try:
 except ImportError:
     pd = None
 
+sys.path.insert(0, str(Path(__file__).parent / "power_structure_data"))
+from membership import MembershipMatrix  # noqa: E402
+from names import normalize_name  # noqa: E402
 
-def normalize_name(name: str) -> str:
-    """Normalize name for matching: lowercase, strip, collapse spaces."""
-    if not name:
-        return ""
-    # Remove common suffixes for matching
-    name = re.sub(r"\s*(Jr\.?|Sr\.?|II|III|IV)\s*$", "", name, flags=re.I)
-    name = re.sub(r"\s+", " ", name.strip().lower())
-    return name
+# (source label, CSV in data/) - add a line here to cross-reference another source
+SOURCES = [
+    ("senate_3plus_boards", "directors_3plus_boards.csv"),
+    ("skull_and_bones", "skull_bones_members.csv"),
+    ("bilderberg", "bilderberg_attendees.csv"),
+    ("cfr", "cfr_members_1921_1951.csv"),
+    ("trilateral", "trilateral_members.csv"),
+    ("bohemian_grove", "bohemian_grove_members.csv"),
+]
+
+APPROX_FIELDS = ["name_a", "source_a", "name_b", "source_b", "score"]
 
 
 def load_csv(path: Path, name_col: str = "name") -> dict[str, list[dict]]:
@@ -35,8 +42,56 @@ def load_csv(path: Path, name_col: str = "name") -> dict[str, list[dict]]:
     return dict(by_name)
 
 
-def fuzzy_match(name: str, candidates: set[str]) -> list[str]:
-    """Find potential matches (exact or last name + first initial)."""
+def last_first_initial(norm: str) -> tuple[str, str] | None:
+    """Blocking key: (last name, first initial) of a normalized name with 2+ parts."""
+    parts = norm.split()
+    if len(parts) < 2:
+        return None
+    return parts[-1], parts[0][0]
+
+
+def last_name(norm: str) -> str | None:
+    """Looser blocking key: last name only (more candidates per block)."""
+    parts = norm.split()
+    return parts[-1] if len(parts) >= 2 else None
+
+
+class BlockingIndex:
+    """Normalized candidate names bucketed by blocking key, built once per dataset.
+    With the default key, query() returns the same matches as a linear fuzzy_match() scan
+    in O(block size) instead of O(candidates). Extra keys widen the candidate set."""
+
+    def __init__(self, candidates, keys=(last_first_initial,)):
+        self.keys = tuple(keys)
+        self.exact = set(candidates)
+        self.blocks = [defaultdict(list) for _ in self.keys]
+        for c in self.exact:
+            for key, block in zip(self.keys, self.blocks):
+                k = key(c)
+                if k is not None:
+                    block[k].append(c)
+
+    def query(self, name: str) -> list[str]:
+        norm = normalize_name(name)
+        if norm in self.exact:
+            return [norm]
+        matches, seen = [], set()
+        for key, block in zip(self.keys, self.blocks):
+            k = key(norm)
+            if k is None:
+                continue
+            for c in block.get(k, ()):
+                if c not in seen:
+                    seen.add(c)
+                    matches.append(c)
+        return matches
+
+
+def fuzzy_match(name: str, candidates: "set[str] | BlockingIndex") -> list[str]:
+    """Find potential matches (exact or last name + first initial).
+    Pass a BlockingIndex instead of a set when matching many names against the same candidates."""
+    if isinstance(candidates, BlockingIndex):
+        return candidates.query(name)
     norm = normalize_name(name)
     if norm in candidates:
         return [norm]
@@ -53,43 +108,48 @@ def fuzzy_match(name: str, candidates: set[str]) -> list[str]:
     return matches
 
 
-def main():
+def approximate_overlaps(datasets: dict[str, dict[str, list[dict]]], threshold: float) -> list[dict]:
+    """Near-miss names (typos, initials, accents) found in different sources, with similarity
+    scores >= threshold. Exact matches are already in the main cross-reference and are skipped."""
+    import approx_match
+
+    keys = sorted(set().union(*datasets.values()))
+    if len(keys) < 2:
+        return []
+    index = approx_match.ApproxIndex(keys)
+    pairs, scores = index.pairs(threshold)
+
+    rows = []
+    for (i, j), score in zip(pairs.tolist(), scores.tolist()):
+        a, b = index.keys[i], index.keys[j]
+        for source_a, by_name_a in datasets.items():
+            if a not in by_name_a:
+                continue
+            for source_b, by_name_b in datasets.items():
+                if source_b != source_a and b in by_name_b:
+                    rows.append({
+                        "name_a": by_name_a[a][0].get("name", a),
+                        "source_a": source_a,
+                        "name_b": by_name_b[b][0].get("name", b),
+                        "source_b": source_b,
+                        "score": round(score, 3),
+                    })
+    rows.sort(key=lambda r: (-r["score"], r["name_a"], r["name_b"]))
+    return rows
+
+
+def main(approx: float | None = None):
     data_dir = Path(__file__).parent / "data"
 
-    # Load all datasets
-    directors = load_csv(data_dir / "directors_3plus_boards.csv")
-    skull_bones = load_csv(data_dir / "skull_bones_members.csv")
-    bilderberg = load_csv(data_dir / "bilderberg_attendees.csv")
-
-    # Build cross-reference
-    all_names = set(directors.keys()) | set(skull_bones.keys()) | set(bilderberg.keys())
-    overlaps = []
-
-    for norm_name in all_names:
-        sources = []
-        if norm_name in directors:
-            sources.append("senate_3plus_boards")
-        if norm_name in skull_bones:
-            sources.append("skull_and_bones")
-        if norm_name in bilderberg:
-            sources.append("bilderberg")
-
-        if len(sources) >= 2:
-            # Get display name from first available source
-            display = norm_name.title()
-            for d in [directors, skull_bones, bilderberg]:
-                if norm_name in d and d[norm_name]:
-                    display = d[norm_name][0].get("name", display)
-                    break
-
-            overlaps.append({
-                "name": display,
-                "sources": ", ".join(sources),
-                "source_count": len(sources),
-            })
-
-    # Sort by number of overlaps
-    overlaps.sort(key=lambda x: (-x["source_count"], x["name"]))
+    # Load all datasets (missing files are empty sources)
+    datasets = {source: load_csv(data_dir / filename) for source, filename in SOURCES}
+
+    # Build cross-reference: one membership bit per source, set in a single pass
+    matrix = MembershipMatrix.from_sources({
+        source: [row.get("name", "") for rows in by_name.values() for row in rows]
+        for source, by_name in datasets.items()
+    })
+    overlaps = matrix.overlaps(2)
 
     # Write results
     output_path = data_dir / "cross_reference.csv"
@@ -107,6 +167,19 @@ def main():
     for o in overlaps[:20]:
         print(f"  {o['name']}: {o['sources']}")
 
+    if approx is not None:
+        near = approximate_overlaps(datasets, approx)
+        approx_path = data_dir / "cross_reference_approx.csv"
+        with open(approx_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=APPROX_FIELDS)
+            writer.writeheader()
+            writer.writerows(near)
+        print(f"Found {len(near)} approximate cross-source matches (score >= {approx}) -> {approx_path}")
+
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Cross-reference people across datasets")
+    parser.add_argument("--approx", type=float, metavar="THRESHOLD", nargs="?", const=0.6,
+                        help="Also list near-miss names across sources (trigram MinHash score, default 0.6)")
+    args = parser.parse_args()
+    main(approx=args.approx)
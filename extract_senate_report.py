@@ -2,34 +2,34 @@
 """Extract director names from 1978 Senate Report PDF (pages 236-278)."""
 import re
 import csv
+import sys
 from pathlib import Path
 
-try:
-    from PyPDF2 import PdfReader
-except ImportError:
+sys.path.insert(0, str(Path(__file__).parent / "power_structure_data"))
+from pdf_text import PdfReader, page_texts  # noqa: E402
+
+if PdfReader is None:
     print("Install PyPDF2: pip install PyPDF2")
-    raise
+    raise ImportError("PyPDF2")
+
+# Pattern for names (capitalized, may include JR/SR/II/III)
+NAME_PATTERN = re.compile(r"^([A-Z][A-Za-z\s\.\-]+(?:,\s*JR\.?|,\s*SR\.?|,\s*II|,\s*III)?)\s*[,|]")
 
 
 def extract_directors_from_pdf(pdf_path: str, start_page: int = 236, end_page: int = 279) -> list[dict]:
-    """Extract director names from specific pages of the Senate report."""
+    """Extract director names from specific pages of the Senate report.
+    Page text comes from pdf_text: extracted in parallel once, then read from its per-page cache."""
     pdf_path = Path(pdf_path)
     if not pdf_path.exists():
         raise FileNotFoundError(f"PDF not found: {pdf_path}")
 
-    reader = PdfReader(str(pdf_path))
     directors = []
 
-    for page_num in range(start_page - 1, min(end_page, len(reader.pages))):
-        page = reader.pages[page_num]
-        text = page.extract_text() or ""
-
-        # Pattern for names (capitalized, may include JR/SR/II/III)
-        name_pattern = r"^([A-Z][A-Za-z\s\.\-]+(?:,\s*JR\.?|,\s*SR\.?|,\s*II|,\s*III)?)\s*[,|]"
+    for page_num, text in page_texts(pdf_path, range(start_page - 1, end_page)).items():
         lines = text.split("\n")
 
         for line in lines:
-            match = re.match(name_pattern, line.strip())
+            match = NAME_PATTERN.match(line.strip())
             if match:
                 name = match.group(1).strip().rstrip(",")
                 if len(name) > 3 and name not in ("THE", "AND", "FOR"):
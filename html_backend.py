@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""Pluggable HTML backends for the Wikipedia parsers.
+
+The lxml backend parses and walks the tree in C and is used when lxml is
+installed; otherwise BeautifulSoup with html.parser. Both expose the same small
+set of operations and return the same strings, so parsers produce identical
+rows whichever backend runs.
+"""
+
+# Text under these tags is not page text (BeautifulSoup's get_text() skips it too)
+NON_TEXT_TAGS = {"script", "style", "template"}
+
+
+def _is_wiki_link(href) -> bool:
+    return bool(href) and href.startswith("/wiki/") and ":" not in href
+
+
+class Bs4Backend:
+    name = "bs4"
+
+    def __init__(self):
+        from bs4 import BeautifulSoup
+
+        self._soup = BeautifulSoup
+
+    def parse(self, html: str):
+        return self._soup(html, "html.parser")
+
+    def content_root(self, doc):
+        """Main article body, falling back to the whole document."""
+        return doc.find("div", {"id": "mw-content-text"}) or doc.find("div", {"id": "bodyContent"}) or doc
+
+    def wikitables(self, doc):
+        return doc.find_all("table", {"class": "wikitable"})
+
+    def rows(self, table):
+        return table.find_all("tr")
+
+    def cells(self, row):
+        return row.find_all(["td", "th"])
+
+    def list_items(self, root):
+        return root.find_all("li")
+
+    def text(self, el, strip: bool = False) -> str:
+        return el.get_text(strip=strip)
+
+    def classes(self, el) -> list[str]:
+        return el.get("class") or []
+
+    def in_tag(self, el, tag: str) -> bool:
+        return el.find_parent(tag) is not None
+
+    def first_wiki_link(self, el):
+        return el.find("a", href=_is_wiki_link)
+
+
+class LxmlBackend:
+    name = "lxml"
+
+    def __init__(self):
+        import lxml.html
+
+        self._lxml_html = lxml.html
+
+    def parse(self, html: str):
+        return self._lxml_html.document_fromstring(html)
+
+    def content_root(self, doc):
+        for div_id in ("mw-content-text", "bodyContent"):
+            found = doc.xpath(f'//div[@id="{div_id}"]')
+            if found:
+                return found[0]
+        return doc
+
+    def wikitables(self, doc):
+        return doc.xpath('//table[contains(concat(" ", normalize-space(@class), " "), " wikitable ")]')
+
+    def rows(self, table):
+        return table.xpath(".//tr")
+
+    def cells(self, row):
+        return row.xpath(".//td|.//th")
+
+    def list_items(self, root):
+        return root.xpath(".//li")
+
+    def _strings(self, el, out: list):
+        tag = el.tag
+        if not isinstance(tag, str) or tag in NON_TEXT_TAGS:
+            return  # Comments, processing instructions, script/style bodies
+        if el.text:
+            out.append(el.text)
+        for child in el:
+            self._strings(child, out)
+            if child.tail:
+                out.append(child.tail)
+
+    def text(self, el, strip: bool = False) -> str:
+        strings = []
+        self._strings(el, strings)
+        if strip:
+            return "".join(s.strip() for s in strings if s.strip())
+        return "".join(strings)
+
+    def classes(self, el) -> list[str]:
+        return (el.get("class") or "").split()
+
+    def in_tag(self, el, tag: str) -> bool:
+        return any(a.tag == tag for a in el.iterancestors())
+
+    def first_wiki_link(self, el):
+        return next((a for a in el.iter("a") if _is_wiki_link(a.get("href"))), None)
+
+
+BACKENDS = {"lxml": LxmlBackend, "bs4": Bs4Backend}
+
+
+def get_backend(name: str | None = None):
+    """Named backend, or the fastest one that is installed."""
+    if name:
+        return BACKENDS[name]()
+    for cls in BACKENDS.values():
+        try:
+            return cls()
+        except ImportError:
+            continue
+    raise ImportError("Install lxml or beautifulsoup4: pip install lxml beautifulsoup4")
@@ -3,37 +3,33 @@
 import csv
 from pathlib import Path
 
-try:
-    from bs4 import BeautifulSoup
-except ImportError:
-    print("Install beautifulsoup4: pip install beautifulsoup4")
-    raise
+from html_backend import get_backend
 
 
-def parse_bilderberg(html_file: str) -> list[dict]:
-    """Parse Bilderberg participant tables. Format: Participants | Nationality | Title."""
+def parse_bilderberg(html_file: str, backend=None) -> list[dict]:
+    """Parse Bilderberg participant tables. Format: Participants | Nationality | Title.
+    backend: an html_backend backend (default: lxml if installed, else bs4)."""
+    backend = backend or get_backend()
     with open(html_file, "r", encoding="utf-8") as f:
-        soup = BeautifulSoup(f.read(), "html.parser")
+        doc = backend.parse(f.read())
 
     attendees = []
     seen = set()  # Dedupe by normalized name
 
-    for table in soup.find_all("table", {"class": "wikitable"}):
-        rows = table.find_all("tr")
+    for table in backend.wikitables(doc):
+        rows = backend.rows(table)
         if not rows:
             continue
 
-        headers = [c.get_text(strip=True).lower() for c in rows[0].find_all(["th", "td"])]
-
         for row in rows[1:]:
-            cells = row.find_all(["td", "th"])
+            cells = backend.cells(row)
             if len(cells) >= 1:
-                name = cells[0].get_text(strip=True)
+                name = backend.text(cells[0], strip=True)
                 # Skip header-like rows
                 if not name or name.lower() in ("participants", "name", "---"):
                     continue
-                country = cells[1].get_text(strip=True) if len(cells) > 1 else ""
-                position = cells[2].get_text(strip=True) if len(cells) > 2 else ""
+                country = backend.text(cells[1], strip=True) if len(cells) > 1 else ""
+                position = backend.text(cells[2], strip=True) if len(cells) > 2 else ""
                 key = (name.lower(), country.lower())
                 if key not in seen:
                     seen.add(key)
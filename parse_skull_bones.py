@@ -1,40 +1,37 @@
 #!/usr/bin/env python3
 """Parse Skull and Bones member list from Wikipedia HTML."""
 import csv
+import re
 from pathlib import Path
 
-try:
-    from bs4 import BeautifulSoup
-except ImportError:
-    print("Install beautifulsoup4: pip install beautifulsoup4")
-    raise
+from html_backend import get_backend
 
 
-def parse_skull_bones(html_file: str) -> list[dict]:
-    """Parse the Wikipedia member list (bullet format: - [Name](link)(year), position)."""
-    import re
-
+def parse_skull_bones(html_file: str, backend=None) -> list[dict]:
+    """Parse the Wikipedia member list (bullet format: - [Name](link)(year), position).
+    backend: an html_backend backend (default: lxml if installed, else bs4)."""
+    backend = backend or get_backend()
     with open(html_file, "r", encoding="utf-8") as f:
-        soup = BeautifulSoup(f.read(), "html.parser")
+        doc = backend.parse(f.read())
 
     members = []
     seen = set()
 
     # Restrict to main content (exclude nav, toc, etc.)
-    content = soup.find("div", {"id": "mw-content-text"}) or soup.find("div", {"id": "bodyContent"}) or soup
+    content = backend.content_root(doc)
 
     # Format: <li><a href="/wiki/Name">Name</a> (YYYY), position</li>
-    for li in content.find_all("li"):
+    for li in backend.list_items(content):
         # Skip nav items
-        if li.find_parent("nav") or "mw-list-item" in (li.get("class") or []):
+        if backend.in_tag(li, "nav") or "mw-list-item" in backend.classes(li):
             continue
-        link = li.find("a", href=lambda h: h and h.startswith("/wiki/") and ":" not in h)
-        if not link:
+        link = backend.first_wiki_link(li)
+        if link is None:
             continue
-        name = link.get_text(strip=True)
+        name = backend.text(link, strip=True)
         if not name or len(name) < 4:
             continue
-        text = li.get_text()
+        text = backend.text(li)
         # Must have (4-digit year) pattern for member entries
         cohort_match = re.search(r"\((\d{4})\)", text)
         if not cohort_match:
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Person -> group memberships as the stored form of the network.
+Cohorts and boards are cliques, so storing every person-person pair grows with
+k^2 per group. network_memberships.csv keeps one row per membership instead;
+person-person edges are projected on demand as B @ B.T over the sparse
+person x group incidence matrix, one projection per relationship type, with
+the number of groups each pair shares.
+
+    python bipartite.py                 # summary of network_memberships.csv
+    python bipartite.py --edges out.csv # export the projected edge list
+"""
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+DATA_DIR = Path(__file__).parent
+MEMBERSHIPS_CSV = DATA_DIR / "network_memberships.csv"
+EDGES_CSV = DATA_DIR / "network_edges.csv"
+MEMBERSHIP_FIELDS = ["person", "group", "relationship", "organization", "year"]
+EDGE_FIELDS = ["source", "target", "relationship", "organization", "year", "shared"]
+
+
+def memberships_from_groups(df: pd.DataFrame, name_col: str, group_col: str, relationship: str, organization=None) -> pd.DataFrame:
+    """Membership rows for people grouped by one column (a cohort year, a company...).
+    organization=None uses the group value itself as the organization."""
+    df = df.dropna(subset=[name_col, group_col])
+    groups = df[group_col].astype(str)
+    return pd.DataFrame({
+        "person": df[name_col].astype(str).to_numpy(),
+        "group": (f"{organization} " + groups if organization else groups).to_numpy(),
+        "relationship": relationship,
+        "organization": organization or groups.to_numpy(),
+        "year": groups.to_numpy() if organization else "",
+    }, columns=MEMBERSHIP_FIELDS)
+
+
+def incidence(memberships: pd.DataFrame, people: pd.Index) -> tuple[sparse.csr_matrix, pd.DataFrame]:
+    """(people x groups 0/1 CSR matrix, one row of group attributes per column)."""
+    rows = people.get_indexer(memberships["person"])
+    cols, groups = pd.factorize(memberships["group"])
+    b = sparse.csr_matrix((np.ones(len(rows), dtype=np.int32), (rows, cols)), shape=(len(people), len(groups)))
+    b.data[:] = 1  # Duplicate memberships count once
+    attrs = memberships.drop_duplicates("group").set_index("group").loc[groups, ["organization", "year"]]
+    return b, attrs.reset_index(drop=True)
+
+
+def project(memberships: pd.DataFrame) -> pd.DataFrame:
+    """Person-person edges: one row per pair and relationship, with the number of shared groups.
+    organization/year are the shared group's when a pair shares exactly one, else blank."""
+    if memberships.empty:
+        return pd.DataFrame(columns=EDGE_FIELDS)
+    people = pd.Index(pd.unique(memberships["person"]))
+    frames = []
+    for relationship, m in memberships.groupby("relationship", sort=False):
+        b, attrs = incidence(m, people)
+        # Same sparsity pattern twice: shared counts, and the sum of (group index + 1) over
+        # shared groups, which is the group itself whenever only one is shared
+        shared = sparse.triu(b @ b.T, k=1).tocsr()
+        tagged = sparse.triu(b.multiply(np.arange(1, b.shape[1] + 1)).tocsr() @ b.T, k=1).tocsr()
+        shared.sort_indices()
+        tagged.sort_indices()
+        src = np.repeat(np.arange(shared.shape[0]), np.diff(shared.indptr))
+        count = shared.data
+        group = np.where(count == 1, tagged.data - 1, -1)
+        single = group >= 0
+        organization = np.full(len(count), "", dtype=object)
+        year = np.full(len(count), "", dtype=object)
+        organization[single] = attrs["organization"].to_numpy(dtype=object)[group[single]]
+        year[single] = attrs["year"].to_numpy(dtype=object)[group[single]]
+        frames.append(pd.DataFrame({
+            "source": people[src],
+            "target": people[shared.indices],
+            "relationship": relationship,
+            "organization": organization,
+            "year": year,
+            "shared": count,
+        }, columns=EDGE_FIELDS))
+    return pd.concat(frames, ignore_index=True)
+
+
+def load_memberships(path: Path = MEMBERSHIPS_CSV) -> pd.DataFrame:
+    return pd.read_csv(path, dtype=str, keep_default_na=False)
+
+
+def load_edges(data_dir: Path = DATA_DIR) -> pd.DataFrame | None:
+    """Projected person-person edges from network_memberships.csv, falling back to an
+    exported network_edges.csv. None when neither exists."""
+    if (data_dir / MEMBERSHIPS_CSV.name).exists():
+        return project(load_memberships(data_dir / MEMBERSHIPS_CSV.name))
+    if (data_dir / EDGES_CSV.name).exists():
+        return pd.read_csv(data_dir / EDGES_CSV.name)
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Person-group memberships and on-demand projection")
+    parser.add_argument("--edges", type=Path, help="Write projected person-person edges to this CSV")
+    args = parser.parse_args()
+
+    memberships = load_memberships()
+    edges = project(memberships)
+    print(f"{len(memberships)} memberships, {memberships['person'].nunique()} people, "
+          f"{memberships['group'].nunique()} groups -> {len(edges)} projected edges")
+    if args.edges:
+        edges.to_csv(args.edges, index=False)
+        print(f"Saved to {args.edges}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,33 +3,50 @@
 import json
 from pathlib import Path
 
+from csr_graph import load_graph
+from layout import layout_positions
+from registry import PersonRegistry
+
 DATA_DIR = Path(__file__).parent
 
 
 def create_d3_json():
     """Export nodes and edges as JSON for D3.js visualization."""
-    import pandas as pd
-
     # Exclude non-person nodes (events, places, etc.)
     EXCLUDE = {"olympics", "summer", "winter", "war", "conference", "congress"}
 
-    edges_path = DATA_DIR / "network_edges.csv"
-    if not edges_path.exists():
-        print("No network_edges.csv")
+    graph = load_graph(DATA_DIR)
+    if graph is None:
+        print("No network_memberships.csv")
         return
 
-    edges_df = pd.read_csv(edges_path)
-    nodes = set()
-    links = []
-    for _, row in edges_df.iterrows():
-        src, tgt = str(row["source"]), str(row["target"])
-        if any(x in src.lower() for x in EXCLUDE) or any(x in tgt.lower() for x in EXCLUDE):
+    names = graph.names()
+    registry = PersonRegistry.load()
+    # Nodes are registry person IDs, so spellings of one person collapse to one node
+    pids = [None if any(x in n.lower() for x in EXCLUDE) else registry.resolve(n) for n in names]
+    nodes = {}
+    links = {}  # (low id, high id, relationship) -> link; collapsed spellings would otherwise repeat a pair
+    src, dst, pos = graph.edge_list()
+    for s, t, p in zip(src.tolist(), dst.tolist(), pos.tolist()):
+        sid, tid = pids[s], pids[t]
+        if sid is None or tid is None or sid == tid:
             continue
-        nodes.add(src)
-        nodes.add(tgt)
-        links.append({"source": src, "target": tgt, "relationship": row.get("relationship", "")})
+        nodes[sid] = registry.name_of(sid)
+        nodes[tid] = registry.name_of(tid)
+        rel = graph.relationships[graph.relationship[p]]
+        year = int(graph.year[p])  # 0 when undated; build_data.py orders edges and eras by it
+        key = (min(sid, tid), max(sid, tid), rel)
+        if key in links:
+            link = links[key]
+            link["shared"] += int(graph.shared[p])
+            if year and (not link["year"] or year < link["year"]):
+                link["year"] = year
+        else:
+            links[key] = {"source": sid, "target": tid, "relationship": rel, "year": year, "shared": int(graph.shared[p])}
+    registry.save()
+    links = list(links.values())
 
-    nodes_list = [{"id": n, "name": n} for n in sorted(nodes)]
+    nodes_list = [{"id": pid, "name": name} for pid, name in sorted(nodes.items(), key=lambda n: (n[1], n[0]))]
     graph = {"nodes": nodes_list, "links": links}
     out_path = DATA_DIR / "network_d3.json"
     out_path.write_text(json.dumps(graph, indent=2))
@@ -47,14 +64,17 @@ def create_png():
         print("Install: pip install networkx matplotlib")
         return
 
-    import pandas as pd
-    edges_df = pd.read_csv(DATA_DIR / "network_edges.csv")
+    graph = load_graph(DATA_DIR)
+    if graph is None:
+        print("No network_memberships.csv")
+        return
+    src, dst, _ = graph.edge_list()
     G = nx.Graph()
-    for _, row in edges_df.iterrows():
-        G.add_edge(row["source"], row["target"])
+    G.add_edges_from(zip(src.tolist(), dst.tolist()))
 
     plt.figure(figsize=(20, 20))
-    pos = nx.spring_layout(G, k=0.5, iterations=50)
+    xy, _ = layout_positions(graph, DATA_DIR)
+    pos = {i: xy[i] for i in G}
     nx.draw_networkx(G, pos, node_size=20, font_size=6, with_labels=False)
     plt.savefig(DATA_DIR / "network_visualization.png", dpi=150, bbox_inches="tight")
     plt.close()
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Compact on-disk person graph in CSR form.
+A graph directory holds .npy arrays that load memory-mapped, so opening a
+10M-edge graph costs milliseconds and only touched pages are read:
+
+    indptr.npy        int64  (nodes + 1)  neighbors of node i are indices[indptr[i]:indptr[i+1]]
+    indices.npy       int32  (2 x edges)  every undirected edge is stored in both directions
+    relationship.npy  uint8   code into meta.json "relationships"
+    organization.npy  int32   code into meta.json "organizations" (-1: none / several)
+    year.npy          int16   0 when unknown
+    shared.npy        int32   groups the pair shares
+    names.bin + name_offsets.npy   interned node names (UTF-8)
+    meta.json         counts, category tables, and the memberships file it was built from
+
+Edge attribute arrays are parallel to indices. load_graph() rebuilds the directory
+from network_memberships.csv when that file has changed.
+"""
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import bipartite
+
+DATA_DIR = Path(__file__).parent
+GRAPH_DIR = DATA_DIR / "network_graph"
+ARRAYS = ("indptr", "indices", "relationship", "organization", "year", "shared", "name_offsets")
+
+
+class CSRGraph:
+    def __init__(self, arrays: dict[str, np.ndarray], names_blob, relationships: list[str], organizations: list[str]):
+        self.indptr = arrays["indptr"]
+        self.indices = arrays["indices"]
+        self.relationship = arrays["relationship"]
+        self.organization = arrays["organization"]
+        self.year = arrays["year"]
+        self.shared = arrays["shared"]
+        self.name_offsets = arrays["name_offsets"]
+        self.names_blob = names_blob
+        self.relationships = relationships
+        self.organizations = organizations
+        self._ids = None
+
+    # ----- construction -----
+    @classmethod
+    def build(cls, names: list[str], src, dst, relationship=None, organization=None, year=None, shared=None,
+              relationships: list[str] = (), organizations: list[str] = ()) -> "CSRGraph":
+        """Graph from undirected edges given as node-index arrays plus optional coded attributes."""
+        n = len(names)
+        src = np.asarray(src, dtype=np.int64)
+        dst = np.asarray(dst, dtype=np.int64)
+        m = len(src)
+        attrs = {
+            "relationship": np.zeros(m, np.uint8) if relationship is None else np.asarray(relationship, np.uint8),
+            "organization": np.full(m, -1, np.int32) if organization is None else np.asarray(organization, np.int32),
+            "year": np.zeros(m, np.int16) if year is None else np.asarray(year, np.int16),
+            "shared": np.ones(m, np.int32) if shared is None else np.asarray(shared, np.int32),
+        }
+        u = np.concatenate([src, dst])
+        v = np.concatenate([dst, src])
+        order = np.lexsort((v, u))
+        arrays = {k: np.concatenate([a, a])[order] for k, a in attrs.items()}
+        arrays["indices"] = v[order].astype(np.int32)
+        arrays["indptr"] = np.concatenate([[0], np.cumsum(np.bincount(u, minlength=n))]).astype(np.int64)
+
+        encoded = [s.encode("utf-8") for s in names]
+        arrays["name_offsets"] = np.concatenate([[0], np.cumsum([len(b) for b in encoded], dtype=np.int64)]).astype(np.int64)
+        blob = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+        return cls(arrays, blob, list(relationships), list(organizations))
+
+    @classmethod
+    def from_edges(cls, edges: pd.DataFrame) -> "CSRGraph":
+        """Graph from a projected edge table (bipartite.EDGE_FIELDS columns)."""
+        names, codes = np.unique(np.concatenate([edges["source"].astype(str), edges["target"].astype(str)]), return_inverse=True)
+        m = len(edges)
+        rel_codes, relationships = pd.factorize(edges["relationship"].fillna("").astype(str))
+        orgs = edges["organization"].fillna("").astype(str) if "organization" in edges else pd.Series([""] * m)
+        org_codes, organizations = pd.factorize(orgs.where(orgs != "", None))
+        years = pd.to_numeric(edges["year"], errors="coerce").fillna(0) if "year" in edges else 0
+        shared = edges["shared"] if "shared" in edges else None
+        return cls.build(
+            names.tolist(), codes[:m], codes[m:], rel_codes, org_codes, np.asarray(years).astype(np.int16), shared,
+            relationships.tolist(), organizations.tolist(),
+        )
+
+    # ----- persistence -----
+    def save(self, path: Path = GRAPH_DIR, built_from: dict | None = None):
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        for name in ARRAYS:
+            np.save(path / f"{name}.npy", getattr(self, name))
+        np.asarray(self.names_blob, dtype=np.uint8).tofile(path / "names.bin")
+        meta = {
+            "nodes": self.n_nodes,
+            "edges": self.n_edges,
+            "relationships": self.relationships,
+            "organizations": self.organizations,
+            "built_from": built_from or {},
+        }
+        (path / "meta.json").write_text(json.dumps(meta))
+
+    @classmethod
+    def load(cls, path: Path = GRAPH_DIR, mmap: bool = True) -> "CSRGraph":
+        path = Path(path)
+        meta = json.loads((path / "meta.json").read_text())
+        mode = "r" if mmap else None
+        arrays = {name: np.load(path / f"{name}.npy", mmap_mode=mode) for name in ARRAYS}
+        if arrays["name_offsets"][-1] == 0:
+            blob = np.zeros(0, np.uint8)  # np.memmap refuses empty files
+        else:
+            blob = np.memmap(path / "names.bin", dtype=np.uint8, mode="r") if mmap else np.fromfile(path / "names.bin", np.uint8)
+        return cls(arrays, blob, meta["relationships"], meta["organizations"])
+
+    # ----- queries -----
+    @property
+    def n_nodes(self) -> int:
+        return len(self.indptr) - 1
+
+    @property
+    def n_edges(self) -> int:
+        """Undirected edges (one per pair and relationship)."""
+        return len(self.indices) // 2
+
+    def name(self, i: int) -> str:
+        return bytes(self.names_blob[self.name_offsets[i] : self.name_offsets[i + 1]]).decode("utf-8")
+
+    def names(self) -> list[str]:
+        blob = bytes(self.names_blob)
+        off = self.name_offsets.tolist()
+        return [blob[off[i] : off[i + 1]].decode("utf-8") for i in range(self.n_nodes)]
+
+    def id_of(self, name: str) -> int | None:
+        """Node index for a name (the name table is interned on first use)."""
+        if self._ids is None:
+            self._ids = {n: i for i, n in enumerate(self.names())}
+        return self._ids.get(name)
+
+    def neighbors(self, i: int) -> np.ndarray:
+        return self.indices[self.indptr[i] : self.indptr[i + 1]]
+
+    def degree(self, i: int | None = None):
+        """Edge count for one node, or the degree array for all nodes."""
+        if i is None:
+            return np.diff(self.indptr)
+        return int(self.indptr[i + 1] - self.indptr[i])
+
+    def edge_attrs(self, i: int) -> list[dict]:
+        """Neighbors of node i with their edge attributes."""
+        lo, hi = self.indptr[i], self.indptr[i + 1]
+        return [
+            {
+                "target": int(t),
+                "relationship": self.relationships[r] if self.relationships else "",
+                "organization": self.organizations[o] if o >= 0 else "",
+                "year": int(y) or None,
+                "shared": int(s),
+            }
+            for t, r, o, y, s in zip(self.indices[lo:hi], self.relationship[lo:hi], self.organization[lo:hi], self.year[lo:hi], self.shared[lo:hi])
+        ]
+
+    def edges_between(self, u: int, v: int) -> list[dict]:
+        """Attributes of every edge joining u and v (one per relationship)."""
+        lo = int(self.indptr[u])
+        row = self.indices[lo : self.indptr[u + 1]]  # Sorted within each row
+        a, b = np.searchsorted(row, v, "left"), np.searchsorted(row, v, "right")
+        return [
+            {
+                "relationship": self.relationships[self.relationship[p]] if self.relationships else "",
+                "organization": self.organizations[self.organization[p]] if self.organization[p] >= 0 else "",
+                "year": int(self.year[p]) or None,
+                "shared": int(self.shared[p]),
+            }
+            for p in range(lo + a, lo + b)
+        ]
+
+    def edge_list(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(source, target, position in indices) for each undirected edge once, source < target."""
+        src = np.repeat(np.arange(self.n_nodes, dtype=np.int32), np.diff(self.indptr))
+        keep = np.flatnonzero(src < self.indices)
+        return src[keep], np.asarray(self.indices[keep]), keep
+
+
+def expand(indptr: np.ndarray, indices: np.ndarray, frontier: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """(parent, neighbor) for every edge out of the frontier nodes, without a Python loop."""
+    starts = np.asarray(indptr[frontier])
+    lens = np.asarray(indptr[frontier + 1]) - starts
+    total = int(lens.sum())
+    if total == 0:
+        return np.empty(0, np.int64), np.empty(0, np.int64)
+    ends = np.cumsum(lens)
+    idx = np.arange(total) - np.repeat(ends - lens, lens) + np.repeat(starts, lens)
+    return np.repeat(frontier, lens), np.asarray(indices[idx]).astype(np.int64)
+
+
+def memberships_stamp(path: Path) -> dict:
+    st = path.stat()
+    return {"file": path.name, "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def load_graph(data_dir: Path = DATA_DIR, graph_dir: Path | None = None) -> CSRGraph | None:
+    """Memory-mapped graph, rebuilt from network_memberships.csv (or an exported
+    network_edges.csv) when missing or out of date. None when there is no network data."""
+    graph_dir = Path(graph_dir or data_dir / GRAPH_DIR.name)
+    source = data_dir / bipartite.MEMBERSHIPS_CSV.name
+    if not source.exists():
+        source = data_dir / bipartite.EDGES_CSV.name
+    if not source.exists():
+        return None
+    stamp = memberships_stamp(source)
+    try:
+        if json.loads((graph_dir / "meta.json").read_text()).get("built_from") == stamp:
+            return CSRGraph.load(graph_dir)
+    except (OSError, ValueError):
+        pass
+    graph = CSRGraph.from_edges(bipartite.load_edges(data_dir))
+    graph.save(graph_dir, built_from=stamp)
+    return CSRGraph.load(graph_dir)
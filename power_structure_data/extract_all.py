@@ -4,15 +4,31 @@ Power Structure Data Extraction - Complete Pipeline
 Downloads and extracts all data from public sources.
 """
 import re
-import time
+import sys
 import csv
+import time
 import logging
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime
 
-import requests
 from bs4 import BeautifulSoup
 
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(1, str(Path(__file__).parent.parent))  # html_backend.py lives at the repo root
+import bipartite
+import csr_graph
+import fetcher
+import graph_metrics
+import layout
+import pdf_text
+import temporal
+from html_backend import get_backend
+from membership import MembershipMatrix
+from registry import PersonRegistry
+
 try:
     from PyPDF2 import PdfReader
 except ImportError:
@@ -39,18 +55,18 @@ logging.basicConfig(
     ],
 )
 logger = logging.getLogger(__name__)
+_failed_lock = threading.Lock()
 
 
 def log_failed(url: str, reason: str):
-    with open(FAILED_URLS, "a") as f:
+    with _failed_lock, open(FAILED_URLS, "a") as f:
         f.write(f"{datetime.now().isoformat()}\t{url}\t{reason}\n")
 
 
 def fetch(url: str, dest: Path, timeout: int = 30) -> bool:
-    """Download URL to file. Returns True on success."""
+    """Download URL to file (rate-limited per host). Returns True on success."""
     try:
-        time.sleep(1)
-        r = requests.get(url, timeout=timeout, headers={"User-Agent": "Mozilla/5.0"})
+        r = fetcher.get(url, timeout=timeout)
         r.raise_for_status()
         dest.parent.mkdir(parents=True, exist_ok=True)
         dest.write_bytes(r.content)
@@ -76,10 +92,8 @@ def dataset1_senate_report():
 
     if pdf_path.exists() and PdfReader and pdf_path.stat().st_size > 1000:
         try:
-            reader = PdfReader(str(pdf_path))
             directors = []
-            for page_num in range(235, min(278, len(reader.pages))):
-                text = reader.pages[page_num].extract_text() or ""
+            for page_num, text in pdf_text.page_texts(pdf_path, range(235, 278)).items():
                 for line in text.split("\n"):
                     if re.match(r"^[A-Z][A-Z\s\.]+(?:,|$)", line) and len(line) > 3:
                         directors.append({"name": line.strip()[:100], "page": page_num + 1})
@@ -102,10 +116,8 @@ def dataset2_cfr():
 
     if pdf_path.exists() and PdfReader:
         try:
-            reader = PdfReader(str(pdf_path))
             members = []
-            for page in reader.pages:
-                text = page.extract_text() or ""
+            for text in pdf_text.page_texts(pdf_path).values():
                 for match in re.findall(r"([A-Z][a-z]+ [A-Z][a-z]+(?: [A-Z][a-z]+)?)", text):
                     if 5 < len(match) < 50 and "University" not in match and "Press" not in match and "Council" not in match:
                         members.append({"name": match, "source": "CFR finding aid"})
@@ -119,6 +131,58 @@ def dataset2_cfr():
 
 
 # ========== DATASET 3: SKULL AND BONES ==========
+def wikitable_rows(backend, doc):
+    """Cells of each wikitable row after the first (the header row)."""
+    for table in backend.wikitables(doc):
+        for row in backend.rows(table)[1:]:
+            yield backend.cells(row)
+
+
+def skull_bones_members(html: str, seen: set, backend=None) -> list[dict]:
+    """Roster rows from one Skull and Bones page (wikitable rows, then main-content list items).
+    backend: an html_backend backend (default: lxml if installed, else bs4); `seen` dedupes across pages."""
+    backend = backend or get_backend()
+    doc = backend.parse(html)
+    text = backend.text
+    members = []
+
+    # Tables
+    for cells in wikitable_rows(backend, doc):
+        if len(cells) >= 2:
+            name = text(cells[1], strip=True)
+            cohort = text(cells[0], strip=True) if text(cells[0]).replace(" ", "").isdigit() else ""
+            position = text(cells[2], strip=True) if len(cells) > 2 else ""
+            if name and len(name) > 3 and name not in seen:
+                seen.add(name)
+                members.append({"name": name, "cohort_year": cohort, "position": position, "century": "unknown"})
+
+    # List items
+    for li in backend.list_items(backend.content_root(doc)):
+        if backend.in_tag(li, "nav"):
+            continue
+        link = backend.first_wiki_link(li)
+        if link is None:
+            continue
+        name = text(link, strip=True)
+        if not name or len(name) < 4:
+            continue
+        li_text = text(li)
+        cohort_match = re.search(r"\((\d{4})\)", li_text)
+        if not cohort_match:
+            continue
+        cohort = cohort_match.group(1)
+        position = re.sub(r"^.*?\(\d{4}\)\s*,?\s*", "", li_text).strip()[:200]
+        # Filter out non-person names (events, places, etc.)
+        if any(x in name.lower() for x in ["olympics", "summer", "winter", "war", "conference"]):
+            continue
+        key = (name, cohort)
+        if key not in seen:
+            seen.add(key)
+            century = "19th" if cohort < "1900" else "20th" if cohort.isdigit() else "unknown"
+            members.append({"name": name, "cohort_year": cohort, "position": position, "century": century})
+    return members
+
+
 def dataset3_skull_bones():
     """Wikipedia - Skull and Bones roster."""
     urls = [
@@ -129,49 +193,10 @@ def dataset3_skull_bones():
     seen = set()
 
     for url in urls:
-        time.sleep(1)
         try:
-            r = requests.get(url, timeout=30, headers={"User-Agent": "Mozilla/5.0"})
+            r = fetcher.get(url, timeout=30)
             r.raise_for_status()
-            soup = BeautifulSoup(r.text, "html.parser")
-            content = soup.find("div", {"id": "mw-content-text"}) or soup.find("div", {"id": "bodyContent"}) or soup
-
-            # Tables
-            for table in soup.find_all("table", {"class": "wikitable"}):
-                for row in table.find_all("tr")[1:]:
-                    cells = row.find_all(["td", "th"])
-                    if len(cells) >= 2:
-                        name = (cells[1] if len(cells) > 1 else cells[0]).get_text(strip=True)
-                        cohort = cells[0].get_text(strip=True) if cells[0].get_text().replace(" ", "").isdigit() else ""
-                        position = cells[2].get_text(strip=True) if len(cells) > 2 else ""
-                        if name and len(name) > 3 and name not in seen:
-                            seen.add(name)
-                            members.append({"name": name, "cohort_year": cohort, "position": position, "century": "unknown"})
-
-            # List items
-            for li in content.find_all("li"):
-                if li.find_parent("nav"):
-                    continue
-                link = li.find("a", href=lambda h: h and h.startswith("/wiki/") and ":" not in h)
-                if not link:
-                    continue
-                name = link.get_text(strip=True)
-                if not name or len(name) < 4:
-                    continue
-                text = li.get_text()
-                cohort_match = re.search(r"\((\d{4})\)", text)
-                if not cohort_match:
-                    continue
-                cohort = cohort_match.group(1)
-                position = re.sub(r"^.*?\(\d{4}\)\s*,?\s*", "", text).strip()[:200]
-                # Filter out non-person names (events, places, etc.)
-                if any(x in name.lower() for x in ["olympics", "summer", "winter", "war", "conference"]):
-                    continue
-                key = (name, cohort)
-                if key not in seen:
-                    seen.add(key)
-                    century = "19th" if cohort < "1900" else "20th" if cohort.isdigit() else "unknown"
-                    members.append({"name": name, "cohort_year": cohort, "position": position, "century": century})
+            members.extend(skull_bones_members(r.text, seen))
         except Exception as e:
             logger.warning(f"Skull and Bones {url}: {e}")
             log_failed(url, str(e))
@@ -183,65 +208,67 @@ def dataset3_skull_bones():
 
 
 # ========== DATASET 4: BILDERBERG ==========
+def bilderberg_de_attendees(html: str, seen: set, backend=None) -> list[dict]:
+    """German list: Name | Years | Country | Sector | Position tables."""
+    backend = backend or get_backend()
+    text = backend.text
+    attendees = []
+    for cells in wikitable_rows(backend, backend.parse(html)):
+        if len(cells) >= 4:
+            name = text(cells[0], strip=True)
+            country = text(cells[2], strip=True) if len(cells) > 2 else ""
+            if name and (name, country) not in seen:
+                seen.add((name, country))
+                attendees.append({
+                    "name": name,
+                    "years": text(cells[1], strip=True) if len(cells) > 1 else "",
+                    "country": country,
+                    "sector": text(cells[3], strip=True) if len(cells) > 3 else "",
+                    "position": text(cells[4], strip=True) if len(cells) > 4 else "",
+                })
+    return attendees
+
+
+def bilderberg_en_attendees(html: str, seen: set, backend=None) -> list[dict]:
+    """English list: Participants | Nationality | Title tables."""
+    backend = backend or get_backend()
+    text = backend.text
+    attendees = []
+    for cells in wikitable_rows(backend, backend.parse(html)):
+        if len(cells) >= 2:
+            name = text(cells[0], strip=True)
+            if not name or name.lower() in ("participants", "name", "---"):
+                continue
+            country = text(cells[1], strip=True) if len(cells) > 1 else ""
+            position = text(cells[2], strip=True) if len(cells) > 2 else ""
+            if (name, country) not in seen:
+                seen.add((name, country))
+                attendees.append({
+                    "name": name,
+                    "years": "",
+                    "country": country,
+                    "sector": "Unknown",
+                    "position": position,
+                })
+    return attendees
+
+
 def dataset4_bilderberg():
     """German and English Wikipedia - Bilderberg attendees."""
     attendees = []
     seen = set()
 
-    # German
-    url_de = "https://de.wikipedia.org/wiki/Liste_von_Teilnehmern_an_Bilderberg-Konferenzen"
-    try:
-        time.sleep(1)
-        r = requests.get(url_de, timeout=30, headers={"User-Agent": "Mozilla/5.0"})
-        r.raise_for_status()
-        soup = BeautifulSoup(r.text, "html.parser")
-        for table in soup.find_all("table", {"class": "wikitable"}):
-            for row in table.find_all("tr")[1:]:
-                cells = row.find_all(["td", "th"])
-                if len(cells) >= 4:
-                    name = cells[0].get_text(strip=True)
-                    country = cells[2].get_text(strip=True) if len(cells) > 2 else ""
-                    if name and (name, country) not in seen:
-                        seen.add((name, country))
-                        attendees.append({
-                            "name": name,
-                            "years": cells[1].get_text(strip=True) if len(cells) > 1 else "",
-                            "country": country,
-                            "sector": cells[3].get_text(strip=True) if len(cells) > 3 else "",
-                            "position": cells[4].get_text(strip=True) if len(cells) > 4 else "",
-                        })
-    except Exception as e:
-        logger.warning(f"German Bilderberg: {e}")
-        log_failed(url_de, str(e))
-
-    # English
-    url_en = "https://en.wikipedia.org/wiki/List_of_Bilderberg_participants"
-    try:
-        time.sleep(1)
-        r = requests.get(url_en, timeout=30, headers={"User-Agent": "Mozilla/5.0"})
-        r.raise_for_status()
-        soup = BeautifulSoup(r.text, "html.parser")
-        for table in soup.find_all("table", {"class": "wikitable"}):
-            for row in table.find_all("tr")[1:]:
-                cells = row.find_all(["td", "th"])
-                if len(cells) >= 2:
-                    name = cells[0].get_text(strip=True)
-                    if not name or name.lower() in ("participants", "name", "---"):
-                        continue
-                    country = cells[1].get_text(strip=True) if len(cells) > 1 else ""
-                    position = cells[2].get_text(strip=True) if len(cells) > 2 else ""
-                    if (name, country) not in seen:
-                        seen.add((name, country))
-                        attendees.append({
-                            "name": name,
-                            "years": "",
-                            "country": country,
-                            "sector": "Unknown",
-                            "position": position,
-                        })
-    except Exception as e:
-        logger.warning(f"English Bilderberg: {e}")
-        log_failed(url_en, str(e))
+    for label, url, parse in [
+        ("German", "https://de.wikipedia.org/wiki/Liste_von_Teilnehmern_an_Bilderberg-Konferenzen", bilderberg_de_attendees),
+        ("English", "https://en.wikipedia.org/wiki/List_of_Bilderberg_participants", bilderberg_en_attendees),
+    ]:
+        try:
+            r = fetcher.get(url, timeout=30)
+            r.raise_for_status()
+            attendees.extend(parse(r.text, seen))
+        except Exception as e:
+            logger.warning(f"{label} Bilderberg: {e}")
+            log_failed(url, str(e))
 
     if attendees:
         df = pd.DataFrame(attendees)
@@ -365,78 +392,83 @@ def dataset8_penn():
 
 
 # ========== CROSS-REFERENCE & NETWORK ==========
-def create_cross_reference():
-    """Build master network from all datasets."""
+# Cross-reference sources: (source, file, name column, optional (column, value) row filter).
+# Files that do not exist yet (e.g. Bohemian Grove, pending archive access) are skipped.
+CROSS_REFERENCE_SOURCES = [
+    ("skull_bones", "skull_bones_complete.csv", "name", None),
+    ("bilderberg", "bilderberg_attendees.csv", "name", None),
+    ("cfr", "cfr_members_1921_1951.csv", "name", None),
+    ("trilateral", "trilateral_members.csv", "name", None),
+    ("directors", "directors_3plus_boards.csv", "name", None),
+    ("board_interlocks", "board_interlocks_sec.csv", "name", None),
+    ("form_990", "institutional_edges_990.csv", "source", ("source_type", "person")),
+    ("bohemian_grove", "bohemian_grove_members.csv", "name", None),
+]
+
+
+def load_sources(sources=CROSS_REFERENCE_SOURCES) -> dict[str, "pd.DataFrame"]:
+    """{source: DataFrame with a "name" column} for each source file present."""
     dfs = {}
-    for name, path in [
-        ("skull_bones", DATA_DIR / "skull_bones_complete.csv"),
-        ("bilderberg", DATA_DIR / "bilderberg_attendees.csv"),
-        ("cfr", DATA_DIR / "cfr_members_1921_1951.csv"),
-        ("directors", DATA_DIR / "directors_3plus_boards.csv"),
-        ("board_interlocks", DATA_DIR / "board_interlocks_sec.csv"),
-    ]:
-        if path.exists():
-            try:
-                dfs[name] = pd.read_csv(path)
-            except Exception:
-                pass
+    for source, filename, col, where in sources:
+        path = DATA_DIR / filename
+        if not path.exists():
+            continue
+        try:
+            df = pd.read_csv(path)
+        except Exception:
+            continue
+        if where and where[0] in df.columns:
+            df = df[df[where[0]] == where[1]]
+        if col != "name" and col in df.columns:
+            df = df.rename(columns={col: "name"})
+        dfs[source] = df
+    return dfs
+
+
+def find_overlaps(dfs: dict[str, "pd.DataFrame"], col: str = "name") -> list[dict]:
+    """People in 2+ of the named DataFrames, keyed by normalized name, in one pass over all rows.
+    The display name is the first raw spelling seen (sources in order)."""
+    matrix = MembershipMatrix.from_sources({k: df[col] for k, df in dfs.items() if col in df.columns})
+    return matrix.overlaps(2)
 
+
+def create_cross_reference():
+    """Build master network from all datasets."""
+    dfs = load_sources()
     if not dfs:
         logger.warning("No CSV files to cross-reference")
         return
 
-    def normalize(n):
-        return re.sub(r"\s*(Jr\.?|Sr\.?|II|III)\s*$", "", str(n).strip().lower(), flags=re.I)
-    def get_names(df, col="name"):
-        if col not in df.columns:
-            return set()
-        return {normalize(n) for n in df[col].dropna() if not pd.isna(n)}
-
-    all_sets = {k: get_names(v) for k, v in dfs.items()}
-    overlaps = []
-
-    for norm_name in set().union(*all_sets.values()):
-        sources = [k for k, s in all_sets.items() if norm_name in s]
-        if len(sources) >= 2:
-            display = norm_name.title()
-            for df in dfs.values():
-                if "name" in df.columns:
-                    match = df[df["name"].apply(normalize) == norm_name]
-                    if not match.empty:
-                        display = match.iloc[0]["name"]
-                        break
-            overlaps.append({"name": display, "sources": ", ".join(sources), "source_count": len(sources)})
-
-    overlaps.sort(key=lambda x: (-x["source_count"], x["name"]))
+    # Stable person IDs: only sources whose names changed since the last run are resolved
+    registry = PersonRegistry.load()
+    for source, df in dfs.items():
+        if "name" in df.columns and registry.update_source(source, df["name"].dropna().tolist()):
+            logger.info(f"Registry: resolved {source} ({len(registry.people)} people)")
+    registry.save()
+
+    overlaps = find_overlaps(dfs)
     if overlaps:
         pd.DataFrame(overlaps).to_csv(DATA_DIR / "cross_reference.csv", index=False)
         logger.info(f"Cross-reference: {len(overlaps)} people in 2+ sources")
 
-    # Network edges
-    edges = []
+    # Network: person -> group memberships; edges are projected from these on demand
+    memberships = []
 
     # Board interlocks: people who share a board (same company)
     if "board_interlocks" in dfs:
         bi = dfs["board_interlocks"]
         if "name" in bi.columns and "company" in bi.columns:
-            by_company = bi.groupby("company")["name"].apply(list)
-            for company, members in by_company.items():
-                for i, n1 in enumerate(members):
-                    for n2 in members[i + 1 :]:
-                        edges.append({"source": n1, "target": n2, "relationship": "shared_board", "organization": company, "year": ""})
+            memberships.append(bipartite.memberships_from_groups(bi, "name", "company", "shared_board"))
 
     # Skull and Bones cohorts
     if "skull_bones" in dfs and "cohort_year" in dfs["skull_bones"].columns:
         sb = dfs["skull_bones"]
-        for cohort in sb["cohort_year"].dropna().unique():
-            if str(cohort).isdigit():
-                members = sb[sb["cohort_year"] == cohort]["name"].tolist()
-                for i, n1 in enumerate(members):
-                    for n2 in members[i + 1 :]:
-                        edges.append({"source": n1, "target": n2, "relationship": "Skull and Bones cohort", "organization": "Skull and Bones", "year": cohort})
-    if edges:
-        pd.DataFrame(edges).to_csv(DATA_DIR / "network_edges.csv", index=False)
-        logger.info(f"Created {len(edges)} network edges")
+        sb = sb[sb["cohort_year"].astype(str).str.isdigit()]
+        memberships.append(bipartite.memberships_from_groups(sb, "name", "cohort_year", "Skull and Bones cohort", "Skull and Bones"))
+    if memberships:
+        memberships = pd.concat(memberships, ignore_index=True)
+        memberships.to_csv(bipartite.MEMBERSHIPS_CSV, index=False)
+        logger.info(f"Saved {len(memberships)} group memberships ({memberships['group'].nunique()} groups)")
 
 
 # ========== NETWORK VISUALIZATION ==========
@@ -451,24 +483,21 @@ def create_network_viz():
         logger.warning("NetworkX/matplotlib not installed - skip visualization")
         return
 
-    edges_path = DATA_DIR / "network_edges.csv"
-    if not edges_path.exists():
-        logger.info("No network_edges.csv for visualization")
-        return
-
-    edges_df = pd.read_csv(edges_path)
-    if edges_df.empty or "source" not in edges_df.columns or "target" not in edges_df.columns:
+    graph = csr_graph.load_graph(DATA_DIR)
+    if graph is None:
+        logger.info("No network_memberships.csv for visualization")
         return
 
+    src, dst, _ = graph.edge_list()
     G = nx.Graph()
-    for _, row in edges_df.iterrows():
-        G.add_edge(row["source"], row["target"])
+    G.add_edges_from(zip(src.tolist(), dst.tolist()))
 
     if G.number_of_nodes() == 0:
         return
 
     plt.figure(figsize=(20, 20))
-    pos = nx.spring_layout(G, k=0.5, iterations=50)
+    xy, _ = layout.layout_positions(graph, DATA_DIR)
+    pos = {i: xy[i] for i in G}
     nx.draw_networkx(G, pos, node_size=20, font_size=6, with_labels=False)
     plt.savefig(DATA_DIR / "network_visualization.png", dpi=150, bbox_inches="tight")
     plt.close()
@@ -504,29 +533,77 @@ def create_summary():
 
 
 # ========== MAIN ==========
-def main():
+DATASETS = [
+    dataset1_senate_report,
+    dataset2_cfr,
+    dataset3_skull_bones,
+    dataset4_bilderberg,
+    dataset5_trilateral,
+    dataset6_dunl,
+    dataset7_bohemian_grove,
+    dataset8_penn,
+    dataset9_sec_edgar,
+    dataset10_form_990,
+]
+
+
+def run_datasets(datasets=None, max_workers: int | None = None):
+    """Run independent dataset downloads concurrently. Per-host rate limits live in fetcher."""
+    datasets = datasets or DATASETS
+    with ThreadPoolExecutor(max_workers=max_workers or len(datasets)) as pool:
+        futures = {pool.submit(ds): ds.__name__ for ds in datasets}
+        for fut in as_completed(futures):
+            try:
+                fut.result()
+            except Exception as e:
+                logger.warning(f"{futures[fut]} failed: {e}")
+
+
+def main(record: Path | None = None, replay: Path | None = None):
+    """Run the pipeline. record saves every HTTP response to a ZIP; replay serves a previous
+    recording instead of the network, so runs are reproducible and timings are ours alone."""
     DATA_DIR.mkdir(parents=True, exist_ok=True)
     if FAILED_URLS.exists():
         FAILED_URLS.unlink()
     logger.info("=== POWER STRUCTURE DATA EXTRACTION ===")
 
-    dataset1_senate_report()
-    dataset2_cfr()
-    dataset3_skull_bones()
-    dataset4_bilderberg()
-    dataset5_trilateral()
-    dataset6_dunl()
-    dataset7_bohemian_grove()
-    dataset8_penn()
-    dataset9_sec_edgar()
-    dataset10_form_990()
-
-    create_cross_reference()
-    create_network_viz()
-    create_summary()
-
+    recorder = None
+    if record or replay:
+        import replay as http_replay
+
+        if replay:
+            http_replay.start_replay(replay)
+            logger.info(f"Replaying HTTP from {replay}")
+        else:
+            recorder = http_replay.start_recording()
+            logger.info(f"Recording HTTP to {record}")
+
+    stages = [
+        ("download + extract", run_datasets),
+        ("cross-reference", create_cross_reference),
+        ("graph metrics", graph_metrics.compute_node_metrics),
+        ("temporal index", temporal.write_timeseries),
+        ("layout", layout.compute_layout),
+        ("network viz", create_network_viz),
+        ("summary", create_summary),
+    ]
+    for label, stage in stages:
+        t0 = time.perf_counter()
+        stage()
+        logger.info(f"[timing] {label}: {time.perf_counter() - t0:.2f}s")
+    if fetcher.CACHE is not None:
+        fetcher.CACHE.evict()
+
+    if recorder:
+        recorder.save(record)
+        logger.info(f"Saved {sum(len(v) for v in recorder.entries.values())} responses to {record}")
     logger.info("=== EXTRACTION COMPLETE ===")
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Power Structure Data Extraction")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--record", type=Path, help="Save all HTTP responses to this archive (.zip)")
+    mode.add_argument("--replay", type=Path, help="Serve HTTP from a recorded archive instead of the network")
+    args = parser.parse_args()
+    main(record=args.record, replay=args.replay)
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+SEC EDGAR bulk submissions - offline CIK -> latest DEF 14A index.
+Streams the nightly submissions.zip member by member (nothing is extracted to
+disk) and keeps one row per company, so whole-market runs need one download
+instead of one submissions API call per CIK. The index can be brought forward
+from the daily form index between bulk downloads.
+"""
+import csv
+import io
+import json
+import re
+import sys
+import zipfile
+from datetime import date, timedelta
+from pathlib import Path
+
+DATA_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(DATA_DIR))
+import fetcher  # noqa: E402
+from extractors.sec_edgar import HEADERS  # noqa: E402
+
+BULK_URL = "https://www.sec.gov/Archives/edgar/daily-index/bulkdata/submissions.zip"
+DAILY_INDEX_URL = "https://www.sec.gov/Archives/edgar/daily-index/{year}/QTR{qtr}/form.{ymd}.idx"
+BULK_ZIP = DATA_DIR / "submissions.zip"
+INDEX_CSV = DATA_DIR / "edgar_def14a_index.csv"
+INDEX_FIELDS = ["cik", "name", "accession", "filing_date"]
+
+DAILY_ROW = re.compile(r"^DEF 14A\s+(.+?)\s+(\d+)\s+(\d{8}|\d{4}-\d{2}-\d{2})\s+(\S+)\s*$")
+
+
+def download_bulk(dest: Path = BULK_ZIP) -> Path:
+    """Stream submissions.zip to disk (multi-GB; bypasses the response cache)."""
+    fetcher.throttle(BULK_URL)
+    tmp = dest.with_suffix(".part")
+    with fetcher.get_session().get(BULK_URL, headers=HEADERS, stream=True, timeout=120) as r:
+        r.raise_for_status()
+        with open(tmp, "wb") as f:
+            for chunk in r.iter_content(chunk_size=1 << 20):
+                f.write(chunk)
+    tmp.replace(dest)
+    return dest
+
+
+def latest_def14a(submissions: dict) -> dict | None:
+    """Newest DEF 14A in a submissions document (recent filings are newest-first)."""
+    recent = submissions.get("filings", {}).get("recent", {})
+    forms = recent.get("form", [])
+    accessions = recent.get("accessionNumber", [])
+    dates = recent.get("filingDate", [])
+    for i, form in enumerate(forms):
+        if form and form.upper() == "DEF 14A" and i < len(accessions):
+            return {"accession": accessions[i], "filing_date": dates[i] if i < len(dates) else ""}
+    return None
+
+
+def build_index(zip_path: Path = BULK_ZIP) -> dict[str, dict]:
+    """One pass over submissions.zip -> {cik: {cik, name, accession, filing_date}}."""
+    index = {}
+    with zipfile.ZipFile(zip_path) as zf:
+        for info in zf.infolist():
+            # CIK##########-submissions-NNN.json hold older overflow filings; the latest is in CIK##########.json
+            if not info.filename.endswith(".json") or "-submissions-" in info.filename:
+                continue
+            with zf.open(info) as f:
+                raw = f.read()
+            if b'"DEF 14A"' not in raw:  # Most filers never file a proxy; skip the JSON parse
+                continue
+            subs = json.loads(raw)
+            hit = latest_def14a(subs)
+            if hit:
+                cik = str(subs.get("cik") or info.filename[3:13]).lstrip("0") or "0"
+                index[cik] = {"cik": cik, "name": subs.get("name", ""), **hit}
+    return index
+
+
+def save_index(index: dict[str, dict], path: Path = INDEX_CSV):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        w = csv.DictWriter(f, fieldnames=INDEX_FIELDS)
+        w.writeheader()
+        w.writerows(sorted(index.values(), key=lambda e: int(e["cik"])))
+
+
+def load_index(path: Path = INDEX_CSV) -> dict[str, dict]:
+    if not path.exists():
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return {row["cik"]: row for row in csv.DictReader(f)}
+
+
+def get_index(zip_path: Path = BULK_ZIP, index_path: Path = INDEX_CSV) -> dict[str, dict]:
+    """Saved index if it is newer than the archive, else rebuild it from the archive."""
+    if index_path.exists() and (not zip_path.exists() or index_path.stat().st_mtime >= zip_path.stat().st_mtime):
+        return load_index(index_path)
+    if not zip_path.exists():
+        download_bulk(zip_path)
+    index = build_index(zip_path)
+    save_index(index, index_path)
+    return index
+
+
+def update_from_daily_index(index: dict[str, dict], day: date) -> int:
+    """Apply one day's form.YYYYMMDD.idx to the index. Returns number of companies updated."""
+    url = DAILY_INDEX_URL.format(year=day.year, qtr=(day.month - 1) // 3 + 1, ymd=day.strftime("%Y%m%d"))
+    r = fetcher.get(url, headers=HEADERS, timeout=30)
+    if r.status_code == 404:  # Weekends and holidays have no index
+        return 0
+    r.raise_for_status()
+
+    updated = 0
+    for line in io.StringIO(r.text):
+        m = DAILY_ROW.match(line)
+        if not m:
+            continue
+        name, cik, filed, file_name = m.groups()
+        filed = filed if "-" in filed else f"{filed[:4]}-{filed[4:6]}-{filed[6:]}"
+        accession = Path(file_name).stem
+        entry = index.get(cik)
+        if entry is None or filed >= entry.get("filing_date", ""):
+            index[cik] = {"cik": cik, "name": entry["name"] if entry else name, "accession": accession, "filing_date": filed}
+            updated += 1
+    return updated
+
+
+def refresh_index(index: dict[str, dict], since: date, until: date | None = None) -> int:
+    """Bring the index forward one daily index at a time (inclusive range)."""
+    until = until or date.today()
+    updated = 0
+    day = since
+    while day <= until:
+        if day.weekday() < 5:
+            try:
+                updated += update_from_daily_index(index, day)
+            except Exception as e:
+                print(f"Daily index {day} failed: {e}")
+        day += timedelta(days=1)
+    return updated
+
+
+def index_submissions(entry: dict) -> dict:
+    """Minimal submissions document for an index row, in the shape find_def14a() reads."""
+    return {
+        "cik": entry["cik"],
+        "name": entry.get("name", ""),
+        "filings": {"recent": {"form": ["DEF 14A"], "accessionNumber": [entry["accession"]], "filingDate": [entry.get("filing_date", "")]}},
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build the CIK -> latest DEF 14A index from SEC submissions.zip")
+    parser.add_argument("--zip", type=Path, default=BULK_ZIP, help="Path to submissions.zip (downloaded if missing)")
+    parser.add_argument("--rebuild", action="store_true", help="Re-scan the archive even if a saved index exists")
+    parser.add_argument("--since", type=date.fromisoformat, help="Apply daily form indexes from this date (YYYY-MM-DD)")
+    args = parser.parse_args()
+
+    if args.rebuild:
+        if not args.zip.exists():
+            download_bulk(args.zip)
+        index = build_index(args.zip)
+    else:
+        index = get_index(args.zip)
+    if args.since:
+        print(f"Daily index updates: {refresh_index(index, args.since)}")
+    save_index(index)
+    print(f"Saved {len(index)} companies to {INDEX_CSV}")
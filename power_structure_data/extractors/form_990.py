@@ -4,13 +4,22 @@ IRS Form 990 / ProPublica - Institutional Affiliation Extractor (Evidence Layer
 Maps nonprofit boards, officers, and grant networks.
 """
 import json
-import time
+import re
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-import requests
-
 DATA_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(DATA_DIR))
+import fetcher  # noqa: E402
+
 API_BASE = "https://projects.propublica.org/nonprofits/api/v2"
+ORG_CACHE = DATA_DIR / ".cache" / "propublica_orgs.json"
+EIN_RE = re.compile(r"^\d{2}-?\d{7}$")
+DEFAULT_WORKERS = 4  # Requests in flight; the propublica.org token bucket sets the actual rate
+
+_cache_lock = threading.Lock()
 
 
 def search_organizations(query: str, state: str | None = None) -> list[dict]:
@@ -20,8 +29,7 @@ def search_organizations(query: str, state: str | None = None) -> list[dict]:
     if state:
         params["state[id]"] = state
     try:
-        time.sleep(0.5)
-        r = requests.get(url, params=params, timeout=30)
+        r = fetcher.get(url, params=params, timeout=30)
         r.raise_for_status()
         data = r.json()
         return data.get("organizations", [])
@@ -34,8 +42,7 @@ def get_organization(ein: int) -> dict | None:
     """Get full org details including filings."""
     url = f"{API_BASE}/organizations/{ein}.json"
     try:
-        time.sleep(0.5)
-        r = requests.get(url, timeout=30)
+        r = fetcher.get(url, timeout=30)
         r.raise_for_status()
         return r.json()
     except Exception as e:
@@ -43,8 +50,63 @@ def get_organization(ein: int) -> dict | None:
         return None
 
 
-def extract_institutional_affiliations(queries: list[str] | None = None) -> list[dict]:
-    """Build institutional affiliation nodes from key policy/foundation orgs."""
+def load_org_cache(path: Path = ORG_CACHE) -> dict[str, dict]:
+    """EIN -> org summary saved by earlier runs."""
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def save_org_cache(cache: dict[str, dict], path: Path = ORG_CACHE):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(cache))
+    tmp.replace(path)
+
+
+def get_org_summary(ein: int, cache: dict[str, dict]) -> dict | None:
+    """Org summary for an EIN, fetched from ProPublica only on a cache miss."""
+    key = str(ein)
+    with _cache_lock:
+        if key in cache:
+            return cache[key]
+    details = get_organization(ein)
+    if not details:
+        return None
+    o = details.get("organization", {})
+    filings = details.get("filings_with_data", [])
+    latest = filings[0] if filings else {}
+    summary = {
+        "name": o.get("name", ""),
+        "city": o.get("city", ""),
+        "state": o.get("state", ""),
+        "assets": o.get("asset_amount"),
+        "tax_year": latest.get("tax_prd_yr"),
+    }
+    with _cache_lock:
+        cache[key] = summary
+    return summary
+
+
+def resolve_query(query: str) -> list[dict]:
+    """A name query -> top 5 search hits; an EIN (12-3456789 or 123456789) -> just that EIN."""
+    query = query.strip()
+    if EIN_RE.match(query):
+        return [{"ein": int(query.replace("-", ""))}]
+    return search_organizations(query)[:5]  # Top 5 per query
+
+
+def load_queries(path: Path) -> list[str]:
+    """One org name or EIN per line; blank lines and # comments ignored."""
+    with open(path, "r", encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith("#")]
+
+
+def extract_institutional_affiliations(queries: list[str] | None = None, max_workers: int = DEFAULT_WORKERS) -> list[dict]:
+    """Build institutional affiliation nodes from key policy/foundation orgs.
+    Queries may be org names or EINs. Each EIN is fetched at most once per run (and not at all if
+    it is in the persistent EIN cache); searches and detail fetches run with bounded concurrency."""
     if queries is None:
         queries = [
             "Council on Foreign Relations",
@@ -59,50 +121,61 @@ def extract_institutional_affiliations(queries: list[str] | None = None) -> list
             "Bilderberg",
         ]
 
+    # The EIN cache follows the HTTP cache switch, so uncached (and recorded) runs really fetch
+    use_cache = fetcher.CACHE is not None
+    cache = load_org_cache() if use_cache else {}
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        hits = {}
+        for orgs in pool.map(resolve_query, queries):
+            for org in orgs:
+                if org.get("ein") is not None:
+                    hits.setdefault(org["ein"], org)  # First query to return an EIN wins
+
+        summaries = dict(zip(hits, pool.map(lambda ein: get_org_summary(ein, cache), hits)))
+    if use_cache:
+        save_org_cache(cache)
+
     affiliations = []
-    seen = set()
-
-    for q in queries:
-        orgs = search_organizations(q)
-        for org in orgs[:5]:  # Top 5 per query
-            ein = org.get("ein")
-            name = org.get("name", "")
-            city = org.get("city", "")
-            state = org.get("state", "")
-            if (ein, name) in seen:
-                continue
-            seen.add((ein, name))
-
-            details = get_organization(ein)
-            if details:
-                o = details.get("organization", {})
-                filings = details.get("filings_with_data", [])
-                latest = filings[0] if filings else {}
-                affiliations.append({
-                    "org_name": name,
-                    "ein": ein,
-                    "city": city,
-                    "state": state,
-                    "assets": o.get("asset_amount"),
-                    "tax_year": latest.get("tax_prd_yr"),
-                    "source": "IRS Form 990",
-                    "evidence_layer": "institutional_affiliation",
-                })
-            print(f"  {name}: EIN {ein}")
+    for ein, org in hits.items():
+        summary = summaries[ein]
+        name = org.get("name") or (summary or {}).get("name", "")
+        if summary:
+            affiliations.append({
+                "org_name": name,
+                "ein": ein,
+                "city": org.get("city") or summary["city"],
+                "state": org.get("state") or summary["state"],
+                "assets": summary["assets"],
+                "tax_year": summary["tax_year"],
+                "source": "IRS Form 990",
+                "evidence_layer": "institutional_affiliation",
+            })
+        print(f"  {name}: EIN {ein}")
 
     return affiliations
 
 
-def extract_org_network() -> list[dict]:
-    """Get org-to-org structure for cross-reference (grants, related orgs)."""
-    # ProPublica org data has filings - grant data would need Form 990 XML parsing
-    # For now return org list for node creation
+def extract_org_network(archives: list[Path] | None = None, eins: set[str] | None = None) -> list[dict]:
+    """Get org-to-org structure for cross-reference (grants, related orgs).
+    With IRS e-file ZIPs, returns officer and Schedule I grant edges (see form_990_xml.py);
+    otherwise the ProPublica org list for node creation."""
+    if archives:
+        from extractors.form_990_xml import iter_archive_edges
+
+        return list(iter_archive_edges(archives, eins=eins))
     return extract_institutional_affiliations()
 
 
 if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Form 990 / ProPublica - Institutional Affiliation extraction")
+    parser.add_argument("--queries", type=Path, help="File with one org name or EIN per line")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Requests in flight at once")
+    args = parser.parse_args()
+
     print("Form 990 / ProPublica - Institutional Affiliation extraction")
-    affils = extract_institutional_affiliations()
+    affils = extract_institutional_affiliations(load_queries(args.queries) if args.queries else None, args.workers)
     out = DATA_DIR / "institutional_affiliations_990.csv"
     if affils:
         import csv
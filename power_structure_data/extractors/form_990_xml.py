@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+IRS Form 990 e-file XML - Officer and grant networks (Evidence Layer 2)
+Streams the IRS bulk e-file ZIPs (one XML return per member) with iterparse,
+so memory stays constant regardless of archive size. Emits person -> org edges
+from Part VII officers/directors and org -> org edges from Schedule I grants.
+Download archives from https://www.irs.gov/charities-non-profits/form-990-series-downloads
+"""
+import csv
+import multiprocessing
+import os
+import sys
+import zipfile
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+DATA_DIR = Path(__file__).parent.parent
+BATCH_SIZE = 500  # ZIP members per worker task
+# Not fork: dataset10 runs this from extract_all's thread pool, where a forked child can
+# inherit locks held by other threads (logging, urllib3) and deadlock
+MP_CONTEXT = multiprocessing.get_context(
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+EDGE_FIELDS = [
+    "source", "source_type", "target", "target_type", "relationship", "role",
+    "amount", "ein", "target_ein", "tax_year", "object_id", "evidence_layer",
+]
+
+# Group elements across 990 / 990-PF / 990-EZ and pre-2013 schema names
+OFFICER_GROUPS = {
+    "Form990PartVIISectionAGrp", "Form990PartVIISectionA",
+    "OfficerDirTrstKeyEmplGrp", "OfficerDirTrstKeyEmpl",
+    "OfficerDirectorTrusteeEmplGrp", "OfficerDirectorTrusteeEmpl",
+}
+GRANT_GROUPS = {"RecipientTable", "GrantOrContributionPdDurYrGrp", "GrantOrContriPaidDuringYear"}
+KEEP_GROUPS = OFFICER_GROUPS | GRANT_GROUPS | {"Filer"}  # Read as a whole when they end
+
+PERSON_TAGS = ("PersonNm", "NamePerson", "PersonName")
+TITLE_TAGS = ("TitleTxt", "Title")
+BUSINESS_TAGS = ("BusinessNameLine1Txt", "BusinessNameLine1")
+RECIPIENT_PERSON_TAGS = ("RecipientPersonNm", "RecipientPersonName")
+RECIPIENT_EIN_TAGS = ("RecipientEIN", "EINOfRecipient")
+AMOUNT_TAGS = ("CashGrantAmt", "AmountOfCashGrant", "Amt", "Amount")
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _find_text(elem: ET.Element, names: tuple[str, ...]) -> str:
+    """First non-empty text among descendants whose local tag is in names (in names order)."""
+    found = {}
+    for child in elem.iter():
+        t = _local(child.tag)
+        if t in names and t not in found and child.text and child.text.strip():
+            found[t] = child.text.strip()
+    return next((found[n] for n in names if n in found), "")
+
+
+def parse_return(f, object_id: str = "", eins: set[str] | None = None) -> list[dict]:
+    """Officer and grant edges from one e-file return. Stops early if the filer is not in eins."""
+    rows = []
+    filer_ein = org_name = tax_year = ""
+    # Open elements. Each finished element is detached from its parent, except inside a group
+    # (its fields are read when the group ends), so the tree never holds more than the open path
+    open_elems = []
+    in_group = 0
+    for event, elem in ET.iterparse(f, events=("start", "end")):
+        tag = _local(elem.tag)
+        if event == "start":
+            open_elems.append(elem)
+            in_group += tag in KEEP_GROUPS
+            continue
+        open_elems.pop()
+
+        if tag == "Filer":
+            filer_ein = _find_text(elem, ("EIN",))
+            org_name = _find_text(elem, BUSINESS_TAGS)
+            if eins is not None and filer_ein not in eins:
+                return []
+        elif tag in ("TaxYr", "TaxYear"):
+            tax_year = (elem.text or "").strip()
+        elif tag in OFFICER_GROUPS:
+            person = _find_text(elem, PERSON_TAGS) or _find_text(elem, BUSINESS_TAGS)
+            if person:
+                rows.append({
+                    "source": person, "source_type": "person",
+                    "target": org_name, "target_type": "organization",
+                    "relationship": "org_board", "role": _find_text(elem, TITLE_TAGS),
+                    "amount": "", "ein": filer_ein, "target_ein": filer_ein,
+                })
+        elif tag in GRANT_GROUPS:
+            recipient = _find_text(elem, BUSINESS_TAGS)
+            recipient_type = "organization"
+            if not recipient:
+                recipient, recipient_type = _find_text(elem, RECIPIENT_PERSON_TAGS), "person"
+            if recipient:
+                rows.append({
+                    "source": org_name, "source_type": "organization",
+                    "target": recipient, "target_type": recipient_type,
+                    "relationship": "grant", "role": "",
+                    "amount": _find_text(elem, AMOUNT_TAGS), "ein": filer_ein,
+                    "target_ein": _find_text(elem, RECIPIENT_EIN_TAGS),
+                })
+
+        in_group -= tag in KEEP_GROUPS
+        if not in_group and open_elems:
+            open_elems[-1].remove(elem)  # Children finish in order, so this is the parent's only child
+
+    for row in rows:
+        # Stamped at the end: the tax year element is not guaranteed to precede the groups
+        row.update({"tax_year": tax_year, "object_id": object_id, "evidence_layer": "institutional_affiliation"})
+    return rows
+
+
+def _parse_batch(args: tuple[str, list[str], set[str] | None]) -> list[dict]:
+    """Worker: parse a slice of members from one archive (each process opens its own handle)."""
+    zip_path, names, eins = args
+    rows = []
+    with zipfile.ZipFile(zip_path) as zf:
+        for name in names:
+            try:
+                with zf.open(name) as f:
+                    rows.extend(parse_return(f, Path(name).stem.split("_")[0], eins))
+            except ET.ParseError as e:
+                print(f"Bad XML {name}: {e}", file=sys.stderr)
+    return rows
+
+
+def iter_archive_edges(zip_paths: list[Path], workers: int | None = None, eins: set[str] | None = None):
+    """Yield edge rows from IRS e-file ZIPs, fanning members out across a process pool."""
+    tasks = []
+    for zip_path in zip_paths:
+        with zipfile.ZipFile(zip_path) as zf:
+            names = [n for n in zf.namelist() if n.lower().endswith(".xml")]
+        tasks.extend((str(zip_path), names[i : i + BATCH_SIZE], eins) for i in range(0, len(names), BATCH_SIZE))
+
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count(), mp_context=MP_CONTEXT) as pool:
+        for rows in pool.map(_parse_batch, tasks):
+            yield from rows
+
+
+def write_edges(zip_paths: list[Path], out: Path, workers: int | None = None, eins: set[str] | None = None) -> int:
+    """Stream edges from the archives to CSV. Returns rows written."""
+    n = 0
+    with open(out, "w", newline="", encoding="utf-8") as f:
+        w = csv.DictWriter(f, fieldnames=EDGE_FIELDS)
+        w.writeheader()
+        for row in iter_archive_edges(zip_paths, workers, eins):
+            w.writerow(row)
+            n += 1
+    return n
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Officer/grant edges from IRS Form 990 e-file ZIPs")
+    parser.add_argument("archives", nargs="+", type=Path, help="IRS bulk e-file ZIPs")
+    parser.add_argument("--out", type=Path, default=DATA_DIR / "institutional_edges_990.csv")
+    parser.add_argument("--workers", type=int, default=None, help="Parser processes (default: CPU count)")
+    parser.add_argument("--eins", help="Only keep returns filed by these EINs (comma-separated)")
+    args = parser.parse_args()
+
+    eins = {e.strip().replace("-", "") for e in args.eins.split(",")} if args.eins else None
+    n = write_edges(args.archives, args.out, args.workers, eins)
+    print(f"Saved {n} edges to {args.out}")
@@ -4,29 +4,35 @@ SEC EDGAR - Board Interlock Extractor (Evidence Layer 1)
 Fetches DEF 14A proxy statements for director lists.
 SEC requires User-Agent with contact info - use your email.
 """
+import argparse
 import json
 import re
-import time
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-import requests
-
 # SEC requires a descriptive User-Agent - replace with your email
 HEADERS = {
     "User-Agent": "PowerStructureResearch/1.0 (research@example.com)",
     "Accept": "application/json",
     "Accept-Encoding": "gzip, deflate",
-    "Host": "www.sec.gov",
 }
 
 DATA_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(DATA_DIR))
+import fetcher  # noqa: E402
+import names  # noqa: E402
+
+# In-flight companies. SEC's 10 req/s budget is enforced by fetcher's sec.gov token bucket,
+# so this only needs to be large enough to hide request latency behind the rate limit.
+DEFAULT_WORKERS = 8
 
 
 def get_company_tickers() -> dict:
     """Fetch SEC company ticker -> CIK mapping."""
     url = "https://www.sec.gov/files/company_tickers.json"
     try:
-        r = requests.get(url, headers=HEADERS, timeout=30)
+        r = fetcher.get(url, headers=HEADERS, timeout=30)
         r.raise_for_status()
         return r.json()
     except Exception as e:
@@ -39,8 +45,7 @@ def get_submissions(cik: str) -> dict | None:
     cik_padded = str(cik).zfill(10)
     url = f"https://data.sec.gov/submissions/CIK{cik_padded}.json"
     try:
-        time.sleep(0.2)  # SEC rate limit: 10 requests/second
-        r = requests.get(url, headers=HEADERS, timeout=30)
+        r = fetcher.get(url, headers=HEADERS, timeout=30)
         r.raise_for_status()
         return r.json()
     except Exception as e:
@@ -67,40 +72,105 @@ def find_def14a(submissions: dict) -> str | None:
     return None
 
 
-def extract_directors_from_def14a(html: str, company: str) -> list[dict]:
-    """Parse DEF 14A HTML for director names. Heuristic pattern matching."""
+# Common patterns in DEF 14A (director tables, bios)
+DIRECTOR_PATTERNS = [
+    re.compile(r"(?:Director|Trustee|Member of the Board)[:\s]+([A-Z][a-z]+ [A-Z][a-z]+(?: [A-Z][a-z]+)?(?:,?\s*(?:Jr\.?|Sr\.?|II|III))?)", re.IGNORECASE),
+    re.compile(r"([A-Z][a-z]+ [A-Z][a-z]+(?: [A-Z][a-z]+)?),?\s*(?:age|Age)\s*\d+", re.IGNORECASE),
+]
+NAME_RE = re.compile(r"^[A-Z][a-z]+ [A-Z][a-z]+")
+# Headings that open the director-nominee / board biography part of a proxy statement
+SECTION_RE = re.compile(
+    r"election of directors|director nominees|nominees for (?:election as )?directors?|"
+    r"(?:information|biographies) (?:about|of|regarding) (?:our |the )?(?:director |board )?nominees|"
+    r"board nominees|directors and executive officers|proposal\s+(?:no\.\s*)?1\b",
+    re.IGNORECASE,
+)
+SECTION_CHARS = 40_000  # Text scanned after each section heading
+MAX_SECTIONS = 8
+# lxml refuses str input that carries an encoding declaration (XHTML / inline XBRL filings)
+XML_DECL_RE = re.compile(r"^\s*<\?xml[^>]*\?>")
+
+
+def director_sections(text: str) -> list[str]:
+    """Slices of the proxy text that follow director-nominee headings (merged, capped).
+    Falls back to the whole text when no heading is found."""
+    spans = []
+    for m in SECTION_RE.finditer(text):
+        start, end = m.start(), min(len(text), m.start() + SECTION_CHARS)
+        if spans and start <= spans[-1][1]:
+            spans[-1] = (spans[-1][0], max(spans[-1][1], end))
+        else:
+            if len(spans) == MAX_SECTIONS:
+                break
+            spans.append((start, end))
+    return [text[a:b] for a, b in spans] or [text]
+
+
+def _cell_text(text: str) -> str:
+    return " ".join(text.split())
+
+
+def _text_and_rows_lxml(html: str) -> tuple[str, list[list[str]]] | None:
+    """lxml version of _text_and_rows; None when lxml is missing or cannot parse the filing."""
+    try:
+        import lxml.html
+    except ImportError:
+        return None
+    try:
+        doc = lxml.html.document_fromstring(XML_DECL_RE.sub("", html, count=1))
+    except (ValueError, lxml.etree.ParserError):
+        return None
+    for el in doc.xpath("//script|//style"):
+        el.drop_tree()
+    # Cells at any depth, like find_all(): old EDGAR HTML wraps cells in <font> and other tags
+    rows = [[_cell_text(c.text_content()) for c in tr.iter("td", "th")] for tr in doc.iter("tr")]
+    return doc.text_content(), rows
+
+
+def _text_and_rows_bs4(html: str) -> tuple[str, list[list[str]]]:
     from bs4 import BeautifulSoup
 
     soup = BeautifulSoup(html, "html.parser")
+    for el in soup.find_all(["script", "style"]):
+        el.decompose()
+    rows = [[_cell_text(c.get_text()) for c in tr.find_all(["td", "th"])] for tr in soup.find_all("tr")]
+    return soup.get_text(), rows
+
+
+def _text_and_rows(html: str) -> tuple[str, list[list[str]]]:
+    """Document text plus each table row's cell texts, each computed exactly once.
+    Uses lxml when installed, BeautifulSoup otherwise or when lxml cannot parse the filing;
+    both give the same rows."""
+    return _text_and_rows_lxml(html) or _text_and_rows_bs4(html)
+
+
+def extract_directors_from_def14a(html: str, company: str) -> list[dict]:
+    """Parse DEF 14A HTML for director names. Heuristic pattern matching.
+    Name patterns only scan the director-nominee sections, and table cells are read once."""
+    text, rows = _text_and_rows(html)
     directors = []
     seen = set()
 
-    # Common patterns in DEF 14A (director tables, bios)
-    patterns = [
-        r"(?:Director|Trustee|Member of the Board)[:\s]+([A-Z][a-z]+ [A-Z][a-z]+(?: [A-Z][a-z]+)?(?:,?\s*(?:Jr\.?|Sr\.?|II|III))?)",
-        r"([A-Z][a-z]+ [A-Z][a-z]+(?: [A-Z][a-z]+)?),?\s*(?:age|Age)\s*\d+",
-    ]
-
-    text = soup.get_text()
-    for pattern in patterns:
-        for match in re.finditer(pattern, text, re.IGNORECASE):
-            name = match.group(1).strip().rstrip(",")
-            name = re.sub(r"\s*(Jr\.?|Sr\.?|II|III)\s*$", r" \1", name)
-            if re.match(r"^[A-Z][a-z]+ [A-Z][a-z]+", name) and len(name) > 5 and len(name) < 60:
-                if name not in seen:
-                    seen.add(name)
-                    directors.append({"name": name, "company": company, "source": "DEF 14A", "evidence_layer": "board_interlock"})
+    def add(name: str):
+        if name not in seen:
+            seen.add(name)
+            directors.append({"name": name, "company": company, "source": "DEF 14A", "evidence_layer": "board_interlock"})
+
+    for section in director_sections(text):
+        for pattern in DIRECTOR_PATTERNS:
+            for match in pattern.finditer(section):
+                name = match.group(1).strip().rstrip(",")
+                name = names.tidy_suffix(name)
+                if NAME_RE.match(name) and len(name) > 5 and len(name) < 60:
+                    add(name)
 
     # Also look for table rows with "Director" in adjacent cells
-    for row in soup.find_all("tr"):
-        cells = row.find_all(["td", "th"])
-        for i, cell in enumerate(cells):
-            if "director" in cell.get_text().lower() and i > 0:
-                name = cells[i - 1].get_text(strip=True)
-                if re.match(r"^[A-Z][a-z]+ [A-Z][a-z]+", name) and len(name) > 5:
-                    if name not in seen:
-                        seen.add(name)
-                        directors.append({"name": name, "company": company, "source": "DEF 14A", "evidence_layer": "board_interlock"})
+    for cells in rows:
+        for i in range(1, len(cells)):
+            if "director" in cells[i].lower():
+                name = cells[i - 1]
+                if NAME_RE.match(name) and len(name) > 5:
+                    add(name)
 
     return directors
 
@@ -108,8 +178,7 @@ def extract_directors_from_def14a(html: str, company: str) -> list[dict]:
 def get_def14a_html(url: str) -> str | None:
     """Fetch DEF 14A HTML."""
     try:
-        time.sleep(0.2)
-        r = requests.get(url, headers=HEADERS, timeout=30)
+        r = fetcher.get(url, headers=HEADERS, timeout=30)
         r.raise_for_status()
         return r.text
     except Exception as e:
@@ -117,42 +186,80 @@ def get_def14a_html(url: str) -> str | None:
         return None
 
 
-def extract_board_interlocks(tickers: list[str] | None = None) -> list[dict]:
-    """Main extraction pipeline."""
-    if tickers is None:
-        tickers = ["JPM", "C", "BAC", "GS", "MS", "WFC", "BLK", "V", "MA", "AXP"]  # Major financials
-
-    ticker_map = get_company_tickers()
-    if not ticker_map:
-        return []
-
-    cik_by_ticker = {v["ticker"]: v["cik_str"] for v in ticker_map.values()}
-    all_directors = []
+def extract_company_directors(cik: str, label: str, bulk_index: dict | None = None) -> list[dict]:
+    """Submissions -> latest DEF 14A -> directors for one company.
+    With a bulk_index (see edgar_bulk.py) the submissions API call is skipped.
+    A company that fails is logged and skipped so it cannot stop a full run."""
+    try:
+        if bulk_index is not None:
+            from extractors.edgar_bulk import index_submissions
 
-    for ticker in tickers:
-        ticker = ticker.upper()
-        cik = cik_by_ticker.get(ticker)
-        if not cik:
-            continue
-        subs = get_submissions(cik)
+            entry = bulk_index.get(str(cik).lstrip("0"))
+            subs = index_submissions(entry) if entry else None
+        else:
+            subs = get_submissions(cik)
         if not subs:
-            continue
-        company = subs.get("name", ticker)
+            return []
+        company = subs.get("name", label)
         url = find_def14a(subs)
         if not url:
-            continue
+            return []
         html = get_def14a_html(url)
-        if html:
-            directors = extract_directors_from_def14a(html, company)
+        if not html:
+            return []
+        directors = extract_directors_from_def14a(html, company)
+    except Exception as e:
+        print(f"Director extraction failed for CIK {cik} ({label}): {e}")
+        return []
+    print(f"  {label}: {len(directors)} directors")
+    return directors
+
+
+def extract_board_interlocks(tickers: list[str] | None = None, all_companies: bool = False, max_workers: int = DEFAULT_WORKERS, bulk_index: dict | None = None) -> list[dict]:
+    """Main extraction pipeline. Pass all_companies=True to cover every CIK in company_tickers.json
+    (or every proxy filer in bulk_index). Companies are processed concurrently over the shared
+    session; results keep input order."""
+    if tickers is None and not all_companies:
+        tickers = ["JPM", "C", "BAC", "GS", "MS", "WFC", "BLK", "V", "MA", "AXP"]  # Major financials
+
+    if all_companies and bulk_index is not None:
+        targets = [(cik, e.get("name") or cik) for cik, e in bulk_index.items()]
+    else:
+        ticker_map = get_company_tickers()
+        if not ticker_map:
+            return []
+        if all_companies:
+            by_cik = {}
+            for v in ticker_map.values():
+                by_cik.setdefault(v["cik_str"], v["ticker"])  # One entry per CIK (share classes repeat it)
+            targets = list(by_cik.items())
+        else:
+            cik_by_ticker = {v["ticker"]: v["cik_str"] for v in ticker_map.values()}
+            targets = [(cik_by_ticker[t.upper()], t.upper()) for t in tickers if t.upper() in cik_by_ticker]
+
+    all_directors = []
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for directors in pool.map(lambda t: extract_company_directors(*t, bulk_index=bulk_index), targets):
             all_directors.extend(directors)
-            print(f"  {ticker}: {len(directors)} directors")
 
     return all_directors
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="SEC EDGAR - Board Interlock extraction")
+    parser.add_argument("tickers", nargs="*", help="Tickers to extract (default: major financials)")
+    parser.add_argument("--all", action="store_true", help="Every company in SEC company_tickers.json")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Companies in flight at once")
+    parser.add_argument("--bulk", action="store_true", help="Find DEF 14As via the submissions.zip index (edgar_bulk.py)")
+    args = parser.parse_args()
+
     print("SEC EDGAR - Board Interlock extraction")
-    directors = extract_board_interlocks()
+    bulk_index = None
+    if args.bulk:
+        from extractors.edgar_bulk import get_index
+
+        bulk_index = get_index()
+    directors = extract_board_interlocks(args.tickers or None, all_companies=args.all, max_workers=args.workers, bulk_index=bulk_index)
     out = DATA_DIR / "board_interlocks_sec.csv"
     if directors:
         import csv
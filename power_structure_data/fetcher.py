@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP layer for the extraction pipeline.
+One pooled session for every source, throttled per host with token buckets
+instead of a global sleep, so independent hosts can be downloaded in parallel.
+"""
+import os
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from http_cache import HTTPCache
+
+USER_AGENT = "Mozilla/5.0"
+
+# Host suffix -> (requests per second, burst). Matched against the URL host, longest suffix wins.
+HOST_RATES = {
+    "wikipedia.org": (2.0, 2),
+    "sec.gov": (10.0, 1),  # SEC fair-access policy: 10 requests/second
+    "propublica.org": (2.0, 1),
+    "rockarch.org": (1.0, 1),
+    "dunl.org": (1.0, 1),
+}
+DEFAULT_RATE = (1.0, 1)
+POOL_SIZE = 32
+
+# Set False to skip rate limiting (replay mode serves recordings, not live hosts)
+THROTTLE = True
+
+# Shared response cache; set ELITE_HTTP_CACHE=0 (or fetcher.CACHE = None) to always hit the network
+CACHE: HTTPCache | None = None if os.environ.get("ELITE_HTTP_CACHE") == "0" else HTTPCache()
+
+
+class TokenBucket:
+    """Thread-safe token bucket. Callers reserve a token and sleep until it is theirs."""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self._tokens = float(self.burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take one token, blocking as long as needed. Returns seconds waited."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait:
+            time.sleep(wait)
+        return wait
+
+
+_buckets: dict[str, TokenBucket] = {}
+_buckets_lock = threading.Lock()
+_session: requests.Session | None = None
+_session_lock = threading.Lock()
+
+
+def host_key(url: str) -> str:
+    """Rate-limit key for a URL: the configured suffix it falls under, else its own host."""
+    host = (urlparse(url).hostname or "").lower()
+    matches = [s for s in HOST_RATES if host == s or host.endswith("." + s)]
+    return max(matches, key=len) if matches else host
+
+
+def bucket_for(url: str) -> TokenBucket:
+    key = host_key(url)
+    with _buckets_lock:
+        bucket = _buckets.get(key)
+        if bucket is None:
+            bucket = _buckets[key] = TokenBucket(*HOST_RATES.get(key, DEFAULT_RATE))
+        return bucket
+
+
+def throttle(url: str) -> float:
+    """Block until the URL's host has budget for one more request."""
+    return bucket_for(url).acquire() if THROTTLE else 0.0
+
+
+def get_session() -> requests.Session:
+    """Process-wide keep-alive session shared by all worker threads."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            s = requests.Session()
+            adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+            s.mount("https://", adapter)
+            s.mount("http://", adapter)
+            s.headers["User-Agent"] = USER_AGENT
+            _session = s
+        return _session
+
+
+def get(url: str, params: dict | None = None, headers: dict | None = None, timeout: int = 30, cache: bool = True) -> requests.Response:
+    """Rate-limited GET through the shared session and response cache. Does not raise on HTTP errors.
+    Fresh cache hits skip the network (and the rate limit); stale ones are revalidated conditionally."""
+    if cache and CACHE is not None:
+        return CACHE.get(get_session(), url, before_request=throttle, params=params, headers=headers, timeout=timeout)
+    throttle(url)
+    return get_session().get(url, params=params, headers=headers, timeout=timeout)
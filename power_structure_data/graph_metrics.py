@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Structural centrality for the person graph: PageRank, k-core number and
+sampled betweenness, written to node_metrics.csv for web/build_data.py.
+Works on the CSR graph (csr_graph.py) as a scipy sparse matrix. Betweenness
+uses Brandes' algorithm from a random sample of source nodes; each BFS is
+level-synchronous in numpy and the sources are spread over a process pool.
+
+    python graph_metrics.py [--samples 256] [--workers 4]
+"""
+import argparse
+import csv
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+from scipy import sparse
+
+import csr_graph
+from registry import PersonRegistry
+
+DATA_DIR = Path(__file__).parent
+METRICS_CSV = DATA_DIR / "node_metrics.csv"
+METRIC_FIELDS = ["person_id", "name", "degree", "pagerank", "core_number", "betweenness"]
+DEFAULT_SAMPLES = 256  # Betweenness source samples; exact when >= node count
+SEED = 22
+
+
+def adjacency(graph: csr_graph.CSRGraph) -> sparse.csr_matrix:
+    """Symmetric matrix of edge multiplicities (a pair linked by two relationships has 2)."""
+    n = graph.n_nodes
+    data = np.ones(len(graph.indices), dtype=np.float64)
+    a = sparse.csr_matrix((data, np.asarray(graph.indices), np.asarray(graph.indptr)), shape=(n, n))
+    a.sum_duplicates()
+    return a
+
+
+def simple(a: sparse.csr_matrix) -> sparse.csr_matrix:
+    """Same pattern with unit weights."""
+    s = a.copy()
+    s.data[:] = 1
+    return s
+
+
+def pagerank(a: sparse.csr_matrix, alpha: float = 0.85, tol: float = 1e-10, max_iter: int = 200) -> np.ndarray:
+    """Power iteration on the weighted graph; dangling nodes spread rank uniformly."""
+    n = a.shape[0]
+    if n == 0:
+        return np.zeros(0)
+    out = np.asarray(a.sum(axis=1)).ravel()
+    dangling = out == 0
+    inv = np.divide(1.0, out, out=np.zeros(n), where=~dangling)
+    pt = (sparse.diags(inv) @ a).T.tocsr()  # Column-stochastic transition matrix
+    r = np.full(n, 1.0 / n)
+    for _ in range(max_iter):
+        r_next = alpha * (pt @ r + r[dangling].sum() / n) + (1 - alpha) / n
+        if np.abs(r_next - r).sum() < n * tol:
+            return r_next
+        r = r_next
+    return r
+
+
+def core_numbers(a: sparse.csr_matrix) -> np.ndarray:
+    """k-core number per node (Batagelj-Zaversnik bucket peeling, O(edges))."""
+    n = a.shape[0]
+    indptr, indices = a.indptr.tolist(), a.indices.tolist()
+    deg = np.diff(a.indptr).tolist()
+    max_deg = max(deg, default=0)
+    # Nodes sorted by degree, with each degree's first position (bin sort)
+    bins = [0] * (max_deg + 1)
+    for d in deg:
+        bins[d] += 1
+    start = 0
+    for d in range(max_deg + 1):
+        bins[d], start = start, start + bins[d]
+    pos = [0] * n
+    order = [0] * n
+    for v in range(n):
+        pos[v] = bins[deg[v]]
+        order[pos[v]] = v
+        bins[deg[v]] += 1
+    for d in range(max_deg, 0, -1):
+        bins[d] = bins[d - 1]
+    bins[0] = 0
+    for i in range(n):
+        v = order[i]
+        for u in indices[indptr[v] : indptr[v + 1]]:
+            if deg[u] > deg[v]:
+                du, pu = deg[u], pos[u]
+                pw = bins[du]
+                w = order[pw]
+                if u != w:
+                    pos[u], pos[w] = pw, pu
+                    order[pu], order[pw] = w, u
+                bins[du] += 1
+                deg[u] -= 1
+    return np.array(deg, dtype=np.int32)
+
+
+_ADJ = None
+
+
+def _init_worker(indptr: np.ndarray, indices: np.ndarray):
+    global _ADJ
+    _ADJ = (indptr, indices)
+
+
+def brandes_from(sources: list[int]) -> np.ndarray:
+    """Summed Brandes dependencies for BFS from each source (unweighted graph)."""
+    indptr, indices = _ADJ
+    n = len(indptr) - 1
+    bc = np.zeros(n)
+    for s in sources:
+        dist = np.full(n, -1, dtype=np.int64)
+        sigma = np.zeros(n)
+        dist[s], sigma[s] = 0, 1.0
+        frontier = np.array([s], dtype=np.int64)
+        levels = []
+        depth = 0
+        while len(frontier):
+            parent, child = csr_graph.expand(indptr, indices, frontier)
+            fresh = child[dist[child] < 0]
+            dist[fresh] = depth + 1
+            on_path = dist[child] == depth + 1
+            parent, child = parent[on_path], child[on_path]
+            np.add.at(sigma, child, sigma[parent])
+            levels.append((parent, child))
+            frontier = np.unique(fresh)
+            depth += 1
+        delta = np.zeros(n)
+        for parent, child in reversed(levels):
+            np.add.at(delta, parent, sigma[parent] / sigma[child] * (1.0 + delta[child]))
+        delta[s] = 0.0
+        bc += delta
+    return bc
+
+
+def betweenness(a: sparse.csr_matrix, samples: int = DEFAULT_SAMPLES, workers: int | None = None, seed: int = SEED) -> np.ndarray:
+    """Normalized betweenness estimated from `samples` BFS sources (scaled by n / samples),
+    matching networkx.betweenness_centrality(k=samples) for undirected graphs."""
+    n = a.shape[0]
+    if n < 3:
+        return np.zeros(n)
+    a = simple(a)
+    k = min(samples, n)
+    sources = np.random.default_rng(seed).choice(n, size=k, replace=False).tolist() if k < n else list(range(n))
+    workers = max(1, min(workers or os.cpu_count() or 1, k))
+    chunks = [sources[i::workers] for i in range(workers)]
+    indptr, indices = a.indptr.astype(np.int64), a.indices.astype(np.int64)
+    if workers == 1:
+        _init_worker(indptr, indices)
+        bc = brandes_from(sources)
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(indptr, indices)) as pool:
+            bc = sum(pool.map(brandes_from, chunks))
+    return bc * (n / k) / ((n - 1) * (n - 2))
+
+
+def compute_node_metrics(data_dir: Path = DATA_DIR, samples: int = DEFAULT_SAMPLES, workers: int | None = None) -> list[dict]:
+    """Metrics for every node of the projected graph, written to node_metrics.csv."""
+    graph = csr_graph.load_graph(data_dir)
+    if graph is None:
+        return []
+    a = adjacency(graph)
+    pr = pagerank(a)
+    core = core_numbers(simple(a))
+    bc = betweenness(a, samples, workers)
+    registry = PersonRegistry.load(data_dir)
+
+    rows = []
+    degree = np.diff(simple(a).indptr)
+    for i, name in enumerate(graph.names()):
+        rows.append({
+            "person_id": registry.lookup(name) or "",
+            "name": name,
+            "degree": int(degree[i]),
+            "pagerank": f"{pr[i]:.6g}",
+            "core_number": int(core[i]),
+            "betweenness": f"{bc[i]:.6g}",
+        })
+    with open(data_dir / METRICS_CSV.name, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=METRIC_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="PageRank, k-core and sampled betweenness for the person graph")
+    parser.add_argument("--samples", type=int, default=DEFAULT_SAMPLES, help="BFS sources for betweenness")
+    parser.add_argument("--workers", type=int, default=None, help="Processes for betweenness sampling")
+    args = parser.parse_args()
+    rows = compute_node_metrics(samples=args.samples, workers=args.workers)
+    print(f"Saved metrics for {len(rows)} nodes to {METRICS_CSV}")
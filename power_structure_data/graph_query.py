@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+"How is A connected to B?" over the person graph.
+GraphQuery opens the memory-mapped CSR graph (csr_graph.py) once and answers
+k-hop neighborhoods and shortest paths with numpy BFS, one frontier at a time.
+Paths use bidirectional BFS, always growing the side with fewer edges to scan,
+and every hop is labeled with the relationships and organizations that join
+the pair. Recent answers are kept in an LRU cache, so repeat queries are free.
+
+    python graph_query.py neighbors "William Howard Taft" -k 2
+    python graph_query.py path "William Howard Taft" "Edward Baldwin Whitney"
+    python graph_query.py shell     # one query per line: NAME [k]  or  NAME -- NAME
+"""
+import argparse
+import json
+import sys
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+import csr_graph
+from names import normalize_name
+
+DATA_DIR = Path(__file__).parent
+CACHE_SIZE = 1024
+
+
+class GraphQuery:
+    def __init__(self, graph: csr_graph.CSRGraph, cache_size: int = CACHE_SIZE):
+        self.graph = graph
+        self._by_key = None
+        # Cached per instance on node ids; answers are read-only arrays/tuples
+        self._levels = lru_cache(maxsize=cache_size)(self._bfs)
+        self._path = lru_cache(maxsize=cache_size)(self._bidirectional)
+
+    @classmethod
+    def load(cls, data_dir: Path = DATA_DIR, cache_size: int = CACHE_SIZE) -> "GraphQuery | None":
+        """Query service over the data directory's graph. None when there is no network data."""
+        graph = csr_graph.load_graph(data_dir)
+        return None if graph is None else cls(graph, cache_size)
+
+    def node(self, name: str) -> int | None:
+        """Node id for a name, falling back to the normalized spelling."""
+        i = self.graph.id_of(name)
+        if i is not None:
+            return i
+        if self._by_key is None:
+            self._by_key = {}
+            for j, n in enumerate(self.graph.names()):
+                self._by_key.setdefault(normalize_name(n), j)
+        return self._by_key.get(normalize_name(name))
+
+    def _require(self, name: str) -> int:
+        i = self.node(name)
+        if i is None:
+            raise KeyError(f"Unknown person: {name}")
+        return i
+
+    # ----- k-hop neighborhoods -----
+    def _bfs(self, source: int, k: int) -> tuple[np.ndarray, np.ndarray]:
+        """(node ids, hop distance) of everything within k hops, source excluded."""
+        g = self.graph
+        dist = np.full(g.n_nodes, -1, dtype=np.int32)
+        dist[source] = 0
+        frontier = np.array([source], dtype=np.int64)
+        reached = []
+        for depth in range(1, k + 1):
+            _, child = csr_graph.expand(g.indptr, g.indices, frontier)
+            frontier = np.unique(child[dist[child] < 0])
+            if not len(frontier):
+                break
+            dist[frontier] = depth
+            reached.append(frontier)
+        ids = np.concatenate(reached) if reached else np.empty(0, np.int64)
+        hops = dist[ids]
+        ids.flags.writeable = hops.flags.writeable = False
+        return ids, hops
+
+    def neighborhood(self, name: str, k: int = 1) -> list[dict]:
+        """People within k hops of name, nearest first (then by name)."""
+        ids, hops = self._levels(self._require(name), k)
+        return [
+            {"name": self.graph.name(i), "distance": int(d), "degree": self.graph.degree(i)}
+            for i, d in zip(ids.tolist(), hops.tolist())  # Ids are in name order within each hop
+        ]
+
+    # ----- shortest paths -----
+    def _bidirectional(self, source: int, target: int, max_hops: int | None) -> tuple[int, ...] | None:
+        """Node ids on one shortest source -> target path, or None if none within max_hops."""
+        if source == target:
+            return (source,)
+        g = self.graph
+        n = g.n_nodes
+        dist = [np.full(n, -1, dtype=np.int32), np.full(n, -1, dtype=np.int32)]
+        parent = [np.full(n, -1, dtype=np.int64), np.full(n, -1, dtype=np.int64)]
+        frontier = [np.array([source], dtype=np.int64), np.array([target], dtype=np.int64)]
+        dist[0][source] = dist[1][target] = 0
+        depth = [0, 0]
+
+        while len(frontier[0]) and len(frontier[1]):
+            if max_hops is not None and depth[0] + depth[1] >= max_hops:
+                return None
+            scan = [int((g.indptr[f + 1] - g.indptr[f]).sum()) for f in frontier]
+            side = 0 if scan[0] <= scan[1] else 1
+            par, child = csr_graph.expand(g.indptr, g.indices, frontier[side])
+            fresh = dist[side][child] < 0
+            par, child = par[fresh], child[fresh]
+            child, first = np.unique(child, return_index=True)
+            par = par[first]
+            depth[side] += 1
+            dist[side][child] = depth[side]
+            parent[side][child] = par
+            frontier[side] = child
+
+            other = dist[1 - side][child]
+            met = np.flatnonzero(other >= 0)
+            if len(met):
+                # Full levels are expanded, so the closest meeting node to the other side is optimal
+                meet = int(child[met[np.argmin(other[met])]])
+                half = [self._walk(parent[0], meet, source), self._walk(parent[1], meet, target)]
+                return tuple(half[0][::-1] + half[1][1:])
+        return None
+
+    @staticmethod
+    def _walk(parent: np.ndarray, node: int, root: int) -> list[int]:
+        path = [node]
+        while node != root:
+            node = int(parent[node])
+            path.append(node)
+        return path
+
+    def path(self, a: str, b: str, max_hops: int | None = None) -> list[dict] | None:
+        """Shortest path from a to b as labeled hops, [] when a is b, None when not connected."""
+        ids = self._path(self._require(a), self._require(b), max_hops)
+        if ids is None:
+            return None
+        g = self.graph
+        return [
+            {"source": g.name(u), "target": g.name(v), "edges": g.edges_between(u, v)}
+            for u, v in zip(ids, ids[1:])
+        ]
+
+    def cache_info(self) -> dict:
+        return {"neighborhood": self._levels.cache_info(), "path": self._path.cache_info()}
+
+
+def describe_hop(hop: dict) -> str:
+    labels = []
+    for e in hop["edges"]:
+        label = e["relationship"]
+        if e["organization"] and e["organization"] not in label:
+            label += f" ({e['organization']}"
+            label += f", {e['year']})" if e["year"] else ")"
+        elif e["year"]:
+            label += f" ({e['year']})"
+        if e["shared"] > 1:
+            label += f" x{e['shared']}"
+        labels.append(label)
+    return f"{hop['source']} -> {hop['target']}: {'; '.join(labels)}"
+
+
+def print_neighborhood(q: GraphQuery, name: str, k: int, as_json: bool):
+    rows = q.neighborhood(name, k)
+    if as_json:
+        print(json.dumps(rows))
+        return
+    print(f"{len(rows)} people within {k} hop(s) of {name}")
+    for r in rows:
+        print(f"  {r['distance']}  {r['name']} (degree {r['degree']})")
+
+
+def print_path(q: GraphQuery, a: str, b: str, max_hops: int | None, as_json: bool):
+    hops = q.path(a, b, max_hops)
+    if as_json:
+        print(json.dumps(hops))
+    elif hops is None:
+        print(f"No path between {a} and {b}")
+    else:
+        print(f"{len(hops)} hop(s) from {a} to {b}")
+        for hop in hops:
+            print("  " + describe_hop(hop))
+
+
+def shell(q: GraphQuery, k: int, as_json: bool):
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            if " -- " in line:
+                a, b = (s.strip() for s in line.split(" -- ", 1))
+                print_path(q, a, b, None, as_json)
+            else:
+                name, _, hops = line.rpartition(" ")
+                if name and hops.isdigit():
+                    print_neighborhood(q, name, int(hops), as_json)
+                else:
+                    print_neighborhood(q, line, k, as_json)
+        except KeyError as e:
+            print(e.args[0])
+        sys.stdout.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Neighborhood and shortest-path queries over the person graph")
+    parser.add_argument("--data-dir", type=Path, default=DATA_DIR)
+    parser.add_argument("--json", action="store_true", help="Print answers as JSON")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("neighbors", help="People within k hops")
+    p.add_argument("name")
+    p.add_argument("-k", type=int, default=1)
+    p = sub.add_parser("path", help="Shortest labeled path between two people")
+    p.add_argument("source")
+    p.add_argument("target")
+    p.add_argument("--max-hops", type=int, default=None)
+    p = sub.add_parser("shell", help="Answer queries from stdin with the graph loaded once")
+    p.add_argument("-k", type=int, default=1, help="Default neighborhood radius")
+    args = parser.parse_args()
+
+    q = GraphQuery.load(args.data_dir)
+    if q is None:
+        sys.exit("No network data (run extract_all.py first)")
+    try:
+        if args.command == "neighbors":
+            print_neighborhood(q, args.name, args.k, args.json)
+        elif args.command == "path":
+            print_path(q, args.source, args.target, args.max_hops, args.json)
+        else:
+            shell(q, args.k, args.json)
+    except KeyError as e:
+        sys.exit(e.args[0])
+
+
+if __name__ == "__main__":
+    main()
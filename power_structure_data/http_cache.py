@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+On-disk HTTP response cache with conditional GET.
+Metadata is keyed by URL; bodies are stored once per content hash, so identical
+responses from different URLs share storage. Stale entries are revalidated with
+If-None-Match / If-Modified-Since and a 304 costs no body transfer.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+CACHE_DIR = Path(__file__).parent / ".http_cache"
+DEFAULT_TTL = 24 * 3600  # Serve without revalidation for a day
+EXPIRE_AFTER = 30 * 24 * 3600  # Drop entries not validated for a month
+MAX_BYTES = 512 * 1024 * 1024
+EVICT_EVERY = 200  # Stores between size checks
+
+# Response headers worth replaying on a cache hit
+KEEP_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Date", "Cache-Control")
+# Headers a 304 updates on the stored response (the body and its type stay as cached)
+REVALIDATE_HEADERS = ("ETag", "Last-Modified", "Date", "Cache-Control")
+
+
+def _atomic_write(path: Path, data: bytes):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def _build_response(url: str, status: int, headers: dict, body: bytes) -> requests.Response:
+    r = requests.Response()
+    r.status_code = status
+    r.url = url
+    r.headers = CaseInsensitiveDict(headers)
+    r.encoding = get_encoding_from_headers(r.headers)
+    r._content = body
+    return r
+
+
+class HTTPCache:
+    """URL -> metadata JSON in meta/, body bytes in bodies/<sha256>."""
+
+    def __init__(self, root: Path = CACHE_DIR, ttl: float = DEFAULT_TTL, expire_after: float = EXPIRE_AFTER, max_bytes: int = MAX_BYTES):
+        self.root = Path(root)
+        self.ttl = ttl
+        self.expire_after = expire_after
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._stores = 0
+
+    @staticmethod
+    def key(url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def _meta_path(self, url: str) -> Path:
+        k = self.key(url)
+        return self.root / "meta" / k[:2] / f"{k}.json"
+
+    def _body_path(self, content_hash: str) -> Path:
+        return self.root / "bodies" / content_hash[:2] / content_hash
+
+    def lookup(self, url: str) -> tuple[dict, bytes] | None:
+        """Cached (metadata, body) for a URL, or None."""
+        meta_path = self._meta_path(url)
+        try:
+            meta = json.loads(meta_path.read_text())
+            body = self._body_path(meta["content_hash"]).read_bytes()
+        except (OSError, ValueError, KeyError):
+            return None
+        return meta, body
+
+    def is_fresh(self, meta: dict) -> bool:
+        return time.time() - meta.get("validated_at", 0) < self.ttl
+
+    @staticmethod
+    def conditional_headers(meta: dict) -> dict:
+        headers = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+
+    def touch(self, url: str, meta: dict, revalidated: bool = False):
+        now = time.time()
+        meta["accessed_at"] = now
+        if revalidated:
+            meta["validated_at"] = now
+        _atomic_write(self._meta_path(url), json.dumps(meta).encode("utf-8"))
+
+    def revalidated(self, url: str, meta: dict, r: requests.Response):
+        """Merge a 304's validators into the entry, so the next conditional GET sends the new ones."""
+        for h in REVALIDATE_HEADERS:
+            if h in r.headers:
+                meta["headers"][h] = r.headers[h]
+        meta["etag"] = r.headers.get("ETag", meta.get("etag"))
+        meta["last_modified"] = r.headers.get("Last-Modified", meta.get("last_modified"))
+        self.touch(url, meta, revalidated=True)
+
+    def store(self, url: str, r: requests.Response) -> dict:
+        body = r.content
+        content_hash = hashlib.sha256(body).hexdigest()
+        body_path = self._body_path(content_hash)
+        if not body_path.exists():
+            _atomic_write(body_path, body)
+        now = time.time()
+        meta = {
+            "url": url,
+            "content_hash": content_hash,
+            "size": len(body),
+            "status": r.status_code,
+            "headers": {h: r.headers[h] for h in KEEP_HEADERS if h in r.headers},
+            "etag": r.headers.get("ETag"),
+            "last_modified": r.headers.get("Last-Modified"),
+            "validated_at": now,
+            "accessed_at": now,
+        }
+        _atomic_write(self._meta_path(url), json.dumps(meta).encode("utf-8"))
+        with self._lock:
+            self._stores += 1
+            due = self._stores % EVICT_EVERY == 0
+        if due:
+            self.evict()
+        return meta
+
+    def get(self, session: requests.Session, url: str, before_request=None, **kwargs) -> requests.Response:
+        """GET through the cache. before_request(url) runs only when the network is actually used."""
+        full_url = requests.Request("GET", url, params=kwargs.pop("params", None)).prepare().url
+        cached = self.lookup(full_url)
+        if cached and self.is_fresh(cached[0]):
+            meta, body = cached
+            self.touch(full_url, meta)
+            return _build_response(full_url, meta["status"], meta["headers"], body)
+
+        headers = dict(kwargs.pop("headers", None) or {})
+        if cached:
+            headers.update(self.conditional_headers(cached[0]))
+        if before_request:
+            before_request(full_url)
+        r = session.get(full_url, headers=headers, **kwargs)
+
+        if r.status_code == 304 and cached:
+            meta, body = cached
+            self.revalidated(full_url, meta, r)
+            return _build_response(full_url, meta["status"], meta["headers"], body)
+        if r.status_code == 200:
+            self.store(full_url, r)
+        return r
+
+    def evict(self):
+        """Drop expired entries, then least-recently-used ones until under max_bytes."""
+        with self._lock:
+            now = time.time()
+            entries = []
+            for meta_path in (self.root / "meta").glob("*/*.json"):
+                try:
+                    meta = json.loads(meta_path.read_text())
+                except (OSError, ValueError):
+                    meta_path.unlink(missing_ok=True)
+                    continue
+                if now - meta.get("validated_at", 0) > self.expire_after:
+                    meta_path.unlink(missing_ok=True)
+                    continue
+                entries.append((meta.get("accessed_at", 0), meta_path, meta))
+
+            entries.sort(key=lambda e: e[0])
+            live = {}
+            for _, _, meta in entries:
+                live[meta["content_hash"]] = meta["size"]
+            total = sum(live.values())
+            refs = {}
+            for _, _, meta in entries:
+                refs[meta["content_hash"]] = refs.get(meta["content_hash"], 0) + 1
+            for _, meta_path, meta in entries:
+                if total <= self.max_bytes:
+                    break
+                meta_path.unlink(missing_ok=True)
+                h = meta["content_hash"]
+                refs[h] -= 1
+                if refs[h] == 0:
+                    total -= live.pop(h)
+
+            for body_path in (self.root / "bodies").glob("*/*"):
+                if body_path.name in live or body_path.name.startswith(".tmp-"):
+                    continue
+                try:
+                    if now - body_path.stat().st_mtime > 60:  # Skip bodies a concurrent store() just wrote
+                        body_path.unlink()
+                except OSError:
+                    pass
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Force-directed node positions for the person graph, computed once in the
+pipeline and shipped to the web app in network.json.
+Fruchterman-Reingold forces, vectorized with numpy. Repulsion uses a
+one-level Barnes-Hut approximation: the plane is cut into about sqrt(n)
+equal-count cells of about sqrt(n) nodes each; pairs in the same cell
+repel exactly and every other cell acts as one mass at its center, so an
+iteration costs O(n^1.5) instead of O(n^2). Results are saved to
+network_layout.json with a hash of the graph; an unchanged graph reuses them,
+and a changed one starts from the previous positions of the people it keeps.
+
+    python layout.py [--iterations 100] [--force]
+"""
+import argparse
+import hashlib
+import json
+from pathlib import Path
+
+import numpy as np
+
+import csr_graph
+from registry import PersonRegistry
+
+DATA_DIR = Path(__file__).parent
+LAYOUT_JSON = DATA_DIR / "network_layout.json"
+ITERATIONS = 100
+LINK_DISTANCE = 60  # app.js forceLink distance; output is scaled so a typical edge has this length
+GRAVITY = 0.05  # Pull toward the center; keeps disconnected cohorts from drifting apart
+PAIR_CHUNK = 1 << 16  # Node-cell / node-node pairs per numpy batch (small enough to stay in cache)
+SEED = 25
+
+
+def graph_hash(graph: csr_graph.CSRGraph) -> str:
+    """Content hash of node names and adjacency (the layout cache key)."""
+    h = hashlib.sha1()
+    for array in (graph.name_offsets, graph.names_blob, graph.indptr, graph.indices):
+        h.update(np.ascontiguousarray(array).tobytes())
+    return h.hexdigest()
+
+
+def _repulsion(pos: np.ndarray, k: float) -> np.ndarray:
+    """Approximate sum of k^2 / d repulsion on every node (one-level Barnes-Hut)."""
+    n = len(pos)
+    g = max(1, round(n ** 0.25))
+    # Equal-count cells: g strips by x, each cut into g runs by y (a one-level k-d split),
+    # so every cell holds about n / g^2 nodes however clustered the layout is
+    strip = np.empty(n, np.int64)
+    strip[np.argsort(pos[:, 0], kind="stable")] = np.arange(n) * g // n
+    order = np.lexsort((pos[:, 1], strip))
+    sorted_strip = strip[order]
+    size = np.bincount(sorted_strip, minlength=g)
+    rank = np.arange(n) - (np.cumsum(size) - size)[sorted_strip]
+    cell = np.empty(n, np.int64)
+    cell[order] = sorted_strip * g + rank * g // size[sorted_strip]
+    n_cells = g * g
+    mass = np.bincount(cell, minlength=n_cells).astype(np.float64)
+    occupied = np.flatnonzero(mass)
+    com = np.column_stack([np.bincount(cell, weights=pos[:, d], minlength=n_cells) for d in (0, 1)])
+    com = com[occupied] / mass[occupied, None]
+    mass = mass[occupied]
+    slot = np.full(n_cells, -1, np.int64)
+    slot[occupied] = np.arange(len(occupied))
+    own = slot[cell]
+
+    x, y = pos[:, 0].copy(), pos[:, 1].copy()  # Separate coordinate arrays vectorize much better than (n, 2)
+    fx, fy = np.zeros(n), np.zeros(n)
+    k2 = k * k
+    # Far field: every other occupied cell as a point mass. With w = k^2 m / d^2,
+    # sum_c w (x - cx) = x * sum_c w - w @ cx, so each batch is two matrix-vector products
+    step = max(1, PAIR_CHUNK // len(occupied))
+    for a in range(0, n, step):
+        b = min(n, a + step)
+        dx = x[a:b, None] - com[None, :, 0]
+        dy = y[a:b, None] - com[None, :, 1]
+        w = k2 * mass / np.maximum(dx * dx + dy * dy, 1e-12)
+        w[np.arange(b - a), own[a:b]] = 0.0
+        total = w.sum(axis=1)
+        fx[a:b] += x[a:b] * total - w @ com[:, 0]
+        fy[a:b] += y[a:b] * total - w @ com[:, 1]
+
+    # Near field: exact pairs inside each cell (order is already sorted by cell)
+    sorted_cell = cell[order]
+    starts = np.searchsorted(sorted_cell, sorted_cell, "left")
+    lens = np.searchsorted(sorted_cell, sorted_cell, "right") - starts
+    done = np.concatenate([[0], np.cumsum(lens)])  # Pairs before each sorted node
+    i = 0
+    while i < n:
+        j = max(i + 1, int(np.searchsorted(done, done[i] + PAIR_CHUNK, "right")) - 1)
+        rep = lens[i:j]
+        total = int(rep.sum())
+        left = np.repeat(order[i:j], rep)
+        ends = np.cumsum(rep)
+        right = order[np.arange(total) - np.repeat(ends - rep, rep) + np.repeat(starts[i:j], rep)]
+        dx, dy = x[left] - x[right], y[left] - y[right]
+        w = k2 / np.maximum(dx * dx + dy * dy, 1e-12)
+        w[left == right] = 0.0
+        fx += np.bincount(left, weights=dx * w, minlength=n)
+        fy += np.bincount(left, weights=dy * w, minlength=n)
+        i = j
+    return np.column_stack([fx, fy])
+
+
+def force_layout(n: int, src: np.ndarray, dst: np.ndarray, iterations: int = ITERATIONS,
+                 init: np.ndarray | None = None, seed: int = SEED) -> np.ndarray:
+    """(n, 2) positions in roughly the unit square for an undirected edge list."""
+    rng = np.random.default_rng(seed)
+    pos = rng.random((n, 2)) if init is None else np.array(init, dtype=np.float64)
+    if n < 2:
+        return pos
+    src = np.asarray(src, dtype=np.int64)
+    dst = np.asarray(dst, dtype=np.int64)
+    k = np.sqrt(1.0 / n)
+    t = 0.1 if init is None else 0.02  # Warm starts only need to settle
+    cool = t / (iterations + 1)
+    for _ in range(iterations):
+        disp = _repulsion(pos, k)
+        delta = pos[src] - pos[dst]
+        dist = np.sqrt((delta ** 2).sum(axis=1))
+        pull = delta * (dist / k)[:, None]
+        for d in (0, 1):
+            disp[:, d] -= np.bincount(src, weights=pull[:, d], minlength=n)
+            disp[:, d] += np.bincount(dst, weights=pull[:, d], minlength=n)
+        disp += GRAVITY * (pos.mean(axis=0) - pos) / k
+        length = np.maximum(np.sqrt((disp ** 2).sum(axis=1)), 1e-12)
+        pos += disp * (np.minimum(length, t) / length)[:, None]
+        t -= cool
+    return pos
+
+
+def to_pixels(pos: np.ndarray, src: np.ndarray, dst: np.ndarray) -> np.ndarray:
+    """Center on the origin and scale so the median edge is LINK_DISTANCE long."""
+    if not len(pos):
+        return pos
+    pos = pos - pos.mean(axis=0)
+    lengths = np.sqrt(((pos[src] - pos[dst]) ** 2).sum(axis=1))
+    typical = np.median(lengths) if len(lengths) else np.sqrt(1.0 / len(pos))
+    return pos * (LINK_DISTANCE / max(typical, 1e-9))
+
+
+def load_cached(path: Path) -> dict | None:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def layout_positions(graph: csr_graph.CSRGraph, data_dir: Path = DATA_DIR, iterations: int = ITERATIONS,
+                     force: bool = False) -> tuple[np.ndarray, bool]:
+    """(pixel positions by node index, whether they came from the cache)."""
+    digest = graph_hash(graph)
+    names = graph.names()
+    cached = load_cached(data_dir / LAYOUT_JSON.name)
+    if cached and cached.get("graph") == digest and not force:
+        by_name = {row["name"]: (row["x"], row["y"]) for row in cached["nodes"]}
+        if all(name in by_name for name in names):
+            return np.array([by_name[name] for name in names], dtype=np.float64).reshape(-1, 2), True
+
+    src, dst, _ = graph.edge_list()
+    init = None
+    if cached and not force:
+        # Warm start: keep known people where they were, put newcomers at random
+        previous = {row["name"]: (row["x"], row["y"]) for row in cached["nodes"]}
+        known = np.array([name in previous for name in names])
+        if known.any():
+            old = np.array([previous[name] for name in names if name in previous], dtype=np.float64)
+            lo, span = old.min(axis=0), np.maximum(np.ptp(old, axis=0), 1e-9)
+            init = np.random.default_rng(SEED).random((len(names), 2))
+            init[known] = (old - lo) / span
+    pos = force_layout(graph.n_nodes, src, dst, iterations, init)
+    return to_pixels(pos, src, dst), False
+
+
+def compute_layout(data_dir: Path = DATA_DIR, iterations: int = ITERATIONS, force: bool = False) -> list[dict]:
+    """Positions for every node of the projected graph, saved to network_layout.json."""
+    graph = csr_graph.load_graph(data_dir)
+    if graph is None:
+        return []
+    pos, cached = layout_positions(graph, data_dir, iterations, force)
+    if cached:
+        return load_cached(data_dir / LAYOUT_JSON.name)["nodes"]
+    registry = PersonRegistry.load(data_dir)
+    rows = [
+        {"person_id": registry.lookup(name) or "", "name": name, "x": round(float(x), 1), "y": round(float(y), 1)}
+        for name, (x, y) in zip(graph.names(), pos)
+    ]
+    out = {"graph": graph_hash(graph), "iterations": iterations, "nodes": rows}
+    (data_dir / LAYOUT_JSON.name).write_text(json.dumps(out, indent=1), encoding="utf-8")
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cached force-directed layout for the person graph")
+    parser.add_argument("--iterations", type=int, default=ITERATIONS)
+    parser.add_argument("--force", action="store_true", help="Recompute from scratch even if the graph is unchanged")
+    args = parser.parse_args()
+    rows = compute_layout(iterations=args.iterations, force=args.force)
+    print(f"Layout for {len(rows)} nodes in {LAYOUT_JSON}")
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Person x source membership as a bit-packed matrix.
+Any number of sources (name lists) are folded into one pass: each normalized
+person key gets a row, each source a bit in that row's uint64 words. "In k or
+more sources", pairwise source overlaps and co-membership then become numpy
+reductions over the matrix instead of per-name set probes, so adding a source
+adds one bit column rather than another loop over everyone.
+"""
+import numpy as np
+
+from names import normalize_name, normalize_series
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+
+class MembershipMatrix:
+    """bits[person, word] has bit (s % 64) of word (s // 64) set when the person is in source s."""
+
+    def __init__(self, sources: list[str], keys: list[str], display: list[str], bits: np.ndarray):
+        self.sources = sources
+        self.keys = keys
+        self.display = display  # First raw spelling seen, sources in order
+        self.bits = bits
+        self.row = {k: i for i, k in enumerate(keys)}
+
+    @classmethod
+    def from_sources(cls, sources: dict) -> "MembershipMatrix":
+        """{source: names} -> matrix. Names may be a pandas Series or any iterable of strings;
+        empty and missing names are skipped."""
+        row, keys, display = {}, [], []
+        rows, cols = [], []
+        for s, names in enumerate(sources.values()):
+            if pd is not None and isinstance(names, pd.Series):
+                names = names.dropna()
+                pairs = zip(normalize_series(names).tolist(), names.tolist())
+            else:
+                pairs = ((normalize_name(n), n) for n in names)
+            for key, raw in pairs:
+                if not key:
+                    continue
+                i = row.get(key)
+                if i is None:
+                    i = row[key] = len(keys)
+                    keys.append(key)
+                    display.append(raw)
+                rows.append(i)
+                cols.append(s)
+
+        words = max(1, -(-len(sources) // 64))
+        bits = np.zeros((len(keys), words), dtype=np.uint64)
+        rows = np.asarray(rows, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.uint64)
+        np.bitwise_or.at(bits, (rows, (cols >> np.uint64(6)).astype(np.int64)), np.uint64(1) << (cols & np.uint64(63)))
+        return cls(list(sources), keys, display, bits)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def column(self, source: str) -> np.ndarray:
+        """Boolean membership vector for one source."""
+        s = self.sources.index(source)
+        return ((self.bits[:, s // 64] >> np.uint64(s % 64)) & np.uint64(1)) == 1
+
+    def dense(self) -> np.ndarray:
+        """(people, sources) boolean matrix."""
+        return np.column_stack([self.column(s) for s in self.sources]) if self.sources else np.zeros((len(self), 0), bool)
+
+    def counts(self) -> np.ndarray:
+        """Number of sources each person appears in."""
+        # unpackbits rather than np.bitwise_count, which needs NumPy 2
+        return np.unpackbits(np.ascontiguousarray(self.bits).view(np.uint8), axis=1).sum(axis=1, dtype=np.int64)
+
+    def at_least(self, k: int) -> np.ndarray:
+        """Row indices of people in k or more sources."""
+        return np.flatnonzero(self.counts() >= k)
+
+    def in_all(self, *sources: str) -> np.ndarray:
+        """Row indices of people in every one of the given sources."""
+        mask = np.ones(len(self), dtype=bool)
+        for source in sources:
+            mask &= self.column(source)
+        return np.flatnonzero(mask)
+
+    def pair_overlaps(self) -> np.ndarray:
+        """(sources, sources) matrix of shared people; the diagonal is each source's size."""
+        b = self.dense().astype(np.int64)
+        return b.T @ b
+
+    def co_membership(self, person: str) -> dict[str, int]:
+        """For one person, how many others share each of their sources."""
+        i = self.row.get(normalize_name(person))
+        if i is None:
+            return {}
+        return {s: int(self.column(s).sum()) - 1 for s in self.sources_of(i)}
+
+    def sources_of(self, i: int) -> list[str]:
+        word = self.bits[i]
+        return [s for c, s in enumerate(self.sources) if (int(word[c // 64]) >> (c % 64)) & 1]
+
+    def overlaps(self, k: int = 2) -> list[dict]:
+        """Cross-reference rows for people in k or more sources, most sources first."""
+        counts = self.counts()
+        rows = [
+            {"name": self.display[i], "sources": ", ".join(self.sources_of(i)), "source_count": int(counts[i])}
+            for i in np.flatnonzero(counts >= k)
+        ]
+        rows.sort(key=lambda x: (-x["source_count"], x["name"]))
+        return rows
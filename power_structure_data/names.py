@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Canonical person-name normalization shared by every matching step.
+A name is folded to a plain key: Unicode compatibility-decomposed with
+combining marks dropped (Müller -> muller), casefolded (Strauß -> strauss),
+periods/commas turned into spaces, leading honorifics (Mr, Dr, Prof, Herr...)
+and trailing generational suffixes (Jr, Sr, II-IV) removed, whitespace collapsed.
+normalize_name() is the memoized scalar path; normalize_series() applies it
+to a pandas column once per distinct value and broadcasts the result.
+"""
+import re
+import unicodedata
+from functools import lru_cache
+
+try:
+    import numpy as np
+    import pandas as pd
+except ImportError:
+    np = pd = None
+
+# Combining diacritical mark blocks left behind by NFKD
+COMBINING_RE = re.compile("[\u0300-\u036f\u1ab0-\u1aff\u1dc0-\u1dff\u20d0-\u20ff\ufe20-\ufe2f]")
+PUNCT_RE = re.compile(r"[.,;]")
+SPACE_RE = re.compile(r"\s+")
+HONORIFICS = ("mr", "mrs", "ms", "miss", "dr", "prof", "sir", "dame", "hon", "rev", "herr", "frau")
+# Applied to folded, space-collapsed keys; both require the rest of the name to remain
+HONORIFIC_RE = re.compile(r"^(?:(?:%s) )+" % "|".join(HONORIFICS))
+SUFFIX_RE = re.compile(r"(?: (?:jr|sr|ii|iii|iv))+$")
+# Display-name suffix, case-sensitive as written in filings. Only the spacing is tidied;
+# a comma before the suffix stays ("Smith, Jr."), since the matching key drops it anyway
+DISPLAY_SUFFIX_RE = re.compile(r"\s*(Jr\.?|Sr\.?|II|III)\s*$")
+
+
+def fold(text: str) -> str:
+    """Accent- and case-insensitive form: NFKD, drop combining marks, casefold."""
+    if text.isascii():
+        return text.lower()
+    return COMBINING_RE.sub("", unicodedata.normalize("NFKD", text)).casefold()
+
+
+def _full_key(name: str) -> str:
+    return HONORIFIC_RE.sub("", SPACE_RE.sub(" ", PUNCT_RE.sub(" ", fold(name))).strip())
+
+
+def _key(name: str) -> str:
+    return SUFFIX_RE.sub("", _full_key(name))
+
+
+_normalize = lru_cache(maxsize=1 << 18)(_key)
+_person_key = lru_cache(maxsize=1 << 16)(_full_key)
+
+
+def normalize_name(name) -> str:
+    """Matching key for one name; "" for empty/missing values."""
+    if not isinstance(name, str):
+        if name is None or name != name:  # None / NaN
+            return ""
+        name = str(name)
+    return _normalize(name)
+
+
+def person_key(name) -> str:
+    """Like normalize_name() but keeps Jr/Sr/II-IV, so a father and son stay separate people."""
+    if not isinstance(name, str):
+        if name is None or name != name:
+            return ""
+        name = str(name)
+    return _person_key(name)
+
+
+def normalize_series(names: "pd.Series") -> "pd.Series":
+    """normalize_name() over a column (object or Arrow strings): the column is factorized, each
+    distinct value normalized once, and the keys broadcast back with take(). Missing values become ""."""
+    codes, uniques = pd.factorize(names, use_na_sentinel=True)
+    # Values are already distinct, so skip the LRU (it would only churn on big columns)
+    keys = np.array([_key(u) if isinstance(u, str) else normalize_name(u) for u in uniques] + [""], dtype=object)
+    return pd.Series(keys.take(codes), index=names.index, dtype=object)  # Code -1 takes the trailing ""
+
+
+def tidy_suffix(name: str) -> str:
+    """Display form with a single space before any generational suffix ("Smith,Jr." -> "Smith, Jr.")."""
+    return DISPLAY_SUFFIX_RE.sub(r" \1", name)
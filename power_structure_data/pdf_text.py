@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Cached, process-parallel PDF page text extraction.
+Page text is stored under .cache/pdf_text/<sha256 of the PDF>/<page>.txt, so a
+PDF is only ever extracted once; later runs (and regex tweaks) read the cache.
+Missing pages are split into chunks and extracted across a process pool.
+Workers are started with forkserver (spawn where that is unavailable), not
+fork: extract_all calls this from run_datasets' threads, and forking while
+other threads hold logging or urllib3 locks can deadlock the child.
+"""
+import hashlib
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+try:
+    from PyPDF2 import PdfReader
+except ImportError:
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        PdfReader = None
+
+CACHE_DIR = Path(__file__).parent / ".cache" / "pdf_text"
+CHUNK_PAGES = 8  # Pages per worker task; each task re-opens the PDF
+MP_CONTEXT = multiprocessing.get_context(
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+
+def file_hash(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _extract_chunk(args: tuple[str, list[int]]) -> list[tuple[int, str]]:
+    """Worker: text for some 0-based pages of one PDF."""
+    pdf_path, pages = args
+    reader = PdfReader(pdf_path)
+    return [(p, reader.pages[p].extract_text() or "") for p in pages]
+
+
+def page_count(pdf_path: Path, cache_dir: Path) -> int:
+    meta_path = cache_dir / "meta.json"
+    try:
+        return json.loads(meta_path.read_text())["pages"]
+    except (OSError, ValueError, KeyError):
+        n = len(PdfReader(str(pdf_path)).pages)
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        meta_path.write_text(json.dumps({"file": Path(pdf_path).name, "pages": n}))
+        return n
+
+
+def page_texts(pdf_path: Path, pages: range | list[int] | None = None, workers: int | None = None) -> dict[int, str]:
+    """{0-based page: text} for the requested pages (default: all); out-of-range pages are skipped."""
+    if PdfReader is None:
+        raise ImportError("Install PyPDF2: pip install PyPDF2")
+    pdf_path = Path(pdf_path)
+    cache_dir = CACHE_DIR / file_hash(pdf_path)
+    n = page_count(pdf_path, cache_dir)
+    wanted = [p for p in (range(n) if pages is None else pages) if 0 <= p < n]
+
+    texts, missing = {}, []
+    for p in wanted:
+        try:
+            texts[p] = (cache_dir / f"{p}.txt").read_text(encoding="utf-8")
+        except OSError:
+            missing.append(p)
+
+    if missing:
+        chunks = [(str(pdf_path), missing[i : i + CHUNK_PAGES]) for i in range(0, len(missing), CHUNK_PAGES)]
+        max_workers = min(workers or os.cpu_count() or 1, len(chunks))
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=MP_CONTEXT) as pool:
+            for results in pool.map(_extract_chunk, chunks):
+                for p, text in results:
+                    (cache_dir / f"{p}.txt").write_text(text, encoding="utf-8")
+                    texts[p] = text
+    return {p: texts[p] for p in wanted}
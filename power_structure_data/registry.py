@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Persistent person registry: stable integer IDs across runs.
+person_registry.csv   person_id -> display name (first spelling seen)
+person_aliases.csv    normalized alias (names.person_key) -> person_id; edit to merge two people
+person_sources.csv    content hash and row count of each source already resolved
+Names resolve through the alias index (one dict lookup per row), so an unchanged
+source is skipped by hash and a new or changed one costs time in its own rows.
+IDs start at 1 and are never reused.
+"""
+import csv
+import hashlib
+from pathlib import Path
+
+from names import person_key
+
+DATA_DIR = Path(__file__).parent
+REGISTRY_CSV = "person_registry.csv"
+ALIASES_CSV = "person_aliases.csv"
+SOURCES_CSV = "person_sources.csv"
+
+
+def names_digest(names) -> str:
+    """Content hash of a source's name column (order-sensitive, like a file hash)."""
+    h = hashlib.sha256()
+    for name in names:
+        h.update(str(name).encode("utf-8"))
+        h.update(b"\n")
+    return h.hexdigest()
+
+
+class PersonRegistry:
+    def __init__(self, root: Path = DATA_DIR):
+        self.root = Path(root)
+        self.people: dict[int, str] = {}
+        self.aliases: dict[str, int] = {}
+        self.sources: dict[str, dict] = {}
+        self.next_id = 1
+        self.dirty = False
+
+    @classmethod
+    def load(cls, root: Path = DATA_DIR) -> "PersonRegistry":
+        reg = cls(root)
+        for row in reg._read(REGISTRY_CSV):
+            reg.people[int(row["person_id"])] = row["name"]
+        for row in reg._read(ALIASES_CSV):
+            reg.aliases[row["alias"]] = int(row["person_id"])
+        for row in reg._read(SOURCES_CSV):
+            reg.sources[row["source"]] = {"digest": row["digest"], "rows": int(row["rows"] or 0)}
+        reg.next_id = max(reg.people, default=0) + 1
+        return reg
+
+    def _read(self, filename: str) -> list[dict]:
+        path = self.root / filename
+        if not path.exists():
+            return []
+        with open(path, newline="", encoding="utf-8") as f:
+            return list(csv.DictReader(f))
+
+    def _write(self, filename: str, fieldnames: list[str], rows):
+        path = self.root / filename
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(fieldnames)
+            writer.writerows(rows)
+        tmp.replace(path)
+
+    def save(self):
+        if not self.dirty:
+            return
+        self._write(REGISTRY_CSV, ["person_id", "name"], sorted(self.people.items()))
+        self._write(ALIASES_CSV, ["alias", "person_id"], sorted(self.aliases.items(), key=lambda a: (a[1], a[0])))
+        self._write(SOURCES_CSV, ["source", "digest", "rows"], ((s, v["digest"], v["rows"]) for s, v in sorted(self.sources.items())))
+        self.dirty = False
+
+    def lookup(self, name) -> int | None:
+        """ID for a name if any alias matches, else None."""
+        return self.aliases.get(person_key(name))
+
+    def resolve(self, name) -> int | None:
+        """ID for a name, registering a new person if unseen. None for empty names."""
+        key = person_key(name)
+        if not key:
+            return None
+        pid = self.aliases.get(key)
+        if pid is None:
+            pid = self.next_id
+            self.next_id += 1
+            self.people[pid] = str(name).strip()
+            self.aliases[key] = pid
+            self.dirty = True
+        return pid
+
+    def add_alias(self, alias: str, person_id: int):
+        """Map another spelling onto an existing person (e.g. an approximate match)."""
+        key = person_key(alias)
+        if key and self.aliases.get(key) != person_id:
+            self.aliases[key] = person_id
+            self.dirty = True
+
+    def update_source(self, source: str, names) -> bool:
+        """Resolve a source's names unless its content is unchanged since the last run.
+        Returns True if the source was (re)resolved."""
+        names = [n for n in names if person_key(n)]
+        digest = names_digest(names)
+        if self.sources.get(source, {}).get("digest") == digest:
+            return False
+        for name in names:
+            self.resolve(name)
+        self.sources[source] = {"digest": digest, "rows": len(names)}
+        self.dirty = True
+        return True
+
+    def name_of(self, person_id: int) -> str:
+        return self.people.get(person_id, "")
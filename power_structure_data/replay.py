@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Record/replay for the shared HTTP session.
+Recording captures every response that goes through fetcher's session into one
+compact ZIP (an index plus content-addressed, deflated bodies). Replaying serves
+those responses back from a transport adapter with no network and no rate
+limits, so pipeline runs are reproducible and timings measure only our code.
+Streamed responses (stream=True, e.g. the EDGAR bulk ZIP) are never held in
+memory: their chunks are teed to a spool file as the caller reads them, and
+replay serves them straight out of the archive.
+"""
+import hashlib
+import json
+import logging
+import tempfile
+import threading
+import zipfile
+from pathlib import Path
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+import fetcher
+
+# Headers that describe the stored body; transfer encodings no longer apply once decoded
+KEEP_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Location")
+
+logger = logging.getLogger(__name__)
+
+
+def request_key(request: requests.PreparedRequest) -> str:
+    return f"{request.method} {request.url}"
+
+
+class TeeStream:
+    """Stands in for a streamed response's urllib3 body. Decoded chunks go to the caller and to a
+    spool file; on_complete(digest, path) runs once the body has been read to the end."""
+
+    def __init__(self, raw, url: str, spool_dir: str, on_complete):
+        self._raw = raw
+        self._url = url
+        self._on_complete = on_complete
+        self._spool = tempfile.NamedTemporaryFile(dir=spool_dir, delete=False)
+        self._hash = hashlib.sha256()
+        self._done = False
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+    def stream(self, amt=2**16, decode_content=None):
+        for chunk in self._raw.stream(amt, decode_content=decode_content):
+            self._spool.write(chunk)
+            self._hash.update(chunk)
+            yield chunk
+        if not self._done:
+            self._done = True
+            self._spool.close()
+            self._on_complete(self._hash.hexdigest(), Path(self._spool.name))
+
+    def close(self):
+        if not self._done:
+            # Closed before the end: a partial body must not be replayed as the real one
+            self._done = True
+            self._spool.close()
+            Path(self._spool.name).unlink(missing_ok=True)
+            logger.warning(f"Not recorded (streamed body closed before the end): {self._url}")
+        self._raw.close()
+
+
+class RecordingAdapter(HTTPAdapter):
+    """Pass-through adapter that keeps a copy of every response."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.entries: dict[str, list[dict]] = {}
+        self.bodies: dict[str, bytes | Path] = {}  # Streamed bodies stay in their spool file
+        self._lock = threading.Lock()
+        self._spool_dir = tempfile.TemporaryDirectory(prefix="replay-")
+
+    def send(self, request, stream=False, **kwargs):
+        r = super().send(request, stream=stream, **kwargs)
+        entry = {
+            "status": r.status_code,
+            "reason": r.reason,
+            "headers": {h: r.headers[h] for h in KEEP_HEADERS if h in r.headers},
+        }
+        if stream:
+            r.raw = TeeStream(r.raw, request.url, self._spool_dir.name,
+                              lambda digest, path: self._add(request, entry, digest, path))
+        else:
+            body = r.content
+            self._add(request, entry, hashlib.sha256(body).hexdigest(), body)
+        return r
+
+    def _add(self, request, entry: dict, digest: str, body: bytes | Path):
+        with self._lock:
+            self.bodies.setdefault(digest, body)
+            self.entries.setdefault(request_key(request), []).append({**entry, "body": digest})
+
+    def save(self, path: Path):
+        with self._lock, zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr("index.json", json.dumps(self.entries, indent=1, sort_keys=True))
+            for digest, body in self.bodies.items():
+                if isinstance(body, Path):
+                    zf.write(body, f"bodies/{digest}")
+                else:
+                    zf.writestr(f"bodies/{digest}", body)
+
+
+class ReplayAdapter(BaseAdapter):
+    """Serves recorded responses. Repeated requests for a URL get its recordings in order,
+    then the last one again; unrecorded requests fail like a dead connection."""
+
+    def __init__(self, path: Path):
+        super().__init__()
+        self.path = Path(path)
+        self._zip = zipfile.ZipFile(self.path)
+        self.entries = json.loads(self._zip.read("index.json"))
+        self._calls: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def send(self, request, stream=False, **kwargs):
+        key = request_key(request)
+        with self._lock:
+            recorded = self.entries.get(key)
+            if not recorded:
+                raise requests.ConnectionError(f"No recorded response for {key} in {self.path.name}", request=request)
+            i = self._calls.get(key, 0)
+            self._calls[key] = i + 1
+            entry = recorded[min(i, len(recorded) - 1)]
+            member = f"bodies/{entry['body']}"
+            # Streamed bodies are read from the archive as the caller iterates, not loaded up front
+            body = self._zip.open(member) if stream else self._zip.read(member)
+
+        r = requests.Response()
+        r.status_code = entry["status"]
+        r.reason = entry.get("reason", "")
+        r.headers = CaseInsensitiveDict(entry["headers"])
+        r.encoding = get_encoding_from_headers(r.headers)
+        r.url = request.url
+        r.request = request
+        r.connection = self
+        if stream:
+            r.raw = body
+        else:
+            r._content = body
+            r._content_consumed = True
+        return r
+
+    def close(self):
+        self._zip.close()
+
+
+def _mount(adapter: BaseAdapter):
+    session = fetcher.get_session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+
+def start_recording() -> RecordingAdapter:
+    """Record everything fetched from now on. Caches are bypassed so every request reaches the wire."""
+    fetcher.CACHE = None
+    adapter = RecordingAdapter(pool_connections=fetcher.POOL_SIZE, pool_maxsize=fetcher.POOL_SIZE)
+    _mount(adapter)
+    return adapter
+
+
+def start_replay(path: Path) -> ReplayAdapter:
+    """Serve all HTTP from a recording at full speed: no network, caches or rate limits."""
+    fetcher.CACHE = None
+    fetcher.THROTTLE = False
+    adapter = ReplayAdapter(path)
+    _mount(adapter)
+    return adapter
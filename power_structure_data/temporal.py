@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Year-sliced views of the person graph.
+TemporalIndex keeps the CSR graph's undirected edges sorted by year, so the
+edges of any [start, end] window are one contiguous slice found with two
+binary searches; snapshot() turns a slice into a CSRGraph and summary() gives
+its size and connectivity. timeseries() grows the graph a year at a time with
+a union-find, so cumulative per-year metrics cost one pass over the edges.
+Undated edges (year 0) sort first and are outside every window.
+An era is such an edge-year window: a tie belongs to it when the tie's year is
+inside, and a person when at least one of their ties is. The web app's eras are
+listed in web/data/era_windows.json, read here, by build_data.py and by app.js.
+
+    python temporal.py                    # write network_timeseries.csv
+    python temporal.py --window 1900 1950 # summary for one window
+    python temporal.py --eras             # summary for each web era
+"""
+import argparse
+import csv
+import json
+from pathlib import Path
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse import csgraph
+
+import csr_graph
+
+DATA_DIR = Path(__file__).parent
+TIMESERIES_CSV = DATA_DIR / "network_timeseries.csv"
+TIMESERIES_FIELDS = ["year", "new_edges", "edges", "nodes", "components", "largest_component"]
+ERA_WINDOWS = DATA_DIR.parent / "web" / "data" / "era_windows.json"
+
+
+class TemporalIndex:
+    def __init__(self, graph: csr_graph.CSRGraph):
+        self.graph = graph
+        src, dst, pos = graph.edge_list()
+        years = np.asarray(graph.year)[pos]
+        order = np.argsort(years, kind="stable")
+        self.years = years[order]
+        self.src = src[order]
+        self.dst = dst[order]
+        self.pos = pos[order]  # Into the graph's edge attribute arrays
+
+    def bounds(self, start: int, end: int) -> tuple[int, int]:
+        """[lo, hi) of the edges dated start..end inclusive."""
+        lo = np.searchsorted(self.years, max(start, 1), "left")
+        hi = np.searchsorted(self.years, end, "right")
+        return int(lo), int(max(lo, hi))
+
+    def window(self, start: int, end: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(source, target, attribute position) of the edges dated start..end."""
+        lo, hi = self.bounds(start, end)
+        return self.src[lo:hi], self.dst[lo:hi], self.pos[lo:hi]
+
+    def snapshot(self, start: int, end: int) -> csr_graph.CSRGraph:
+        """The window as a graph over the full node table (people outside it have no edges)."""
+        g = self.graph
+        src, dst, pos = self.window(start, end)
+        return csr_graph.CSRGraph.build(
+            g.names(), src, dst, g.relationship[pos], g.organization[pos], g.year[pos], g.shared[pos],
+            g.relationships, g.organizations,
+        )
+
+    def summary(self, start: int, end: int, top: int = 3) -> dict:
+        """People, ties and connectivity of the window; top lists the best-connected people."""
+        src, dst, _ = self.window(start, end)
+        nodes, inverse = np.unique(np.concatenate([src, dst]), return_inverse=True)
+        n, m = len(nodes), len(src)
+        a = sparse.coo_matrix((np.ones(m), (inverse[:m], inverse[m:])), shape=(n, n))
+        n_comp, labels = csgraph.connected_components(a, directed=False)
+        degree = np.bincount(inverse, minlength=n)
+        best = np.argsort(-degree, kind="stable")[:top]
+        return {
+            "start": start,
+            "end": end,
+            "nodes": n,
+            "edges": m,
+            "components": int(n_comp),
+            "largest_component": int(np.bincount(labels).max()) if n else 0,
+            "density": round(2 * m / (n * (n - 1)), 4) if n > 1 else 0.0,
+            "top": [self.graph.name(int(nodes[i])) for i in best],
+        }
+
+    def timeseries(self) -> list[dict]:
+        """Cumulative graph metrics at the end of each dated year, built incrementally."""
+        parent = np.arange(self.graph.n_nodes).tolist()
+        size = [1] * self.graph.n_nodes
+        active = bytearray(self.graph.n_nodes)
+
+        def find(x: int) -> int:
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+
+        rows = []
+        nodes = components = largest = 0
+        lo = first = self.bounds(1, 1)[0]
+        years, src, dst = self.years.tolist(), self.src.tolist(), self.dst.tolist()
+        while lo < len(years):
+            year = years[lo]
+            hi = int(np.searchsorted(self.years, year, "right"))
+            for u, v in zip(src[lo:hi], dst[lo:hi]):
+                for x in (u, v):
+                    if not active[x]:
+                        active[x] = 1
+                        nodes += 1
+                        components += 1
+                        largest = max(largest, 1)
+                ru, rv = find(u), find(v)
+                if ru != rv:
+                    if size[ru] < size[rv]:
+                        ru, rv = rv, ru
+                    parent[rv] = ru
+                    size[ru] += size[rv]
+                    components -= 1
+                    largest = max(largest, size[ru])
+            rows.append({
+                "year": year, "new_edges": hi - lo, "edges": hi - first, "nodes": nodes,
+                "components": components, "largest_component": largest,
+            })
+            lo = hi
+        return rows
+
+
+def write_timeseries(data_dir: Path = DATA_DIR) -> list[dict]:
+    """Per-year cumulative metrics of the dated graph, saved to network_timeseries.csv."""
+    graph = csr_graph.load_graph(data_dir)
+    if graph is None:
+        return []
+    rows = TemporalIndex(graph).timeseries()
+    with open(data_dir / TIMESERIES_CSV.name, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=TIMESERIES_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+    return rows
+
+
+def load_eras(path: Path = ERA_WINDOWS) -> list[dict]:
+    """Era windows ({label, start, end}) shared with the web app."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)["eras"]
+    except (OSError, ValueError, KeyError):
+        return []
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Year-sliced person graph")
+    parser.add_argument("--window", nargs=2, type=int, metavar=("START", "END"), help="Summarize one window")
+    parser.add_argument("--eras", action="store_true", help=f"Summarize each era in {ERA_WINDOWS.name}")
+    args = parser.parse_args()
+
+    if args.window or args.eras:
+        graph = csr_graph.load_graph()
+        if graph is None:
+            raise SystemExit("No network data (run extract_all.py first)")
+        index = TemporalIndex(graph)
+        windows = [args.window] if args.window else [(e["start"], e["end"]) for e in load_eras()]
+        for start, end in windows:
+            s = index.summary(start, end)
+            print(f"{s['start']}-{s['end']}: {s['nodes']} people, {s['edges']} ties, {s['components']} components "
+                  f"(largest {s['largest_component']}), density {s['density']}")
+            print(f"  Most connected: {', '.join(s['top'])}")
+        return
+    rows = write_timeseries()
+    print(f"Saved {len(rows)} years to {TIMESERIES_CSV}")
+
+
+if __name__ == "__main__":
+    main()
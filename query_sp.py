@@ -1,18 +1,30 @@
 #!/usr/bin/env python3
 """Query S&P Capital IQ / DUNL.org API for company relationships."""
+import argparse
 import csv
-import requests
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent / "power_structure_data"))
+import fetcher  # noqa: E402
+
 # DUNL.org - verify actual API base URL from their docs
 BASE_URL = "https://api.dunl.org/v1"  # May need adjustment
 
+LEI_RE = re.compile(r"^[A-Z0-9]{18}[0-9]{2}$")
+# Column names seen in DUNL/S&P bulk downloads, in order of preference
+NAME_COLUMNS = ("name", "company_name", "legal_name", "entity_name", "Name", "Company Name", "Legal Name")
+LEI_COLUMNS = ("lei", "LEI", "Lei")
+RELATIONSHIP_FIELDS = ["source_lei", "source_name", "type", "company", "lei", "depth"]
+
 
 def search_companies(name: str) -> list[dict]:
     """Search for companies by name."""
     url = f"{BASE_URL}/companies/search"
     try:
-        response = requests.get(url, params={"name": name}, timeout=10)
+        response = fetcher.get(url, params={"name": name}, timeout=10)
         response.raise_for_status()
         data = response.json()
         return data if isinstance(data, list) else data.get("results", [])
@@ -22,15 +34,117 @@ def search_companies(name: str) -> list[dict]:
 
 
 def get_company_relationships(company_id: str) -> list[dict]:
-    """Get parent/subsidiary relationships."""
+    """Get parent/subsidiary relationships. Anything but a list (e.g. an error payload) counts as none."""
     url = f"{BASE_URL}/companies/{company_id}/relationships"
     try:
-        response = requests.get(url, timeout=10)
+        response = fetcher.get(url, timeout=10)
         response.raise_for_status()
-        return response.json()
+        data = response.json()
     except Exception as e:
         print(f"Relationships error for {company_id}: {e}")
         return []
+    if not isinstance(data, list):
+        print(f"Relationships error for {company_id}: unexpected response {str(data)[:200]}")
+        return []
+    return [rel for rel in data if isinstance(rel, dict)]
+
+
+def load_seeds(path: Path) -> list[dict]:
+    """Seed companies from a CSV with a name and/or LEI column (DUNL bulk format) or a plain
+    list with one company name or LEI per line. Returns [{"name": ..., "lei": ...}]."""
+    text = Path(path).read_text(encoding="utf-8", errors="replace")
+    if text.lstrip()[:1] == "<":
+        raise ValueError(f"{path} is HTML, not company data (download likely redirected)")
+
+    lines = text.splitlines()
+    header = next(csv.reader(lines[:1]), [])
+    name_col = next((c for c in NAME_COLUMNS if c in header), None)
+    lei_col = next((c for c in LEI_COLUMNS if c in header), None)
+    if name_col or lei_col:
+        return [
+            {"name": (row.get(name_col) or "").strip() if name_col else "", "lei": (row.get(lei_col) or "").strip() if lei_col else ""}
+            for row in csv.DictReader(lines)
+        ]
+
+    seeds = []
+    for line in lines:
+        value = line.strip()
+        if not value or value.startswith("#"):
+            continue
+        seeds.append({"name": "", "lei": value} if LEI_RE.match(value.upper()) else {"name": value, "lei": ""})
+    return seeds
+
+
+def normalize_lei(lei) -> str:
+    """LEIs are case-insensitive; payloads and input files mix cases and stray spaces."""
+    return (lei or "").strip().upper()
+
+
+def resolve_seed(seed: dict) -> tuple[str, str] | None:
+    """(company id, display name) for a seed: its LEI, else the top search hit. None for empty seeds."""
+    if normalize_lei(seed.get("lei")):
+        return normalize_lei(seed["lei"]), seed.get("name", "")
+    if not seed.get("name"):
+        return None
+    companies = search_companies(seed["name"])
+    if not companies:
+        return None
+    top = companies[0]
+    company_id = normalize_lei(top.get("lei")) or top.get("identifier", top.get("id", ""))
+    return (company_id, top.get("name", seed["name"])) if company_id else None
+
+
+def crawl_relationships(seeds: list[dict], depth: int = 1, max_workers: int = 8) -> list[dict]:
+    """Expand parent/subsidiary relationships breadth-first from the seeds, `depth` hops out.
+    Every company is fetched once (keyed by LEI); each level is fetched concurrently."""
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        frontier = {}
+        for resolved in pool.map(resolve_seed, seeds):
+            if resolved:
+                frontier.setdefault(*resolved)
+
+        visited = set(frontier)
+        rows = []
+        seen_edges = set()
+        for level in range(1, depth + 1):
+            if not frontier:
+                break
+            ids = list(frontier)
+            next_frontier = {}
+            for company_id, rels in zip(ids, pool.map(get_company_relationships, ids)):
+                for rel in rels or []:
+                    lei = normalize_lei(rel.get("lei"))
+                    edge = (company_id, rel.get("type", ""), lei or rel.get("name", ""))
+                    if edge in seen_edges:
+                        continue
+                    seen_edges.add(edge)
+                    rows.append({
+                        "source_lei": company_id,
+                        "source_name": frontier[company_id],
+                        "type": rel.get("type", ""),
+                        "company": rel.get("name", ""),
+                        "lei": lei,
+                        "depth": level,
+                    })
+                    if lei and lei not in visited:
+                        visited.add(lei)
+                        next_frontier[lei] = rel.get("name", "")
+            frontier = next_frontier
+    return rows
+
+
+def run_batch(input_path: Path, output_path: Path, depth: int, max_workers: int):
+    seeds = load_seeds(input_path)
+    print(f"Crawling {len(seeds)} seed companies to depth {depth}")
+    rows = crawl_relationships(seeds, depth, max_workers)
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=RELATIONSHIP_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+    print(f"Saved {len(rows)} relationships to {output_path}")
 
 
 def main():
@@ -61,4 +175,14 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="DUNL.org company relationships")
+    parser.add_argument("--input", type=Path, help="Company names/LEIs (text, or CSV such as sp_sample_companies.csv) for batch mode")
+    parser.add_argument("--depth", type=int, default=1, help="Parent/subsidiary hops to expand (batch mode)")
+    parser.add_argument("--workers", type=int, default=8, help="Requests in flight at once (batch mode)")
+    parser.add_argument("--out", type=Path, default=Path(__file__).parent / "data" / "sp_relationships.csv")
+    args = parser.parse_args()
+
+    if args.input:
+        run_batch(args.input, args.out, args.depth, args.workers)
+    else:
+        main()
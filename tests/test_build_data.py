@@ -0,0 +1,62 @@
+"""web/build_data.py era ranges and summaries against the edges it writes."""
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "web"))
+
+import build_data  # noqa: E402
+
+NETWORK = {
+    "nodes": [{"id": i, "name": f"Person {i}"} for i in range(1, 8)],
+    "links": [
+        {"source": 1, "target": 2, "relationship": "Skull and Bones cohort", "year": 1890, "shared": 1},
+        {"source": 2, "target": 3, "relationship": "Skull and Bones cohort", "year": 1890, "shared": 1},
+        {"source": 4, "target": 5, "relationship": "Skull and Bones cohort", "year": 1920, "shared": 1},
+        {"source": 5, "target": 6, "relationship": "Skull and Bones cohort", "year": 1960, "shared": 1},
+        {"source": 6, "target": 7, "relationship": "Board interlock", "year": 0, "shared": 1},  # Undated
+    ],
+}
+
+
+class EraTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        data, out = Path(self.tmp.name) / "data", Path(self.tmp.name) / "out"
+        data.mkdir()
+        (data / "network_d3.json").write_text(json.dumps(NETWORK))
+        build_data.build(data, out)
+        self.network = json.loads((out / "network.json").read_text())
+        self.eras = {e["label"]: e for e in json.loads((out / "eras.json").read_text())["eras"]}
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_eras_follow_era_windows(self):
+        windows = build_data.load_eras(build_data.ERA_WINDOWS)
+        self.assertTrue(windows)
+        self.assertEqual(list(self.eras), [w["label"] for w in windows])
+
+    def test_summary_counts_the_drawn_slice(self):
+        for era in self.eras.values():
+            lo, hi = era["edges"]
+            edges = self.network["edges"][lo:hi]
+            people = {end for e in edges for end in (e["source"], e["target"])}
+            self.assertEqual(era["summary"]["edges"], len(edges))
+            self.assertEqual(era["summary"]["nodes"], len(people))
+            for e in edges:
+                year = next(link["year"] for link in NETWORK["links"]
+                            if (link["source"], link["target"]) == (e["source"], e["target"]))
+                self.assertTrue(era["start"] <= year <= era["end"])
+
+    def test_edge_year_decides_membership(self):
+        all_ = self.eras["All"]["summary"]
+        self.assertEqual((all_["nodes"], all_["edges"], all_["components"]), (6, 4, 2))  # Undated tie excluded
+        self.assertEqual(self.eras["1833–1900"]["summary"]["top"][0], "Person 2")
+        self.assertEqual(self.eras["1950–1982"]["summary"]["nodes"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+"""form_990_xml.parse_return rows and memory on synthetic e-file returns."""
+import io
+import sys
+import tempfile
+import tracemalloc
+import unittest
+import zipfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "power_structure_data"))
+
+from extractors import form_990_xml  # noqa: E402
+
+NS = "http://www.irs.gov/efile"
+
+
+def make_return(filler: int = 0, ein: str = "123456789") -> bytes:
+    """One 990 with two officers and two grants; `filler` unrelated schedule lines between them."""
+    lines = "".join(f"<OtherLineGrp><LineTxt>line {i}</LineTxt><Amt>{i}</Amt></OtherLineGrp>" for i in range(filler))
+    return f"""<?xml version="1.0" encoding="utf-8"?>
+<Return xmlns="{NS}"><ReturnHeader>
+<Filer><EIN>{ein}</EIN><BusinessName><BusinessNameLine1Txt>Example Foundation</BusinessNameLine1Txt></BusinessName></Filer>
+</ReturnHeader><ReturnData><IRS990>
+<Form990PartVIISectionAGrp><PersonNm>Jane Doe</PersonNm><TitleTxt>Chair</TitleTxt></Form990PartVIISectionAGrp>
+{lines}
+<Form990PartVIISectionAGrp><PersonNm>John Roe</PersonNm><TitleTxt>Treasurer</TitleTxt></Form990PartVIISectionAGrp>
+</IRS990><IRS990ScheduleI><RecipientTable>
+<RecipientBusinessName><BusinessNameLine1Txt>Example University</BusinessNameLine1Txt></RecipientBusinessName>
+<RecipientEIN>987654321</RecipientEIN><CashGrantAmt>5000</CashGrantAmt></RecipientTable>
+<RecipientTable><RecipientPersonNm>Sam Poe</RecipientPersonNm><CashGrantAmt>100</CashGrantAmt></RecipientTable>
+</IRS990ScheduleI></ReturnData><TaxYr>2021</TaxYr></Return>""".encode()
+
+
+class ParseReturnTest(unittest.TestCase):
+    def test_rows(self):
+        rows = form_990_xml.parse_return(io.BytesIO(make_return(filler=10)), "obj1")
+        self.assertEqual(
+            [(r["source"], r["target"], r["relationship"], r["role"], r["amount"], r["target_ein"]) for r in rows],
+            [
+                ("Jane Doe", "Example Foundation", "org_board", "Chair", "", "123456789"),
+                ("John Roe", "Example Foundation", "org_board", "Treasurer", "", "123456789"),
+                ("Example Foundation", "Example University", "grant", "", "5000", "987654321"),
+                ("Example Foundation", "Sam Poe", "grant", "", "100", ""),
+            ],
+        )
+        self.assertTrue(all(r["tax_year"] == "2021" and r["object_id"] == "obj1" for r in rows))
+        self.assertEqual(form_990_xml.parse_return(io.BytesIO(make_return()), eins={"000000000"}), [])
+
+    def test_memory_is_flat_in_return_size(self):
+        peaks = []
+        for filler in (2_000, 40_000):
+            data = make_return(filler)
+            tracemalloc.start()
+            rows = form_990_xml.parse_return(io.BytesIO(data))
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+            self.assertEqual(len(rows), 4)
+        self.assertLess(peaks[1], 2 * peaks[0])  # 20x the lines, about the same peak
+
+    def test_archive_through_worker_pool(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            archive = Path(tmp) / "returns.zip"
+            with zipfile.ZipFile(archive, "w") as zf:
+                for i in range(3):
+                    zf.writestr(f"20230{i}_public.xml", make_return(ein=f"00000000{i}"))
+            rows = list(form_990_xml.iter_archive_edges([archive], workers=2, eins={"000000001", "000000002"}))
+        self.assertEqual(sorted({r["ein"] for r in rows}), ["000000001", "000000002"])
+        self.assertEqual(len(rows), 8)
+
+
+if __name__ == "__main__":
+    unittest.main()
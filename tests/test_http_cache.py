@@ -0,0 +1,72 @@
+"""http_cache conditional GETs against a local server."""
+import sys
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import requests
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "power_structure_data"))
+
+from http_cache import HTTPCache  # noqa: E402
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    etag = '"v1"'
+    seen = []  # If-None-Match of each request
+
+    def do_GET(self):
+        self.seen.append(self.headers.get("If-None-Match"))
+        if self.headers.get("If-None-Match"):
+            self.send_response(304)  # Unchanged body, but the server rotates its validators
+            StubHandler.etag = f'"v{len(self.seen)}"'
+            self.send_header("ETag", StubHandler.etag)
+            self.send_header("Last-Modified", f"Mon, 0{len(self.seen)} Jan 2024 00:00:00 GMT")
+            self.send_header("Cache-Control", "max-age=60")
+            self.end_headers()
+            return
+        data = b"body"
+        self.send_response(200)
+        self.send_header("ETag", StubHandler.etag)
+        self.send_header("Last-Modified", "Mon, 01 Jan 2024 00:00:00 GMT")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+class RevalidationTest(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_port}/page"
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = HTTPCache(Path(self.tmp.name), ttl=0)  # Always revalidate
+        self.session = requests.Session()
+        StubHandler.seen.clear()
+        StubHandler.etag = '"v1"'
+
+    def tearDown(self):
+        self.session.close()
+        self.server.shutdown()
+        self.server.server_close()
+        self.tmp.cleanup()
+
+    def test_304_updates_validators(self):
+        for _ in range(3):
+            r = self.cache.get(self.session, self.url)
+            self.assertEqual((r.status_code, r.content), (200, b"body"))
+        self.assertEqual(StubHandler.seen, [None, '"v1"', '"v2"'])
+        meta, _ = self.cache.lookup(self.url)
+        self.assertEqual(meta["etag"], '"v3"')
+        self.assertEqual(meta["last_modified"], "Mon, 03 Jan 2024 00:00:00 GMT")
+        self.assertEqual(meta["headers"]["ETag"], '"v3"')
+        self.assertEqual(meta["headers"]["Cache-Control"], "max-age=60")
+
+
+if __name__ == "__main__":
+    unittest.main()
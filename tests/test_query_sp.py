@@ -0,0 +1,107 @@
+"""query_sp.crawl_relationships against a local stub of the DUNL API."""
+import json
+import sys
+import threading
+import unittest
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import query_sp  # noqa: E402
+
+fetcher = query_sp.fetcher  # Imported by query_sp from power_structure_data
+
+A, B, C, D, E = (f"{c * 18}00" for c in "ABCDE")
+SEARCH = {"Alpha Corp": [{"lei": A, "name": "Alpha Corp"}]}
+RELATIONSHIPS = {
+    A: [
+        {"type": "subsidiary", "name": "Beta", "lei": B},
+        {"type": "subsidiary", "name": "Gamma", "lei": C},
+        {"type": "subsidiary", "name": "Beta", "lei": f" {B.lower()}"},  # Same company, other spelling
+    ],
+    B: [{"type": "parent", "name": "Alpha Corp", "lei": A.lower()}, {"type": "subsidiary", "name": "Delta", "lei": D}],
+    C: {"error": "rate limited"},  # Error payload instead of a list
+    D: [{"type": "subsidiary", "name": "Epsilon", "lei": E}],
+    E: [{"type": "subsidiary", "name": "Too deep", "lei": "Z" * 18 + "00"}],
+}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    requests = Counter()
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        parts = url.path.strip("/").split("/")
+        if parts[-1] == "search":
+            name = parse_qs(url.query).get("name", [""])[0]
+            self.requests["search:" + name] += 1
+            body = SEARCH.get(name, [])
+        else:
+            self.requests[parts[-2]] += 1
+            body = RELATIONSHIPS.get(parts[-2], [])
+        data = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+class CrawlRelationshipsTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.saved = (query_sp.BASE_URL, fetcher.CACHE, fetcher.THROTTLE)
+        query_sp.BASE_URL = f"http://127.0.0.1:{cls.server.server_port}"
+        fetcher.CACHE = None  # Never read or write the on-disk response cache
+        fetcher.THROTTLE = False
+
+    @classmethod
+    def tearDownClass(cls):
+        query_sp.BASE_URL, fetcher.CACHE, fetcher.THROTTLE = cls.saved
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        StubHandler.requests.clear()
+
+    def crawl(self, depth):
+        seeds = [{"name": "Alpha Corp", "lei": ""}, {"name": "", "lei": B.lower()}, {"name": "", "lei": ""}]
+        return query_sp.crawl_relationships(seeds, depth=depth, max_workers=4)
+
+    def test_depth_one_only_expands_seeds(self):
+        rows = self.crawl(1)
+        self.assertEqual({(r["source_lei"], r["lei"]) for r in rows}, {(A, B), (A, C), (B, A), (B, D)})
+        self.assertTrue(all(r["depth"] == 1 for r in rows))
+        self.assertNotIn(D, StubHandler.requests)
+
+    def test_depth_two_fetches_each_company_once(self):
+        rows = self.crawl(2)
+        self.assertEqual([(r["source_lei"], r["lei"], r["depth"]) for r in rows if r["depth"] == 2], [(D, E, 2)])
+        self.assertEqual(len(rows), len({(r["source_lei"], r["type"], r["lei"]) for r in rows}))
+        for lei in (A, B, C, D):
+            self.assertEqual(StubHandler.requests[lei], 1)
+        self.assertNotIn(E, StubHandler.requests)  # Beyond depth
+
+    def test_lei_case_and_spacing_do_not_duplicate(self):
+        rows = self.crawl(2)
+        self.assertEqual(sum(1 for r in rows if (r["source_lei"], r["lei"]) == (A, B)), 1)
+        self.assertIn((B, A), {(r["source_lei"], r["lei"]) for r in rows})
+        fetched = [k for k in StubHandler.requests if not k.startswith("search:")]
+        self.assertEqual(sorted(fetched), sorted({A, B, C, D}))
+
+    def test_error_payloads_and_empty_seeds_are_skipped(self):
+        self.crawl(2)
+        self.assertEqual(query_sp.get_company_relationships(C), [])
+        self.assertEqual([k for k in StubHandler.requests if k.startswith("search:")], ["search:Alpha Corp"])
+
+
+if __name__ == "__main__":
+    unittest.main()
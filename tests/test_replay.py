@@ -0,0 +1,82 @@
+"""replay's recording and replay adapters against a local server, including streamed bodies."""
+import gzip
+import sys
+import tempfile
+import threading
+import tracemalloc
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "power_structure_data"))
+
+import fetcher  # noqa: E402
+import replay  # noqa: E402
+
+BIG = bytes(range(256)) * (1 << 15)  # 8 MB
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        gz = self.path == "/gz"
+        data = gzip.compress(b"compressed") if gz else BIG if self.path == "/big" else b"small"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(data)))
+        if gz:
+            self.send_header("Content-Encoding", "gzip")
+        self.end_headers()
+        try:
+            self.wfile.write(data)
+        except ConnectionError:
+            pass  # Client stopped reading early
+
+    def log_message(self, *args):
+        pass
+
+
+class ReplayTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base = f"http://127.0.0.1:{cls.server.server_port}"
+        cls.saved = (fetcher.CACHE, fetcher.THROTTLE, fetcher._session)
+        fetcher._session = None  # A fresh session, so the adapters mounted here do not leak into other tests
+        cls.tmp = tempfile.TemporaryDirectory()
+
+    @classmethod
+    def tearDownClass(cls):
+        fetcher.get_session().close()
+        fetcher.CACHE, fetcher.THROTTLE, fetcher._session = cls.saved
+        cls.server.shutdown()
+        cls.server.server_close()
+        cls.tmp.cleanup()
+
+    def test_record_then_replay(self):
+        session = fetcher.get_session()
+        recorder = replay.start_recording()
+        tracemalloc.start()
+        with session.get(self.base + "/big", stream=True) as r:
+            streamed = sum(len(chunk) for chunk in r.iter_content(1 << 16))
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        self.assertEqual(streamed, len(BIG))
+        self.assertLess(peak, len(BIG) // 4)  # Teed to disk, not buffered
+        self.assertEqual(session.get(self.base + "/small").content, b"small")
+        self.assertEqual(session.get(self.base + "/gz").content, b"compressed")
+        with session.get(self.base + "/big", stream=True) as r:
+            next(r.iter_content(1024))  # Abandoned: must not be recorded as the full body
+        archive = Path(self.tmp.name) / "run.zip"
+        recorder.save(archive)
+        self.assertEqual(len(recorder.entries[f"GET {self.base}/big"]), 1)
+
+        replay.start_replay(archive)
+        with session.get(self.base + "/big", stream=True) as r:
+            self.assertEqual(b"".join(r.iter_content(1 << 16)), BIG)
+        self.assertEqual(session.get(self.base + "/big").content, BIG)
+        self.assertEqual(session.get(self.base + "/small").content, b"small")
+        self.assertEqual(session.get(self.base + "/gz").content, b"compressed")
+
+
+if __name__ == "__main__":
+    unittest.main()
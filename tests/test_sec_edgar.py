@@ -0,0 +1,39 @@
+"""sec_edgar's lxml and BeautifulSoup backends read the same rows from a proxy filing."""
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "power_structure_data"))
+
+from extractors import sec_edgar  # noqa: E402
+
+# Old EDGAR style: cells wrapped in <font>/<div>, tbody, a nested table, script text, an XML declaration
+FILING = """<?xml version="1.0" encoding="utf-8"?>
+<html><head><style>td { font-size: 10pt }</style><script>var director = "Not A Name";</script></head>
+<body>
+<p>ELECTION OF DIRECTORS</p>
+<p>The following persons are nominees for director.</p>
+<table><tbody>
+<tr><th>Name</th><th>Age</th><th>Position</th></tr>
+<tr><font size="2"><td>John&nbsp;A. Smith</td><td>61</td><td>Director since 1998</td></font></tr>
+<tr><td><div><b>Mary</b> <i>Jones</i></div></td><td>55</td>
+<td><table><tr><td>Chairman</td><td>Director</td></tr></table></td></tr>
+</tbody></table>
+</body></html>"""
+
+
+class BackendParityTest(unittest.TestCase):
+    def test_lxml_and_bs4_agree(self):
+        lxml_result = sec_edgar._text_and_rows_lxml(FILING)
+        if lxml_result is None:
+            self.skipTest("lxml is not installed")
+        lxml_text, lxml_rows = lxml_result
+        bs4_text, bs4_rows = sec_edgar._text_and_rows_bs4(FILING)
+        self.assertEqual(lxml_rows, bs4_rows)
+        self.assertEqual(lxml_text.split(), bs4_text.split())
+        self.assertIn(["John A. Smith", "61", "Director since 1998"], lxml_rows)
+        self.assertNotIn("Not A Name", lxml_text)
+
+
+if __name__ == "__main__":
+    unittest.main()
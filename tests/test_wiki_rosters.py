@@ -0,0 +1,140 @@
+"""extract_all's roster extractors match the original BeautifulSoup code on the saved pages, on every backend."""
+import re
+import sys
+import unittest
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT / "power_structure_data"))
+
+import extract_all  # noqa: E402
+from html_backend import BACKENDS  # noqa: E402
+
+SKULL_BONES = ROOT / "data" / "skull_bones.html"
+BILDERBERG = ROOT / "data" / "bilderberg.html"
+BILDERBERG_DE = """<html><body><div id="mw-content-text">
+<table class="wikitable sortable"><tbody>
+<tr><th>Name</th><th>Jahre</th><th>Land</th><th>Bereich</th><th>Position</th></tr>
+<tr><td><a href="/wiki/Helmut_Schmidt">Helmut Schmidt</a></td><td>1973, 1980</td><td>DE</td><td>Politik</td>
+<td>Bundeskanzler<sup class="reference">[1]</sup></td></tr>
+<tr><td> Henry Kissinger </td><td>1957</td><td>US</td><td>Politik</td></tr>
+<tr><td>Helmut Schmidt</td><td>1983</td><td>DE</td><td>Politik</td><td>duplicate</td></tr>
+<tr><td>Too short</td><td>1990</td><td>FR</td></tr>
+</tbody></table></div></body></html>"""
+
+
+def table_cells(soup):
+    for table in soup.find_all("table", {"class": "wikitable"}):
+        for row in table.find_all("tr")[1:]:
+            yield row.find_all(["td", "th"])
+
+
+def reference_skull_bones(html: str, seen: set) -> list[dict]:
+    """The pre-extraction-layer dataset3_skull_bones loop body."""
+    soup = BeautifulSoup(html, "html.parser")
+    content = soup.find("div", {"id": "mw-content-text"}) or soup.find("div", {"id": "bodyContent"}) or soup
+    members = []
+    for cells in table_cells(soup):
+        if len(cells) >= 2:
+            name = cells[1].get_text(strip=True)
+            cohort = cells[0].get_text(strip=True) if cells[0].get_text().replace(" ", "").isdigit() else ""
+            position = cells[2].get_text(strip=True) if len(cells) > 2 else ""
+            if name and len(name) > 3 and name not in seen:
+                seen.add(name)
+                members.append({"name": name, "cohort_year": cohort, "position": position, "century": "unknown"})
+    for li in content.find_all("li"):
+        if li.find_parent("nav"):
+            continue
+        link = li.find("a", href=lambda h: h and h.startswith("/wiki/") and ":" not in h)
+        if not link:
+            continue
+        name = link.get_text(strip=True)
+        if not name or len(name) < 4:
+            continue
+        text = li.get_text()
+        cohort_match = re.search(r"\((\d{4})\)", text)
+        if not cohort_match:
+            continue
+        cohort = cohort_match.group(1)
+        position = re.sub(r"^.*?\(\d{4}\)\s*,?\s*", "", text).strip()[:200]
+        if any(x in name.lower() for x in ["olympics", "summer", "winter", "war", "conference"]):
+            continue
+        key = (name, cohort)
+        if key not in seen:
+            seen.add(key)
+            century = "19th" if cohort < "1900" else "20th" if cohort.isdigit() else "unknown"
+            members.append({"name": name, "cohort_year": cohort, "position": position, "century": century})
+    return members
+
+
+def reference_bilderberg_de(html: str, seen: set) -> list[dict]:
+    attendees = []
+    for cells in table_cells(BeautifulSoup(html, "html.parser")):
+        if len(cells) >= 4:
+            name = cells[0].get_text(strip=True)
+            country = cells[2].get_text(strip=True) if len(cells) > 2 else ""
+            if name and (name, country) not in seen:
+                seen.add((name, country))
+                attendees.append({
+                    "name": name,
+                    "years": cells[1].get_text(strip=True) if len(cells) > 1 else "",
+                    "country": country,
+                    "sector": cells[3].get_text(strip=True) if len(cells) > 3 else "",
+                    "position": cells[4].get_text(strip=True) if len(cells) > 4 else "",
+                })
+    return attendees
+
+
+def reference_bilderberg_en(html: str, seen: set) -> list[dict]:
+    attendees = []
+    for cells in table_cells(BeautifulSoup(html, "html.parser")):
+        if len(cells) >= 2:
+            name = cells[0].get_text(strip=True)
+            if not name or name.lower() in ("participants", "name", "---"):
+                continue
+            country = cells[1].get_text(strip=True) if len(cells) > 1 else ""
+            position = cells[2].get_text(strip=True) if len(cells) > 2 else ""
+            if (name, country) not in seen:
+                seen.add((name, country))
+                attendees.append({"name": name, "years": "", "country": country, "sector": "Unknown", "position": position})
+    return attendees
+
+
+def installed_backends():
+    for name, cls in BACKENDS.items():
+        try:
+            yield name, cls()
+        except ImportError:
+            continue
+
+
+class RosterParityTest(unittest.TestCase):
+    def check(self, fn, reference, page: Path | str):
+        html = page.read_text(encoding="utf-8") if isinstance(page, Path) else page
+        expected = reference(html, set())
+        self.assertTrue(expected)
+        for name, backend in installed_backends():
+            with self.subTest(backend=name):
+                self.assertEqual(fn(html, set(), backend), expected)
+
+    def test_skull_bones(self):
+        self.check(extract_all.skull_bones_members, reference_skull_bones, SKULL_BONES)
+
+    def test_bilderberg_en(self):
+        self.check(extract_all.bilderberg_en_attendees, reference_bilderberg_en, BILDERBERG)
+
+    def test_bilderberg_de(self):
+        self.check(extract_all.bilderberg_de_attendees, reference_bilderberg_de, BILDERBERG_DE)
+
+    def test_seen_dedupes_across_pages(self):
+        html = SKULL_BONES.read_text(encoding="utf-8")
+        seen = set()
+        first = extract_all.skull_bones_members(html, seen)
+        self.assertTrue(first)
+        self.assertEqual(extract_all.skull_bones_members(html, seen), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
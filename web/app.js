@@ -1,5 +1,6 @@
 /* The Hidden Networks - All elite networks */
 let allData = { nodes: [], edges: [] };
+let eras = new Map();  // "start-end" -> edge range from build_data.py (network.json edges are in tie-year order)
 let filtered = { nodes: [], edges: [] };
 let sim = null, svg = null, g = null;
 
@@ -13,11 +14,16 @@ async function loadData() {
     try {
         const r = await fetch('data/network.json');
         const d = await r.json();
+        // build_data.py ships a settled layout centered on 0; start nodes there instead of at random
+        const cx = +svg.attr('width') / 2, cy = +svg.attr('height') / 2;
         allData.nodes = (d.nodes || []).map(n => ({
             ...n,
             id: n.id || n.name,
             orgs: n.orgs || [],
             type: n.type || 'unknown',
+            settled: n.x != null && n.y != null,
+            x: n.x != null ? n.x + cx : undefined,
+            y: n.y != null ? n.y + cy : undefined,
         }));
         allData.edges = (d.edges || []).map(e => ({
             source: e.source,
@@ -25,6 +31,7 @@ async function loadData() {
             type: e.type || 'connection',
             weight: e.weight || 1,
         }));
+        await loadEras();
         applyFilters();
         document.getElementById('search').addEventListener('input', onSearch);
     } catch (err) {
@@ -33,6 +40,49 @@ async function loadData() {
     }
 }
 
+async function loadEras() {
+    // Era windows live in data/era_windows.json (also read by build_data.py and temporal.py)
+    let windows = [{ label: 'All', start: 1833, end: 1982 }];
+    try {
+        const r = await fetch('data/era_windows.json');
+        if (r.ok) windows = (await r.json()).eras || windows;
+    } catch (err) {
+        // Keep the single "All" era
+    }
+    renderEraButtons(windows);
+    try {
+        const r = await fetch('data/eras.json');
+        if (!r.ok) return;
+        const d = await r.json();
+        (d.eras || []).forEach(e => eras.set(`${e.start}-${e.end}`, e));
+    } catch (err) {
+        return;  // Older builds: fall back to filtering every node by year
+    }
+    document.querySelectorAll('.era-btn').forEach(btn => {
+        const e = eras.get(`${btn.dataset.start}-${btn.dataset.end}`);
+        if (e) btn.title = `${e.summary.nodes} people · ${e.summary.edges} ties · ${e.summary.components} groups`;
+    });
+}
+
+function renderEraButtons(windows) {
+    const group = document.getElementById('era-group');
+    windows.forEach((w, i) => {
+        const btn = document.createElement('button');
+        btn.className = 'era-btn' + (i === 0 ? ' active' : '');
+        btn.dataset.start = w.start;
+        btn.dataset.end = w.end;
+        btn.textContent = w.label;
+        btn.onclick = () => {
+            document.querySelectorAll('.era-btn').forEach(b => b.classList.remove('active'));
+            btn.classList.add('active');
+            document.getElementById('search').value = '';
+            applyFilters();
+            document.getElementById('detail').innerHTML = '<p class="detail-placeholder">Click a node or search to view details</p>';
+        };
+        group.appendChild(btn);
+    });
+}
+
 function nodeMatchesOrg(node, org) {
     const o = (node.orgs || []).map(x => String(x).toLowerCase());
     if (org === 'skull') return o.some(x => x.includes('skull') || x.includes('bones'));
@@ -48,16 +98,31 @@ function applyFilters() {
     const end = +document.querySelector('.era-btn.active')?.dataset.end || 1982;
     const q = document.getElementById('search').value.toLowerCase().trim();
 
-    let nodes = allData.nodes.filter(n => {
+    // As in temporal.py: an era holds the ties dated inside it and the people on those ties
+    const era = eras.get(`${start}-${end}`);
+    const eraEdges = era ? allData.edges.slice(era.edges[0], era.edges[1]) : allData.edges;
+    let eraNodes = allData.nodes;
+    if (era) {
+        const inEra = new Set();
+        eraEdges.forEach(e => {
+            inEra.add(typeof e.source === 'object' ? e.source.id : e.source);
+            inEra.add(typeof e.target === 'object' ? e.target.id : e.target);
+        });
+        eraNodes = allData.nodes.filter(n => inEra.has(n.id));
+    }
+
+    let nodes = eraNodes.filter(n => {
         if (!orgs.some(org => nodeMatchesOrg(n, org))) return false;
-        const y = +(n.cohort_year || n.year || 1900);
-        if (y && (y < start || y > end)) return false;
+        if (!era) {
+            const y = +(n.cohort_year || n.year || 1900);
+            if (y && (y < start || y > end)) return false;
+        }
         if (q && !String(n.name || '').toLowerCase().includes(q)) return false;
         return true;
     });
 
     const ids = new Set(nodes.map(n => n.id));
-    let edges = allData.edges.filter(e => {
+    let edges = eraEdges.filter(e => {
         const s = typeof e.source === 'object' ? e.source.id : e.source;
         const t = typeof e.target === 'object' ? e.target.id : e.target;
         return ids.has(s) && ids.has(t);
@@ -145,7 +210,9 @@ function updateGraph() {
         link.attr('x1', d => d.source.x).attr('y1', d => d.source.y).attr('x2', d => d.target.x).attr('y2', d => d.target.y);
         node.attr('cx', d => d.x).attr('cy', d => d.y);
     });
-    sim.alpha(1).restart();
+    sim.on('end', () => filtered.nodes.forEach(n => { n.settled = true; }));
+    // Precomputed (or already simulated) positions only need a nudge, not a full re-layout
+    sim.alpha(filtered.nodes.every(n => n.settled) ? 0.05 : 1).restart();
 }
 
 function showTooltip(e, d) {
@@ -190,13 +257,4 @@ function initEvents() {
     document.querySelectorAll('input[name="org"]').forEach(cb => {
         cb.onchange = () => applyFilters();
     });
-    document.querySelectorAll('.era-btn').forEach(btn => {
-        btn.onclick = () => {
-            document.querySelectorAll('.era-btn').forEach(b => b.classList.remove('active'));
-            btn.classList.add('active');
-            document.getElementById('search').value = '';
-            applyFilters();
-            document.getElementById('detail').innerHTML = '<p class="detail-placeholder">Click a node or search to view details</p>';
-        };
-    });
 }
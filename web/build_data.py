@@ -1,69 +1,257 @@
 #!/usr/bin/env python3
-"""Build combined JSON for web app from power_structure_data."""
+"""Build combined JSON for web app from power_structure_data.
+
+Standard library only (the Vercel build has no numpy/pandas). Degrees are counted
+in one pass over the links, enrichment is dict lookups, and network.json is
+written one node/edge per line as it is produced, so cost is linear in edges.
+
+Edges are written in order of the tie's year (undated first), bucketed rather
+than sorted. Eras (data/era_windows.json, also read by app.js and temporal.py)
+are edge-year windows: a tie is in an era when its year is in the window, a
+person when one of their ties is. Each era is then a contiguous range of edges,
+found with two binary searches; eras.json holds those ranges and a summary of
+each slice, so switching eras in the app is a slice and the counts are the
+people and ties it draws.
+"""
 import json
 import csv
+from bisect import bisect_left, bisect_right
+from collections import Counter, defaultdict
 from pathlib import Path
 
 DATA = Path(__file__).parent.parent / "power_structure_data"
 OUT = Path(__file__).parent / "data"
-OUT.mkdir(parents=True, exist_ok=True)
-
-# Load network
-with open(DATA / "network_d3.json") as f:
-    network = json.load(f)
-
-# Load cross-reference (high-value nodes)
-cross_ref = set()
-try:
-    with open(DATA / "cross_reference.csv") as f:
-        for row in csv.DictReader(f):
-            cross_ref.add(row["name"].strip())
-except Exception:
-    pass
-
-# Load skull bones for cohort/position
-skull_data = {}
-try:
-    with open(DATA / "skull_bones_complete.csv") as f:
-        for row in csv.DictReader(f):
-            skull_data[row["name"].strip()] = {
-                "cohort_year": row.get("cohort_year", ""),
-                "position": row.get("position", "")[:150],
-            }
-except Exception:
-    pass
-
-# Enrich nodes
-for node in network["nodes"]:
-    name = node["id"]
-    node["type"] = "policy" if name in cross_ref else "secret-society"
-    node["connections"] = sum(1 for l in network["links"] if l["source"] == name or l["target"] == name)
-    if name in skull_data:
-        node["cohort_year"] = skull_data[name]["cohort_year"]
-        node["position"] = skull_data[name]["position"]
-    else:
-        node["cohort_year"] = ""
-        node["position"] = ""
-
-# Convert links to edges format (source/target can be string ids, D3 will resolve)
-edges = []
-for link in network["links"]:
-    rel = link.get("relationship", "connection")
-    edge_type = "society-connection" if "Skull" in rel or "Bones" in rel else "policy-connection"
-    edges.append({
-        "source": link["source"],
-        "target": link["target"],
-        "type": edge_type,
-        "weight": 3 if "Skull" in rel else 2,
-        "relationship": rel,
-    })
-
-output = {
-    "nodes": network["nodes"],
-    "edges": edges,
-}
-
-with open(OUT / "network.json", "w") as f:
-    json.dump(output, f, indent=0)
-
-print(f"Built: {len(output['nodes'])} nodes, {len(output['edges'])} edges -> {OUT / 'network.json'}")
+ERA_WINDOWS = OUT / "era_windows.json"
+NO_METRICS = {"pagerank": 0.0, "core_number": 0, "betweenness": 0.0}
+
+
+def load_cross_ref(path: Path) -> set[str]:
+    """Names in 2+ sources (high-value nodes)."""
+    cross_ref = set()
+    try:
+        with open(path) as f:
+            for row in csv.DictReader(f):
+                cross_ref.add(row["name"].strip())
+    except Exception:
+        pass
+    return cross_ref
+
+
+def load_skull_data(path: Path) -> dict[str, dict]:
+    """Skull and Bones cohort/position by name."""
+    skull_data = {}
+    try:
+        with open(path) as f:
+            for row in csv.DictReader(f):
+                skull_data[row["name"].strip()] = {
+                    "cohort_year": row.get("cohort_year", ""),
+                    "position": row.get("position", "")[:150],
+                }
+    except Exception:
+        pass
+    return skull_data
+
+
+def load_node_metrics(path: Path) -> tuple[dict[str, dict], dict[str, dict]]:
+    """Centrality from graph_metrics.py, keyed by person_id and by name."""
+    by_id, by_name = {}, {}
+    try:
+        with open(path, encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                metrics = {
+                    "pagerank": float(row.get("pagerank") or 0),
+                    "core_number": int(row.get("core_number") or 0),
+                    "betweenness": float(row.get("betweenness") or 0),
+                }
+                if row.get("person_id"):
+                    by_id.setdefault(row["person_id"], metrics)
+                by_name.setdefault(row["name"].strip(), metrics)
+    except Exception:
+        pass
+    return by_id, by_name
+
+
+def load_layout(path: Path) -> tuple[dict[str, dict], dict[str, dict]]:
+    """Precomputed x/y from layout.py, keyed by person_id and by name."""
+    by_id, by_name = {}, {}
+    try:
+        with open(path, encoding="utf-8") as f:
+            for row in json.load(f)["nodes"]:
+                xy = {"x": row["x"], "y": row["y"]}
+                if row.get("person_id"):
+                    by_id.setdefault(str(row["person_id"]), xy)
+                by_name.setdefault(row["name"].strip(), xy)
+    except Exception:
+        pass
+    return by_id, by_name
+
+
+def load_eras(path: Path) -> list[dict]:
+    """Era windows ({label, start, end}) shared with app.js and temporal.py."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)["eras"]
+    except Exception:
+        return []
+
+
+def by_year(items: list, years: list[int]) -> tuple[list, list[int]]:
+    """Items and their years in year order (stable bucket sort, linear for a small year range)."""
+    buckets = defaultdict(list)
+    for item, year in zip(items, years):
+        buckets[year].append(item)
+    ordered, ordered_years = [], []
+    for year in sorted(buckets):
+        ordered.extend(buckets[year])
+        ordered_years.extend([year] * len(buckets[year]))
+    return ordered, ordered_years
+
+
+def era_summary(links: list[dict], names: dict, top: int = 3) -> dict:
+    """People, ties, connected groups and best-connected names for one era's edge slice."""
+    parent = {}
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    degree = Counter()
+    groups = 0
+    for link in links:
+        s, t = link["source"], link["target"]
+        for end in (s, t):
+            if end not in parent:
+                parent[end] = end
+                groups += 1
+            degree[end] += 1
+        rs, rt = find(s), find(t)
+        if rs != rt:
+            parent[rt] = rs
+            groups -= 1
+    return {
+        "nodes": len(parent),
+        "edges": len(links),
+        "components": groups,
+        "top": [names.get(i, i) for i, _ in degree.most_common(top)],
+    }
+
+
+def era_ranges(eras: list[dict], edge_years: list[int], links: list[dict], names: dict) -> list[dict]:
+    """Each era's edge range (ties dated start..end inclusive; undated ties are in no era) and summary."""
+    out = []
+    for era in eras:
+        start, end = era["start"], era["end"]
+        lo = bisect_left(edge_years, max(start, 1))
+        hi = max(lo, bisect_right(edge_years, end))
+        out.append({
+            "label": era["label"],
+            "start": start,
+            "end": end,
+            "edges": [lo, hi],
+            "summary": era_summary(links[lo:hi], names),
+        })
+    return out
+
+
+def edge_type(rel: str) -> str:
+    return "society-connection" if "Skull" in rel or "Bones" in rel else "policy-connection"
+
+
+def edge_weight(rel: str) -> int:
+    return 3 if "Skull" in rel else 2
+
+
+def degrees(links: list[dict]) -> tuple[Counter, Counter, dict[object, Counter]]:
+    """(degree, weighted degree, degree per relationship) by node id, in one pass."""
+    degree, weighted = Counter(), Counter()
+    by_rel = defaultdict(Counter)
+    for link in links:
+        rel = link.get("relationship", "connection")
+        w = edge_weight(rel)
+        for end in (link["source"], link["target"]):
+            degree[end] += 1
+            weighted[end] += w
+            by_rel[end][rel] += 1
+    return degree, weighted, by_rel
+
+
+def enrich_nodes(nodes: list[dict], links: list[dict], cross_ref: set[str], skull_data: dict[str, dict], metrics=({}, {}),
+                 layout=({}, {})):
+    """Yield nodes with type, degree counts, Skull and Bones details, centrality and layout position."""
+    degree, weighted, by_rel = degrees(links)
+    metrics_by_id, metrics_by_name = metrics
+    layout_by_id, layout_by_name = layout
+    for node in nodes:
+        name = node.get("name") or node["id"]  # ids are registry integers (older exports used names)
+        skull = skull_data.get(name, {})
+        node["type"] = "policy" if name in cross_ref else "secret-society"
+        node["connections"] = degree[node["id"]]
+        node["cohort_year"] = skull.get("cohort_year", "")
+        node["position"] = skull.get("position", "")
+        node["weighted_degree"] = weighted[node["id"]]
+        node["degree_by_relationship"] = dict(by_rel.get(node["id"], {}))
+        node.update(metrics_by_id.get(str(node["id"])) or metrics_by_name.get(name) or NO_METRICS)
+        node.update(layout_by_id.get(str(node["id"])) or layout_by_name.get(name) or {})
+        yield node
+
+
+def edges_from_links(links: list[dict]):
+    """Yield web edges (source/target are node ids; D3 resolves them)."""
+    for link in links:
+        rel = link.get("relationship", "connection")
+        yield {
+            "source": link["source"],
+            "target": link["target"],
+            "type": edge_type(rel),
+            "weight": edge_weight(rel),
+            "relationship": rel,
+        }
+
+
+def write_json_stream(path: Path, nodes, edges) -> tuple[int, int]:
+    """Write {"nodes": [...], "edges": [...]} one item per line without building the whole document."""
+    n_nodes = n_edges = 0
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w") as f:
+        f.write('{\n"nodes": [\n')
+        for node in nodes:
+            f.write(("," if n_nodes else "") + json.dumps(node) + "\n")
+            n_nodes += 1
+        f.write('],\n"edges": [\n')
+        for edge in edges:
+            f.write(("," if n_edges else "") + json.dumps(edge) + "\n")
+            n_edges += 1
+        f.write("]\n}\n")
+    tmp.replace(path)
+    return n_nodes, n_edges
+
+
+def build(data_dir: Path = DATA, out_dir: Path = OUT) -> tuple[int, int]:
+    out_dir.mkdir(parents=True, exist_ok=True)
+    with open(data_dir / "network_d3.json") as f:
+        network = json.load(f)
+    cross_ref = load_cross_ref(data_dir / "cross_reference.csv")
+    skull_data = load_skull_data(data_dir / "skull_bones_complete.csv")
+    metrics = load_node_metrics(data_dir / "node_metrics.csv")
+    layout = load_layout(data_dir / "network_layout.json")
+
+    nodes = network["nodes"]
+    links, edge_years = by_year(network["links"], [int(link.get("year") or 0) for link in network["links"]])
+    names = {n["id"]: n.get("name") or n["id"] for n in nodes}
+    eras = era_ranges(load_eras(ERA_WINDOWS), edge_years, links, names)
+    with open(out_dir / "eras.json", "w") as f:
+        json.dump({"eras": eras}, f, indent=1)
+
+    nodes = enrich_nodes(nodes, links, cross_ref, skull_data, metrics, layout)
+    return write_json_stream(out_dir / "network.json", nodes, edges_from_links(links))
+
+
+def main():
+    n_nodes, n_edges = build()
+    print(f"Built: {n_nodes} nodes, {n_edges} edges -> {OUT / 'network.json'}")
+
+
+if __name__ == "__main__":
+    main()